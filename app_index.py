@@ -0,0 +1,288 @@
+""" Steam app ID -> oyun adı için kompakt, memory-map edilen disk indeksi.
+
+Dosya düzeni (little-endian):
+    başlık   : MAGIC, sürüm, kayıt sayısı, isim bloğu boyutu
+    ids      : sıralı uint32 app ID'leri
+    offsets  : isim bloğuna (kayıt sayısı + 1) adet uint32 ofset
+    names    : art arda eklenmiş UTF-8 isimler
+
+Arama bisect ile yapılır; tarama sırasında JSON ayrıştırılmaz, dict oluşturulmaz.
+AppListStreamParser indirilen listeyi parça parça okuyup kayıtları doğrudan
+AppIndexWriter'a aktarır; belgenin tamamı hiçbir zaman bellekte tutulmaz.
+Paketleme sırasında gömülü indeksi üretmek için:
+    python app_index.py steam_app_list.json steam_app_index.bin
+"""
+import os
+import sys
+import json
+import mmap
+import codecs
+import struct
+import re
+from array import array
+from bisect import bisect_left
+
+MAGIC = b"SFAI"
+VERSION = 1
+HEADER = struct.Struct("<4sIII")
+MAX_APP_ID = 0xFFFFFFFF
+
+
+def _le_array(typecode, data):
+    values = array(typecode, data)
+    if sys.byteorder != "little": values.byteswap()
+    return values
+
+
+class AppIndex:
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, "rb")
+        try:
+            self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # Boş dosya mmap edilemez.
+            self._file.close()
+            raise ValueError(f"Geçersiz indeks dosyası: {path}")
+        magic, version, count, names_size = HEADER.unpack_from(self._mm, 0)
+        ids_start = HEADER.size
+        offsets_start = ids_start + 4 * count
+        self._names_start = offsets_start + 4 * (count + 1)
+        if magic != MAGIC or version != VERSION or len(self._mm) != self._names_start + names_size:
+            self.close()
+            raise ValueError(f"Geçersiz indeks dosyası: {path}")
+        self._count = count
+        view = memoryview(self._mm)
+        if sys.byteorder == "little":
+            self._ids = view[ids_start:offsets_start].cast("I")
+            self._offsets = view[offsets_start:self._names_start].cast("I")
+        else:
+            self._ids = _le_array("I", view[ids_start:offsets_start])
+            self._offsets = _le_array("I", view[offsets_start:self._names_start])
+        view.release()
+
+    def __len__(self):
+        return self._count
+
+    def __contains__(self, app_id):
+        return self._find(app_id) is not None
+
+    def _find(self, app_id):
+        try:
+            key = int(app_id)
+        except (TypeError, ValueError):
+            return None
+        i = bisect_left(self._ids, key)
+        if i < self._count and self._ids[i] == key: return i
+        return None
+
+    def get(self, app_id, default=None):
+        i = self._find(app_id)
+        if i is None: return default
+        start = self._names_start + self._offsets[i]
+        end = self._names_start + self._offsets[i + 1]
+        return self._mm[start:end].decode("utf-8", errors="replace")
+
+    def items(self):
+        for i in range(self._count):
+            start = self._names_start + self._offsets[i]
+            end = self._names_start + self._offsets[i + 1]
+            yield str(self._ids[i]), self._mm[start:end].decode("utf-8", errors="replace")
+
+    def close(self):
+        for name in ("_ids", "_offsets"):
+            values = getattr(self, name, None)
+            if isinstance(values, memoryview): values.release()
+        if getattr(self, "_mm", None) is not None:
+            self._mm.close(); self._mm = None
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class AppIndexWriter:
+    """(appid, isim) kayıtlarını kompakt dizilerde toplar; aynı ID için son eklenen kazanır."""
+
+    def __init__(self):
+        self._ids = array("I")
+        self._starts = array("I")
+        self._ends = array("I")
+        self._names = bytearray()
+
+    def __len__(self):
+        return len(self._ids)
+
+    def add(self, app_id, name):
+        try:
+            key = int(app_id)
+        except (TypeError, ValueError):
+            return False
+        if not name or key < 0 or key > MAX_APP_ID: return False
+        self._ids.append(key)
+        self._starts.append(len(self._names))
+        self._names += str(name).encode("utf-8")
+        self._ends.append(len(self._names))
+        return True
+
+    def update(self, mapping):
+        for app_id, name in mapping.items(): self.add(app_id, name)
+
+    def write(self, index_path):
+        ids, starts, ends, names = self._ids, self._starts, self._ends, self._names
+        # sorted() kararlı olduğundan aynı ID'li kayıtlardan en son eklenen en sonda kalır.
+        order = sorted(range(len(ids)), key=ids.__getitem__)
+        out_ids, out_offsets, blob = array("I"), array("I", [0]), bytearray()
+        for n, i in enumerate(order):
+            if n + 1 < len(order) and ids[order[n + 1]] == ids[i]: continue
+            out_ids.append(ids[i])
+            blob += names[starts[i]:ends[i]]
+            out_offsets.append(len(blob))
+        if sys.byteorder != "little":
+            out_ids.byteswap(); out_offsets.byteswap()
+
+        tmp_path = index_path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(HEADER.pack(MAGIC, VERSION, len(out_ids), len(blob)))
+            f.write(out_ids.tobytes())
+            f.write(out_offsets.tobytes())
+            f.write(blob)
+        os.replace(tmp_path, index_path)
+        return len(out_ids)
+
+
+def record_from_item(item):
+    """Liste elemanından (appid, isim) çıkarır; parse_json_to_map ile aynı alan adlarını kabul eder."""
+    if not isinstance(item, dict): return None
+    aid = item.get('appid') or item.get('appId') or item.get('id')
+    name = item.get('name') or item.get('gamename')
+    if aid and name: return aid, name
+    return None
+
+
+class AppListStreamParser:
+    """Steam app listesi JSON'ını artımlı olarak ayrıştırır.
+
+    parse_json_to_map'in kabul ettiği şekiller: {"applist": {"apps": [...]}}, {"apps": [...]},
+    kök liste ve düz {"appid": "isim"} sözlüğü. feed() her parça için bulunan kayıtları döndürür,
+    close() belge eksik veya geçersizse ValueError fırlatır. Bellek kullanımı parça boyutu ile
+    en büyük tek eleman (MAX_ELEMENT) ile sınırlıdır.
+    """
+    MAX_ELEMENT = 1 << 20
+    _WHITESPACE = re.compile(r"[ \t\n\r]*")
+
+    def __init__(self):
+        self._text = codecs.getincrementaldecoder("utf-8-sig")(errors="ignore")
+        self._json = json.JSONDecoder()
+        self._buf = ""
+        self._pos = 0
+        # Çerçeve: [tür, durum, son anahtar]; tür "root" | "applist" | "records".
+        self._stack = []
+        self._done = False
+
+    def feed(self, data):
+        self._buf = self._buf[self._pos:] + self._text.decode(data)
+        self._pos = 0
+        return self._parse(final=False)
+
+    def close(self):
+        self._buf = self._buf[self._pos:] + self._text.decode(b"", final=True)
+        self._pos = 0
+        records = self._parse(final=True)
+        if not self._done: raise ValueError("JSON belgesi eksik.")
+        return records
+
+    def _skip_ws(self, pos):
+        return self._WHITESPACE.match(self._buf, pos).end()
+
+    def _decode(self, pos, final):
+        """pos'taki tek bir JSON değerini çözer; veri yetmiyorsa None döndürür."""
+        try:
+            value, end = self._json.raw_decode(self._buf, pos)
+        except json.JSONDecodeError:
+            if final: raise ValueError(f"Geçersiz JSON (konum {pos}).")
+            if len(self._buf) - pos > self.MAX_ELEMENT: raise ValueError("JSON elemanı çok büyük.")
+            return None
+        # Sayı/true gibi değerler parça sınırında bölünmüş olabilir.
+        if end == len(self._buf) and not final: return None
+        return value, end
+
+    def _parse(self, final):
+        records = []
+        stack = self._stack
+        while True:
+            pos = self._skip_ws(self._pos)
+            self._pos = pos
+            if pos >= len(self._buf): break
+            if self._done: raise ValueError("JSON belgesinden sonra fazladan veri var.")
+            c = self._buf[pos]
+
+            if not stack:
+                if c == "{": stack.append(["root", "open", None])
+                elif c == "[": stack.append(["records", "open", None])
+                else: raise ValueError("Beklenmeyen JSON kök değeri.")
+                self._pos = pos + 1
+                continue
+
+            frame = stack[-1]
+            kind, state = frame[0], frame[1]
+            closer = "]" if kind == "records" else "}"
+
+            if state in ("open", "next") and c == closer:
+                stack.pop()
+                if stack: stack[-1][1] = "next"
+                else: self._done = True
+                self._pos = pos + 1
+            elif state == "next":
+                if c != ",": raise ValueError(f"Beklenmeyen karakter (konum {pos}).")
+                frame[1] = "item"
+                self._pos = pos + 1
+            elif kind == "records":
+                decoded = self._decode(pos, final)
+                if decoded is None: break
+                record = record_from_item(decoded[0])
+                if record: records.append(record)
+                frame[1] = "next"
+                self._pos = decoded[1]
+            elif state in ("open", "item"):
+                if c != '"': raise ValueError(f"Anahtar bekleniyordu (konum {pos}).")
+                decoded = self._decode(pos, final)
+                if decoded is None: break
+                frame[1], frame[2] = "colon", decoded[0]
+                self._pos = decoded[1]
+            elif state == "colon":
+                if c != ":": raise ValueError(f"':' bekleniyordu (konum {pos}).")
+                frame[1] = "value"
+                self._pos = pos + 1
+            else:
+                key = frame[2]
+                if kind == "root" and key == "applist" and c == "{":
+                    frame[1] = "next"
+                    stack.append(["applist", "open", None])
+                    self._pos = pos + 1
+                elif key == "apps" and c == "[":
+                    frame[1] = "next"
+                    stack.append(["records", "open", None])
+                    self._pos = pos + 1
+                else:
+                    decoded = self._decode(pos, final)
+                    if decoded is None: break
+                    value = decoded[0]
+                    if kind == "root" and isinstance(value, (str, int)) and not isinstance(value, bool):
+                        records.append((key, str(value)))
+                    frame[1] = "next"
+                    self._pos = decoded[1]
+        return records
+
+
+if __name__ == "__main__":
+    from logic import build_app_index
+
+    if len(sys.argv) != 3:
+        print("Kullanım: python app_index.py <steam_app_list.json> <steam_app_index.bin>")
+        sys.exit(2)
+    count = build_app_index([sys.argv[1]], sys.argv[2])
+    print(f"{count} oyun indekslendi: {sys.argv[2]}")
@@ -0,0 +1,469 @@
+""" Performans ölçüm takımı: sentetik bir Steam kökü üretir ve ana aşamaları zamanlar.
+
+Her aşama grubu ayrı bir yorumlayıcıda (kendi çalışma klasöründe) çalışır; böylece tepe bellek (RSS)
+ve soğuk önbellek ölçümleri birbirini etkilemez. Kayıt defteri okunmaz, Steam kökü çözücüsü sentetik
+köke yönlendirilir.
+
+    python bench.py                                   # tüm aşamalar, JSON rapor
+    python bench.py --stages scan,images --repeat 10
+    python bench.py --profiles 8 --apps 1000 --app-list-size 200000
+    python bench.py --save-baseline                   # sonuçları bench_baseline.json'a yazar
+    python bench.py --compare                         # baseline'a göre gerileme varsa çıkış kodu 1
+    python bench.py --stages write --root D:/bench    # yazma yolunu (ör. HDD'deki) Steam kütüphanesinde ölç
+"""
+import argparse
+import json
+import math
+import os
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+BASELINE_FILE = "bench_baseline.json"
+STAGE_GROUPS = ["profiles", "scan", "catalog", "app_list", "download", "images", "write", "startup"]
+APP_LIST_SHAPES = ["applist", "apps", "list", "map"]
+# Yazma aşamasındaki tipik 1080p ekran görüntüsü ve thumbnail boyutları
+WRITE_FULL_BYTES = 700 * 1024
+WRITE_THUMB_BYTES = 12 * 1024
+# (ad, boyut, mod, biçim, kaydetme seçenekleri)
+IMAGE_CORPUS = [
+    ("jpeg_fhd", (1920, 1080), "RGB", "JPEG", {"quality": 92}),
+    ("jpeg_4k", (3840, 2160), "RGB", "JPEG", {"quality": 92}),
+    ("jpeg_progressive", (1920, 1080), "RGB", "JPEG", {"quality": 92, "progressive": True}),
+    ("png_rgb_fhd", (1920, 1080), "RGB", "PNG", {}),
+    ("png_rgba_fhd", (1920, 1080), "RGBA", "PNG", {}),
+    ("png_palette", (1280, 720), "P", "PNG", {}),
+    ("png_gray_4k", (3840, 2160), "L", "PNG", {}),
+    ("bmp_hd", (1280, 720), "RGB", "BMP", {}),
+]
+_WORDS = ["Counter", "Strike", "Half", "Life", "Portal", "Simulator", "Legends", "Edition", "Dark", "Souls",
+          "Space", "Farm", "Racing", "Tactics", "Online", "Remastered", "Chronicles", "Quest", "Hollow", "Knight"]
+
+
+# --- Sentetik veri üretimi -------------------------------------------------------------------------
+
+def _game_name(rng):
+    return " ".join(rng.choice(_WORDS) for _ in range(rng.randint(1, 4)))
+
+
+def write_localconfig(path, persona_name, size_kb, rng):
+    """PersonaName'i büyük bir apps bloğunun ARKASINA koyar (akışlı aramanın en kötü durumu)."""
+    with open(path, "w", encoding="utf-8", newline="\n") as f:
+        f.write('"UserLocalConfigStore"\n{\n\t"Software"\n\t{\n\t\t"Valve"\n\t\t{\n\t\t\t"Steam"\n\t\t\t{\n'
+                '\t\t\t\t"apps"\n\t\t\t\t{\n')
+        app_id = 10
+        while f.tell() < size_kb * 1024:
+            f.write(f'\t\t\t\t\t"{app_id}"\n\t\t\t\t\t{{\n'
+                    f'\t\t\t\t\t\t"LastPlayed"\t\t"{rng.randint(1_500_000_000, 1_700_000_000)}"\n'
+                    f'\t\t\t\t\t\t"Playtime"\t\t"{rng.randint(0, 50000)}"\n'
+                    f'\t\t\t\t\t\t"cloud"\n\t\t\t\t\t\t{{\n\t\t\t\t\t\t\t"last_sync_state"\t\t"synchronized"\n'
+                    f'\t\t\t\t\t\t}}\n\t\t\t\t\t}}\n')
+            app_id += 10
+        f.write('\t\t\t\t}\n\t\t\t}\n\t\t}\n\t}\n\t"friends"\n\t{\n'
+                f'\t\t"PersonaName"\t\t"{persona_name}"\n\t}}\n}}\n')
+
+
+def make_steam_root(root, profiles, apps, localconfig_kb, screenshots_per_app, seed=1):
+    """userdata/<id>/config/localconfig.vdf ve userdata/<id>/760/remote/<app>/screenshots ağacı üretir.
+    Uygulamaların dörtte biri screenshots klasörü olmadan bırakılır. Üretilen app ID'lerini döndürür."""
+    rng = random.Random(seed)
+    app_ids = sorted(rng.sample(range(10, 3_000_000, 10), apps))
+    for n in range(profiles):
+        user_dir = os.path.join(root, "userdata", str(100000 + n))
+        os.makedirs(os.path.join(user_dir, "config"), exist_ok=True)
+        write_localconfig(os.path.join(user_dir, "config", "localconfig.vdf"), f"Bench User {n}", localconfig_kb, rng)
+        for app_id in app_ids:
+            app_dir = os.path.join(user_dir, "760", "remote", str(app_id))
+            if rng.random() < 0.25:
+                os.makedirs(app_dir, exist_ok=True)
+                continue
+            shots = os.path.join(app_dir, "screenshots")
+            os.makedirs(os.path.join(shots, "thumbnails"), exist_ok=True)
+            for i in range(screenshots_per_app):
+                with open(os.path.join(shots, f"20240101{i:06d}_1.jpg"), "wb") as f:
+                    f.write(b"\xff\xd8" + bytes(rng.randint(2000, 8000)) + b"\xff\xd9")
+    return app_ids
+
+
+def make_app_list(path, count, shape, known_ids=(), seed=2):
+    """Steam app listesini verilen şekilde yazar: applist | apps | list | map."""
+    rng = random.Random(seed)
+    ids = list(known_ids) + [i * 10 + 5 for i in range(count - len(known_ids))]
+    records = [(app_id, _game_name(rng)) for app_id in ids[:count]]
+    if shape == "map":
+        data = {str(app_id): name for app_id, name in records}
+    else:
+        apps = [{"appid": app_id, "name": name} for app_id, name in records]
+        data = {"applist": {"apps": apps}} if shape == "applist" else {"apps": apps} if shape == "apps" else apps
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False)
+
+
+def make_image_corpus(folder, per_kind, seed=3):
+    """IMAGE_CORPUS'taki her tür için per_kind resim üretir (yumuşak gürültü; gerçekçi sıkıştırma)."""
+    from PIL import Image
+
+    random.seed(seed)
+    os.makedirs(folder, exist_ok=True)
+    paths = {}
+    for name, (w, h), mode, fmt, options in IMAGE_CORPUS:
+        paths[name] = []
+        for i in range(per_kind):
+            bands = [Image.effect_noise((w // 16, h // 16), 80 + 10 * i).resize((w, h), Image.Resampling.BILINEAR)
+                     for _ in range(3)]
+            img = Image.merge("RGB", bands)
+            if mode == "RGBA": img.putalpha(bands[0])
+            elif mode == "P": img = img.quantize(256)
+            elif mode == "L": img = bands[1]
+            path = os.path.join(folder, f"{name}_{i}.{fmt.lower()}")
+            img.save(path, fmt, **options)
+            paths[name].append(path)
+    return paths
+
+
+def generate_fixture(root, args):
+    started = time.perf_counter()
+    steam_root = os.path.join(root, "steam")
+    app_ids = make_steam_root(steam_root, args.profiles, args.apps, args.localconfig_kb, args.screenshots)
+    lists = os.path.join(root, "app_lists")
+    os.makedirs(lists, exist_ok=True)
+    for shape in APP_LIST_SHAPES:
+        make_app_list(os.path.join(lists, f"{shape}.json"), args.app_list_size, shape, app_ids)
+    corpus = make_image_corpus(os.path.join(root, "images"), args.images) if "images" in args.stages else {}
+    fixture = {"steam_root": steam_root, "app_lists": {s: os.path.join(lists, f"{s}.json") for s in APP_LIST_SHAPES},
+               "images": corpus, "user_id": str(100000), "seconds": round(time.perf_counter() - started, 2)}
+    with open(os.path.join(root, "fixture.json"), "w", encoding="utf-8") as f:
+        json.dump(fixture, f)
+    return fixture
+
+
+# --- Ölçüm ----------------------------------------------------------------------------------------
+
+def peak_rss_mb():
+    # Linux'ta ru_maxrss exec'ten sonra ebeveynin tepe değerini taşır; VmHWM yalnızca bu sürece aittir.
+    try:
+        with open("/proc/self/status", encoding="ascii") as f:
+            for line in f:
+                if line.startswith("VmHWM:"): return round(int(line.split()[1]) / 1024, 1)
+    except OSError:
+        pass
+    try:
+        import resource
+    except ImportError:
+        return None  # Windows
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def percentile(sorted_values, pct):
+    if not sorted_values: return None
+    # En yakın sıra yöntemi
+    rank = math.ceil(pct / 100.0 * len(sorted_values)) - 1
+    return sorted_values[max(0, min(len(sorted_values) - 1, rank))]
+
+
+def summarize(samples_ms, items):
+    ordered = sorted(samples_ms)
+    total_s = sum(ordered) / 1000.0
+    return {"runs": len(ordered), "items": items,
+            "mean_ms": round(sum(ordered) / len(ordered), 3),
+            "p50_ms": round(percentile(ordered, 50), 3),
+            "p90_ms": round(percentile(ordered, 90), 3),
+            "p99_ms": round(percentile(ordered, 99), 3),
+            "throughput_per_s": round(items * len(ordered) / total_s, 1) if total_s else None,
+            "peak_rss_mb": peak_rss_mb()}
+
+
+def timed(fn, repeat, items=1, setup=None):
+    samples = []
+    for _ in range(repeat):
+        if setup: setup()
+        started = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - started) * 1000.0)
+    return summarize(samples, items)
+
+
+def _reset_scan_cache():
+    import logic
+    logic._scan_cache = None
+    logic._scan_cache_dirty = False
+    if os.path.exists(logic.SCAN_CACHE_FILE): os.remove(logic.SCAN_CACHE_FILE)
+
+
+def stage_profiles(fixture, args):
+    from logic import find_steam_profiles
+    count = len(find_steam_profiles())
+    return {"profiles_cold": timed(find_steam_profiles, args.repeat, count, setup=_reset_scan_cache),
+            "profiles_warm": timed(find_steam_profiles, args.repeat, count)}
+
+
+def stage_scan(fixture, args):
+    from logic import scan_for_games
+    user_id = fixture["user_id"]
+    count = len(scan_for_games(user_id).get("data", []))
+    return {"scan_cold": timed(lambda: scan_for_games(user_id), args.repeat, count, setup=_reset_scan_cache),
+            "scan_warm": timed(lambda: scan_for_games(user_id), args.repeat, count)}
+
+
+def stage_catalog(fixture, args):
+    from logic import build_library_catalog
+    catalog = build_library_catalog()
+    return {"catalog": timed(build_library_catalog, args.repeat, catalog["game_count"], setup=_reset_scan_cache)}
+
+
+def stage_app_list(fixture, args):
+    from logic import parse_json_to_map, build_app_index
+    results = {}
+    for shape, path in fixture["app_lists"].items():
+        results[f"parse_{shape}"] = timed(lambda: parse_json_to_map(path, {}), args.repeat, args.app_list_size)
+    path = fixture["app_lists"]["applist"]
+    results["app_index_build"] = timed(lambda: build_app_index([path], "bench_index.bin"), args.repeat,
+                                       args.app_list_size)
+    return results
+
+
+def stage_download(fixture, args):
+    """Yerel bir HTTP sunucusu Steam API'sinin yerine geçer; akışlı indirme + indeks yazımı ölçülür."""
+    import threading
+    from functools import partial
+    from http.server import ThreadingHTTPServer, SimpleHTTPRequestHandler
+    import logic
+
+    class QuietHandler(SimpleHTTPRequestHandler):
+        def log_message(self, *a): pass
+
+    handler = partial(QuietHandler, directory=os.path.dirname(fixture["app_lists"]["applist"]))
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_address[1]}/applist.json"
+
+    def fresh():
+        logic.close_app_indexes()
+        for path in (logic.APP_LIST_FILE, logic.APP_INDEX_FILE, logic.APP_LIST_META_FILE):
+            if os.path.exists(path): os.remove(path)
+
+    try:
+        return {"download": timed(lambda: logic.get_app_list_from_steam(sources=[url]), args.repeat,
+                                  args.app_list_size, setup=fresh),
+                # İkinci istek Last-Modified ile koşullu gider (304 yolu).
+                "download_not_modified": timed(lambda: logic.get_app_list_from_steam(sources=[url]), args.repeat)}
+    finally:
+        server.shutdown()
+
+
+def stage_images(fixture, args):
+    from logic import process_image, process_images_batch
+    out = os.path.abspath("screenshots")
+    os.makedirs(os.path.join(out, "thumbnails"), exist_ok=True)
+    results = {}
+    sources = [p for paths in fixture["images"].values() for p in paths]
+    if sources: process_image(sources[0], out)  # PIL ve eklentilerinin yüklenmesi ölçüme katılmaz
+    for name, paths in fixture["images"].items():
+        samples = []
+        for _ in range(args.repeat):
+            for path in paths:
+                started = time.perf_counter()
+                result = process_image(path, out)
+                samples.append((time.perf_counter() - started) * 1000.0)
+                if not result["success"]: raise RuntimeError(f"{path}: {result}")
+        results[f"image_{name}"] = summarize(samples, 1)
+
+    def batch(skip_duplicates=False):
+        for event in process_images_batch(sources, out, max_workers=args.workers, register_manifest=False,
+                                          skip_duplicates=skip_duplicates): pass
+
+    results["image_batch"] = timed(batch, args.repeat, len(sources))
+    batch(True)  # indeksi kurar; sonraki turlar yalnızca tekrar kontrolünü ölçer
+    results["image_batch_duplicates"] = timed(lambda: batch(True), args.repeat, len(sources))
+    results.update(stage_encode(sources, args))
+    return results
+
+
+def stage_encode(sources, args):
+    """Kodlayıcı profillerini önceden çözülmüş resimler üzerinde karşılaştırır (CPU'ya karşı bayt)."""
+    import encoder
+    from PIL import Image
+    decoded = []
+    for path in sources:
+        with Image.open(path) as img: decoded.append(img.convert("RGB"))
+    results = {}
+    variants = [(name, name, None) for name in encoder.PROFILES] + [("balanced_300kb", "balanced", 300 * 1024)]
+    for label, profile, max_bytes in variants:
+        sizes = []
+        run = lambda: sizes.extend(encoder.encode_screenshot(img, profile, max_bytes)[1]["bytes"] for img in decoded)
+        results[f"encode_{label}"] = timed(run, args.repeat, len(decoded))
+        results[f"encode_{label}"]["bytes_per_image"] = sum(sizes) // len(sizes) if sizes else None
+    return results
+
+
+def stage_write(fixture, args):
+    """Ekran görüntüsü + thumbnail çiftlerinin yazılması: eski doğrudan yazma (senkron yok), dosya başına
+    fsync'li atomik yazma ve publisher.GroupCommit (toplu senkron). Çalışma klasörü --root altındadır."""
+    import publisher
+    rng = random.Random(4)
+    pairs = [(rng.randbytes(WRITE_FULL_BYTES), rng.randbytes(WRITE_THUMB_BYTES)) for _ in range(args.write_files)]
+    folder = os.path.abspath("screenshots")
+    thumbs = os.path.join(folder, "thumbnails")
+
+    def setup():
+        shutil.rmtree(folder, ignore_errors=True)
+        os.makedirs(thumbs)
+
+    def paths(i):
+        return os.path.join(thumbs, f"{i}.jpg"), os.path.join(folder, f"{i}.jpg")
+
+    def direct():
+        for i, (full, thumb) in enumerate(pairs):
+            thumb_path, full_path = paths(i)
+            for path, data in ((full_path, full), (thumb_path, thumb)):
+                with open(path, "wb") as f: f.write(data)
+
+    def fsync_each():
+        for i, (full, thumb) in enumerate(pairs):
+            for path, data in zip(paths(i), (thumb, full)):
+                tmp = publisher.temp_path(path)
+                with open(tmp, "wb") as f:
+                    f.write(data)
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.replace(tmp, path)
+                publisher._fsync_dir(os.path.dirname(path))
+
+    def group():
+        writer = publisher.GroupCommit()
+        for i, (full, thumb) in enumerate(pairs):
+            thumb_path, full_path = paths(i)
+            writer.add([(publisher.write_temp(thumb_path, thumb), thumb_path),
+                        (publisher.write_temp(full_path, full), full_path)])
+            if writer.due(): writer.commit()
+        writer.commit()
+
+    results = {}
+    for name, fn in (("direct", direct), ("fsync_each", fsync_each), ("group_commit", group)):
+        results[f"write_{name}"] = timed(fn, args.repeat, len(pairs), setup=setup)
+    shutil.rmtree(folder, ignore_errors=True)
+    return results
+
+
+def stage_startup(fixture, args):
+    from tests import test_startup
+    results = {}
+    for module in test_startup.IMPORT_BUDGETS_MS:
+        test_startup.measure_import(module)  # .pyc önbelleğini ısıtır
+        samples = [test_startup.measure_import(module)[0] for _ in range(args.repeat)]
+        results[f"import_{module}"] = summarize(samples, 1)
+        results[f"import_{module}"]["peak_rss_mb"] = None  # alt süreçte ölçülür
+    return results
+
+
+STAGES = {"profiles": stage_profiles, "scan": stage_scan, "catalog": stage_catalog, "app_list": stage_app_list,
+          "download": stage_download, "images": stage_images, "write": stage_write, "startup": stage_startup}
+
+
+def run_child(args):
+    """Tek bir aşama grubunu bu süreçte çalıştırır ve sonucu JSON olarak yazar."""
+    here = os.path.dirname(os.path.abspath(__file__))
+    if here not in sys.path: sys.path.insert(0, here)
+    with open(os.path.join(args.root, "fixture.json"), encoding="utf-8") as f:
+        fixture = json.load(f)
+    workdir = os.path.join(args.root, f"work-{args.child}")
+    shutil.rmtree(workdir, ignore_errors=True)
+    os.makedirs(workdir)
+    os.chdir(workdir)  # config.json, önbellekler ve app listesi çalışma klasörüne göreli yazılır
+
+    import logic
+    logic.register_steam_root_resolver(lambda: fixture["steam_root"])
+    if logic._steam_root_from_registry in logic.STEAM_ROOT_RESOLVERS:
+        logic.STEAM_ROOT_RESOLVERS.remove(logic._steam_root_from_registry)
+    print(json.dumps(STAGES[args.child](fixture, args)))
+    return 0
+
+
+def run_stage_subprocess(group, args):
+    cmd = [sys.executable, os.path.abspath(__file__), "--child", group, "--root", args.root,
+           "--repeat", str(args.repeat), "--app-list-size", str(args.app_list_size),
+           "--write-files", str(args.write_files)]
+    if args.workers: cmd += ["--workers", str(args.workers)]
+    proc = subprocess.run(cmd, capture_output=True, text=True)
+    if proc.returncode != 0:
+        return {group: {"error": (proc.stderr.strip().splitlines() or ["?"])[-1]}}
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+def compare(results, baseline, tolerance):
+    """p50 süresi baseline'ın (1 + tolerance) katını aşan aşamalar gerileme sayılır."""
+    report, regressed = {}, False
+    for name, current in results.items():
+        base = baseline.get(name)
+        if not base or "p50_ms" not in current or not base.get("p50_ms"): continue
+        ratio = current["p50_ms"] / base["p50_ms"]
+        slower = ratio > 1 + tolerance
+        regressed |= slower
+        report[name] = {"baseline_p50_ms": base["p50_ms"], "p50_ms": current["p50_ms"],
+                        "ratio": round(ratio, 3), "regressed": slower}
+    return report, regressed
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="python bench.py", description="SteamF12TooL performans ölçümü")
+    parser.add_argument("--stages", default=",".join(STAGE_GROUPS), help=f"Virgülle ayrılmış: {','.join(STAGE_GROUPS)}")
+    parser.add_argument("--repeat", type=int, default=5, help="Her aşamanın tekrar sayısı")
+    parser.add_argument("--profiles", type=int, default=3)
+    parser.add_argument("--apps", type=int, default=300, help="Profil başına uygulama klasörü")
+    parser.add_argument("--screenshots", type=int, default=3, help="Uygulama başına sahte ekran görüntüsü")
+    parser.add_argument("--localconfig-kb", type=int, default=2048, help="localconfig.vdf boyutu (KB)")
+    parser.add_argument("--app-list-size", type=int, default=100000, help="App listesindeki oyun sayısı")
+    parser.add_argument("--images", type=int, default=2, help="Resim türü başına örnek sayısı")
+    parser.add_argument("--workers", type=int, default=None, help="Toplu işlem için işçi sayısı")
+    parser.add_argument("--write-files", type=int, default=64, help="Yazma aşamasındaki dosya çifti sayısı")
+    parser.add_argument("--root", help="Sentetik verinin klasörü (varsayılan: geçici klasör)")
+    parser.add_argument("--keep", action="store_true", help="Geçici klasörü silme")
+    parser.add_argument("--baseline", default=BASELINE_FILE)
+    parser.add_argument("--save-baseline", action="store_true", help="Sonuçları baseline olarak kaydet")
+    parser.add_argument("--compare", action="store_true", help="Baseline'a göre gerilemede çıkış kodu 1")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="İzin verilen p50 yavaşlama oranı")
+    parser.add_argument("--child", choices=STAGE_GROUPS, help=argparse.SUPPRESS)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    if args.child: return run_child(args)
+
+    args.stages = [s.strip() for s in args.stages.split(",") if s.strip()]
+    unknown = set(args.stages) - set(STAGE_GROUPS)
+    if unknown: build_parser().error(f"Bilinmeyen aşama: {', '.join(sorted(unknown))}")
+    temporary = args.root is None
+    args.root = os.path.abspath(args.root or tempfile.mkdtemp(prefix="f12bench-"))
+    try:
+        fixture = generate_fixture(args.root, args)
+        results = {}
+        for group in args.stages: results.update(run_stage_subprocess(group, args))
+        report = {"python": sys.version.split()[0], "platform": sys.platform, "cpu_count": os.cpu_count(),
+                  "fixture": {"profiles": args.profiles, "apps": args.apps, "localconfig_kb": args.localconfig_kb,
+                              "app_list_size": args.app_list_size, "images_per_kind": args.images,
+                              "generate_s": fixture["seconds"]},
+                  "results": results}
+        baseline = None
+        if os.path.exists(args.baseline):
+            with open(args.baseline, encoding="utf-8") as f:
+                baseline = json.load(f).get("results", {})
+        regressed = False
+        if baseline is not None:
+            report["comparison"], regressed = compare(results, baseline, args.tolerance)
+        if args.save_baseline:
+            with open(args.baseline, "w", encoding="utf-8") as f:
+                json.dump(report, f, indent=4)
+        print(json.dumps(report, indent=4))
+        failed = any("error" in r for r in results.values())
+        return 1 if failed or (args.compare and regressed) else 0
+    finally:
+        if temporary and not args.keep: shutil.rmtree(args.root, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,228 @@
+""" SteamF12TooL komut satırı arayüzü (GUI yığını hiç yüklenmez).
+
+Kullanım:
+    python -m cli profiles
+    python -m cli games --user 12345678
+    python -m cli catalog
+    python -m cli import --user 12345678 --app 730 "captures/*.png"
+    python -m cli import --folder "D:/Steam/userdata/1/760/remote/730/screenshots" a.jpg b.png
+    python -m cli import --user 12345678 --app 730 --profile smallest --max-kb 800 shots/*.png
+    python -m cli watch D:/captures --user 12345678 --rule "cs2/*=730" --archive D:/captures-done
+
+Her çıktı satırı bir JSON nesnesidir (JSON-lines). --metrics ile sonda {"event": "metrics", ...} satırı,
+--metrics-file ile OpenMetrics metni yazılır:
+    python -m cli --metrics --metrics-file import.prom import --folder ... *.png
+"""
+import argparse
+import glob
+import json
+import os
+import sys
+
+import encoder
+import metrics
+from logic import (find_steam_profiles, scan_for_games, process_images_batch, get_screenshots_folder,
+                   iter_library_catalog)
+
+
+def emit(obj):
+    sys.stdout.write(json.dumps(obj, ensure_ascii=False) + "\n")
+    sys.stdout.flush()
+
+
+def cmd_profiles(args):
+    profiles = find_steam_profiles()
+    if not profiles:
+        emit({"success": False, "message_key": "no_profiles_found"})
+        return 1
+    for profile in profiles: emit(profile)
+    return 0
+
+
+def cmd_games(args):
+    result = scan_for_games(args.user)
+    if not result["success"]:
+        emit(result)
+        return 1
+    for game in result["data"]: emit(game)
+    return 0
+
+
+def cmd_catalog(args):
+    found = False
+    for profile in iter_library_catalog(args.workers):
+        found = True
+        emit(profile)
+    if not found:
+        emit({"success": False, "message_key": "no_profiles_found"})
+        return 1
+    return 0
+
+
+def expand_sources(patterns):
+    sources = []
+    for pattern in patterns:
+        matches = sorted(glob.glob(pattern, recursive=True))
+        sources.extend(p for p in (matches or [pattern]) if os.path.isfile(p))
+    return sources
+
+
+def cmd_import(args):
+    if args.folder:
+        folder = args.folder
+        if os.path.basename(os.path.normpath(folder)).lower() == "thumbnails": folder = os.path.dirname(folder)
+    elif args.user and args.app:
+        folder = get_screenshots_folder(args.user, args.app, create=True)
+        if not folder:
+            emit({"success": False, "message_key": "steam_not_found"})
+            return 1
+    else:
+        emit({"success": False, "message_key": "select_folder_warning"})
+        return 2
+    if not os.path.isdir(folder):
+        emit({"success": False, "message_key": "select_folder_warning", "data": folder})
+        return 1
+
+    sources = expand_sources(args.files)
+    if not sources:
+        emit({"success": False, "message_key": "select_image_warning"})
+        return 1
+
+    failed = 0
+    for event in process_images_batch(sources, folder, max_workers=args.workers,
+                                      use_capture_time=args.capture_time,
+                                      skip_duplicates=not args.allow_duplicates, **image_options(args)):
+        if event["event"] == "result":
+            result = event["result"]
+            if not result.get("success"): failed += 1
+            emit({"event": "result", "source": event["source"], "done": event["done"],
+                  "total": event["total"], **result})
+        else:
+            emit(event)
+    return 1 if failed else 0
+
+
+def write_metrics_file(path):
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write(metrics.to_openmetrics())
+    os.replace(tmp_path, path)
+
+
+def cmd_watch(args):
+    import signal
+    import watch
+
+    if not os.path.isdir(args.drop_dir):
+        emit({"success": False, "message_key": "select_folder_warning", "data": args.drop_dir})
+        return 2
+    try:
+        patterns = [watch.parse_rule(rule) for rule in args.rule]
+        if args.rules_file:
+            with open(args.rules_file, "r", encoding="utf-8") as f:
+                patterns.extend((str(p), str(a)) for p, a in json.load(f).items())
+    except (OSError, ValueError) as e:
+        emit({"success": False, "message_key": "unexpected_error", "data": str(e)})
+        return 2
+
+    def on_event(event):
+        emit(event)
+        # Uzun süren çalışmada ölçüm dosyası periyodik güncellenir (Prometheus textfile toplayıcısı için).
+        if event["event"] == "stats" and args.metrics_file: write_metrics_file(args.metrics_file)
+
+    daemon = watch.IngestDaemon(args.drop_dir, args.user,
+                                rules=watch.RuleSet(patterns, args.default_app, args.user),
+                                workers=args.workers, batch_size=args.batch_size, settle=args.settle,
+                                max_backlog=args.max_backlog, archive_dir=args.archive, poll=args.poll,
+                                poll_interval=args.poll_interval, include_existing=not args.new_only,
+                                on_event=on_event, stats_interval=args.stats_interval,
+                                image_options=image_options(args))
+    if hasattr(signal, "SIGTERM"): signal.signal(signal.SIGTERM, lambda *_: daemon.stop())
+    try:
+        daemon.run()
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+def image_options(args):
+    return {"max_side": args.max_side, "memory_budget_mb": args.memory_budget_mb, "encode_profile": args.profile,
+            "max_bytes": args.max_kb * 1024 if args.max_kb else None, "min_ssim": args.min_ssim}
+
+
+def add_image_arguments(parser):
+    parser.add_argument("--max-side", type=int, default=None,
+                        help="Çıktının en uzun kenarı; büyük resimler küçültülür (varsayılan: 16384)")
+    parser.add_argument("--memory-budget-mb", type=int, default=None,
+                        help="Resim başına (işçi başına) çözme bellek bütçesi, MB (varsayılan: 1024)")
+    parser.add_argument("--profile", choices=list(encoder.PROFILES), default=None,
+                        help=f"JPEG kodlayıcı profili (varsayılan: {encoder.DEFAULT_PROFILE})")
+    parser.add_argument("--max-kb", type=int, default=None,
+                        help="Resim başına boyut hedefi (KB); kalite SSIM tabanının altına düşürülmez")
+    parser.add_argument("--min-ssim", type=float, default=None,
+                        help=f"Kalite aramasında SSIM tabanı (varsayılan: {encoder.DEFAULT_MIN_SSIM})")
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="python -m cli", description="SteamF12TooL komut satırı arayüzü")
+    parser.add_argument("--metrics", action="store_true", help="Aşama sürelerini ölç ve sonda JSON olarak yaz")
+    parser.add_argument("--metrics-file", help="Ölçümleri OpenMetrics metni olarak bu dosyaya yaz")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    sub.add_parser("profiles", help="Steam profillerini listele").set_defaults(func=cmd_profiles)
+
+    games = sub.add_parser("games", help="Profildeki ekran görüntüsü klasörü olan oyunları listele")
+    games.add_argument("--user", required=True, help="Steam kullanıcı ID'si (userdata klasör adı)")
+    games.set_defaults(func=cmd_games)
+
+    catalog = sub.add_parser("catalog", help="Tüm profillerin oyun/ekran görüntüsü kataloğu (profil başına bir satır)")
+    catalog.add_argument("--workers", type=int, default=None, help="Eşzamanlı taranacak profil sayısı")
+    catalog.set_defaults(func=cmd_catalog)
+
+    imp = sub.add_parser("import", help="Resimleri bir oyunun ekran görüntüsü klasörüne aktar")
+    imp.add_argument("files", nargs="+", help="Dosyalar veya glob desenleri (ör. \"captures/**/*.png\")")
+    imp.add_argument("--user", help="Steam kullanıcı ID'si")
+    imp.add_argument("--app", help="Oyunun Steam app ID'si")
+    imp.add_argument("--folder", help="Doğrudan hedef screenshots klasörü")
+    imp.add_argument("--workers", type=int, default=None, help="Paralel işçi sayısı (varsayılan: CPU sayısı)")
+    imp.add_argument("--capture-time", action="store_true",
+                     help="Dosya adlarını EXIF çekim zamanından (DateTimeOriginal) üret")
+    imp.add_argument("--allow-duplicates", action="store_true",
+                     help="Klasörde zaten bulunan resimleri de aktar (tekrar indeksi kullanılmaz)")
+    add_image_arguments(imp)
+    imp.set_defaults(func=cmd_import)
+
+    wat = sub.add_parser("watch", help="Bir klasörü izle ve yeni resimleri otomatik aktar (Ctrl+C ile durur)")
+    wat.add_argument("drop_dir", help="İzlenecek bırakma klasörü")
+    wat.add_argument("--user", required=True, help="Steam kullanıcı ID'si")
+    wat.add_argument("--rule", action="append", default=[],
+                     help="DESEN=APPID; göreli yola veya dosya adına uyan glob (ör. \"cs2/*=730\"), tekrarlanabilir")
+    wat.add_argument("--rules-file", help="{\"desen\": \"appid\"} biçiminde JSON kural dosyası")
+    wat.add_argument("--default-app", help="Hiçbir kurala uymayan dosyaların app ID'si")
+    wat.add_argument("--archive", help="Aktarılan kaynakların taşınacağı klasör (verilmezse yerinde kalır)")
+    wat.add_argument("--workers", type=int, default=None, help="Paralel işçi sayısı (varsayılan: CPU sayısı)")
+    wat.add_argument("--batch-size", type=int, default=16, help="Mikro grup başına en fazla dosya")
+    wat.add_argument("--settle", type=float, default=1.0,
+                     help="Dosyanın hazır sayılması için değişmeden geçmesi gereken saniye")
+    wat.add_argument("--max-backlog", type=int, default=256, help="İçe aktarma kuyruğunun üst sınırı")
+    wat.add_argument("--poll", action="store_true", help="inotify yerine periyodik tarama kullan")
+    wat.add_argument("--poll-interval", type=float, default=1.0, help="Tarama aralığı (saniye)")
+    wat.add_argument("--new-only", action="store_true", help="Başlangıçta klasörde olan dosyaları atla")
+    wat.add_argument("--stats-interval", type=float, default=30.0,
+                     help="Bu aralıkla {\"event\": \"stats\"} satırı yaz (0: kapalı)")
+    add_image_arguments(wat)
+    wat.set_defaults(func=cmd_watch)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    if args.metrics or args.metrics_file: metrics.enable()
+    code = args.func(args)
+    if args.metrics: emit({"event": "metrics", **metrics.snapshot()})
+    if args.metrics_file: write_metrics_file(args.metrics_file)
+    return code
+
+
+if __name__ == "__main__":
+    sys.exit(main())
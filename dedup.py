@@ -0,0 +1,288 @@
+""" Ekran görüntüsü klasörleri için içerik özeti (hash) tabanlı tekrar indeksi.
+
+Her screenshots klasöründe gizli bir indeks dosyası (.f12dedup.json) tutulur. Her .jpg için:
+    bytes   : dosya baytlarının özeti (aynı dosyanın yeniden içe aktarılmasını çözmeden yakalar)
+    dhash   : 64 bitlik fark (difference) hash'i; yeniden kodlanmış kopyalar için aday bulur. Her iki
+              taraf da thumbnail ölçeğinde, kodlanmış thumbnail'den hesaplanır (içe aktarılan resimde
+              yazılacak thumbnail baytları, klasördeki dosyada thumbnails/ altındaki dosya)
+    dims    : genişlik, yükseklik
+Bu araçla içe aktarılan dosyalar ayrıca kaynağın bayt özetini ve çözülmüş piksel özetini saklar.
+
+Aramalar sözlük üzerinden O(1)'dir; dHash 8 bitlik 8 dilime bölünerek dilim başına indekslenir
+(DHASH_MAX_DISTANCE bit farkı en az bir dilimi bozmadan bırakır), eşleşme küçük ölçekli bir piksel
+karşılaştırmasıyla doğrulanır. İndeks klasörün mtime'ı değiştiğinde artımlı güncellenir: yalnızca
+yeni/değişen dosyalar (thumbnail'leri, yoksa JPEG draft ile thumbnail ölçeğinde) okunur, silinenler
+düşürülür.
+"""
+import hashlib
+import io
+import json
+import os
+import threading
+
+INDEX_FILE = ".f12dedup.json"
+INDEX_VERSION = 3
+# Aynı içeriğin farklı kodlamaları (thumbnail kalitesi, Steam'in kendi thumbnail'i, draft çözme) düz
+# alanlı resimlerde birkaç bit farklı dHash verebilir; adaylar zaten piksel imzasıyla doğrulanır.
+DHASH_MAX_DISTANCE = 7
+_DHASH_BANDS = 8  # 8 bitlik dilim; DHASH_MAX_DISTANCE < _DHASH_BANDS olmalıdır
+# Doğrulamada 64x64 gri tonlu imzalar arasındaki en büyük ortalama ve hücre başı mutlak fark (0-255).
+# Hücre sınırı, yalnızca küçük bir bölgesi (imleç, HUD) değişmiş farklı kareleri ayırır.
+VERIFY_SIDE = 64
+VERIFY_MAX_MEAN_DIFF = 3.0
+VERIFY_MAX_CELL_DIFF = 24
+THUMBNAIL_WIDTH = 200
+_CHUNK = 1 << 20
+
+
+def _hasher(data=b""):
+    # Güvenlik amaçlı değil; SHA-1 çoğu işlemcide donanım hızlandırmalı ve blake2b'den hızlıdır.
+    return hashlib.sha1(data, usedforsecurity=False)
+
+
+def file_digest(path):
+    h = _hasher()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(_CHUNK), b""): h.update(chunk)
+    return h.hexdigest()
+
+
+def buffer_digest(data):
+    return _hasher(data).hexdigest()
+
+
+def pixel_digest(img):
+    """Çözülmüş piksellerin özeti (mod ve boyut dahil); kaynak biçiminden bağımsızdır. Büyük
+    görüntülerin tam kopyası çıkarılmasın diye şerit şerit okunur (özet, tek parça ile aynıdır)."""
+    h = _hasher()
+    width, height = img.size
+    h.update(f"{img.mode}:{width}x{height}:".encode())
+    rows = max(1, (16 * _CHUNK) // max(1, width * 4))
+    if rows >= height:
+        h.update(img.tobytes())
+    else:
+        for y in range(0, height, rows): h.update(img.crop((0, y, width, min(height, y + rows))).tobytes())
+    return h.hexdigest()
+
+
+def dhash(img):
+    from PIL import Image
+    small = img.resize((9, 8), Image.Resampling.BOX).convert("L").tobytes()
+    value = 0
+    for row in range(8):
+        line = small[row * 9:row * 9 + 9]
+        for x in range(8): value = (value << 1) | (line[x] > line[x + 1])
+    return value
+
+
+def thumbnail_dhash(data):
+    """Kodlanmış thumbnail baytlarının dHash'i (klasördeki thumbnails/ dosyalarıyla aynı ölçek ve yol)."""
+    from PIL import Image
+    with Image.open(io.BytesIO(data)) as img:
+        return dhash(img)
+
+
+def _dhash_bands(value):
+    return [(band, value >> (8 * band) & 0xFF) for band in range(_DHASH_BANDS)]
+
+
+def _signature(img):
+    from PIL import Image
+    return img.resize((VERIFY_SIDE, VERIFY_SIDE), Image.Resampling.BOX).convert("L").tobytes()
+
+
+def _thumbnail_like(img):
+    """Açık bir dosyadan içe aktarmadaki thumbnail ile aynı ölçek ve yöntemle (JPEG draft, sonra
+    LANCZOS; logic._make_thumbnail) küçük resim üretir; dHash ve doğrulama hep bu ölçekte yapılır."""
+    from PIL import Image
+    size = (THUMBNAIL_WIDTH, max(1, img.size[1] * THUMBNAIL_WIDTH // img.size[0]))
+    img.draft("RGB", (size[0] * 3, size[1] * 3))
+    return img.convert("RGB").resize(size, Image.LANCZOS, reducing_gap=3.0)
+
+
+class DedupIndex:
+    """Bir screenshots klasörünün tekrar indeksi. Sözlükler yüklemede bir kez kurulur."""
+
+    def __init__(self, folder):
+        self.folder = folder
+        self.path = os.path.join(folder, INDEX_FILE)
+        self.files = {}
+        self.folder_mtime = None
+        self.dirty = False
+        self._lock = threading.Lock()
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("version") == INDEX_VERSION:
+                self.files = data.get("files", {})
+                self.folder_mtime = data.get("folder_mtime")
+        except (OSError, ValueError, AttributeError):
+            pass
+        self._rebuild_maps()
+
+    def _rebuild_maps(self):
+        self._by_bytes, self._by_pixels, self._by_dhash = {}, {}, {}
+        for name, entry in self.files.items(): self._map_entry(name, entry)
+
+    def _map_entry(self, name, entry):
+        for digest in [entry.get("bytes")] + entry.get("sources", []):
+            if digest: self._by_bytes[digest] = name
+        if entry.get("pixels"): self._by_pixels[entry["pixels"]] = name
+        if entry.get("dhash") is not None:
+            for key in _dhash_bands(entry["dhash"]): self._by_dhash.setdefault(key, []).append(name)
+
+    def __len__(self):
+        return len(self.files)
+
+    def refresh(self):
+        """Klasör değiştiyse yeni/değişen .jpg dosyalarını indeksler, silinenleri çıkarır."""
+        try:
+            mtime = os.stat(self.folder).st_mtime_ns
+        except OSError:
+            return False
+        if mtime == self.folder_mtime: return False
+        present = {}
+        with os.scandir(self.folder) as entries:
+            for entry in entries:
+                if not entry.name.lower().endswith(".jpg"): continue
+                try:
+                    if entry.is_file():
+                        st = entry.stat()
+                        present[entry.name] = (st.st_size, st.st_mtime_ns)
+                except OSError:
+                    pass
+        with self._lock:
+            for name in set(self.files) - set(present): del self.files[name]
+            for name, (size, file_mtime) in present.items():
+                entry = self.files.get(name)
+                if entry and entry.get("size") == size and entry.get("mtime") == file_mtime: continue
+                try:
+                    self.files[name] = self._scan_file(name, size, file_mtime)
+                except Exception:
+                    self.files.pop(name, None)  # okunamayan dosya indekslenmez
+            self.folder_mtime = mtime
+            self.dirty = True
+            self._rebuild_maps()
+        return True
+
+    def _scan_file(self, name, size, mtime):
+        path = os.path.join(self.folder, name)
+        from PIL import Image
+        with Image.open(path) as img:
+            dims = list(img.size)
+        try:
+            with Image.open(os.path.join(self.folder, "thumbnails", name)) as thumb:
+                value = dhash(thumb)
+        except Exception:
+            with Image.open(path) as img:
+                value = dhash(_thumbnail_like(img))
+        return {"size": size, "mtime": mtime, "dims": dims, "bytes": file_digest(path), "dhash": value}
+
+    def find_bytes(self, digest):
+        return self._by_bytes.get(digest) if digest else None
+
+    def find_pixels(self, digest):
+        return self._by_pixels.get(digest) if digest else None
+
+    def find_similar(self, value, img, dims=None):
+        """dHash'i value'ya en fazla DHASH_MAX_DISTANCE bit uzak ve aynı boyuttaki (dims; verilmezse
+        img.size) dosyaları en yakından başlayarak küçük ölçekli piksel karşılaştırmasıyla doğrular; ilk
+        eşleşenin adını döndürür.
+        img tercihen thumbnail ölçeğindedir (adaylar da thumbnail'leriyle karşılaştırılır)."""
+        dims = list(dims or img.size)
+        found = set()
+        for key in _dhash_bands(value): found.update(self._by_dhash.get(key, ()))
+        candidates = []
+        for name in found:
+            entry = self.files.get(name)
+            if not entry or entry.get("dims") != dims: continue
+            distance = bin(entry["dhash"] ^ value).count("1")
+            if distance <= DHASH_MAX_DISTANCE: candidates.append((distance, name))
+        if not candidates: return None
+        wanted = _signature(img)
+        for _, name in sorted(candidates):
+            theirs = self._candidate_signature(name)
+            if theirs is None: continue
+            diffs = [abs(a - b) for a, b in zip(wanted, theirs)]
+            if max(diffs) <= VERIFY_MAX_CELL_DIFF and sum(diffs) / float(len(diffs)) <= VERIFY_MAX_MEAN_DIFF:
+                return name
+        return None
+
+    def _candidate_signature(self, name):
+        # Önce Steam'in thumbnail'i okunur (ucuz ve img ile aynı ölçekte); yoksa tam dosyadan türetilir.
+        from PIL import Image
+        try:
+            with Image.open(os.path.join(self.folder, "thumbnails", name)) as thumb:
+                return _signature(thumb.convert("RGB"))
+        except Exception:
+            pass
+        try:
+            with Image.open(os.path.join(self.folder, name)) as other:
+                return _signature(_thumbnail_like(other))
+        except Exception:
+            return None
+
+    def add(self, name, hashes, dims):
+        """İçe aktarılan bir dosyayı (process_image sonucundaki "hashes" ile) indekse ekler."""
+        path = os.path.join(self.folder, name)
+        try:
+            st = os.stat(path)
+        except OSError:
+            return
+        entry = {"size": st.st_size, "mtime": st.st_mtime_ns, "dims": list(dims),
+                 "bytes": hashes.get("output") or file_digest(path), "dhash": hashes.get("dhash"),
+                 "pixels": hashes.get("pixels"), "sources": [hashes["source"]] if hashes.get("source") else []}
+        with self._lock:
+            self.files[name] = entry
+            self._map_entry(name, entry)
+            self.dirty = True
+
+    def add_source(self, name, digest):
+        """Tekrar olarak eşleşen bir kaynağın bayt özetini mevcut kayda ekler."""
+        if not digest: return
+        with self._lock:
+            entry = self.files.get(name)
+            if entry is None or digest in entry.get("sources", ()): return
+            entry.setdefault("sources", []).append(digest)
+            self._by_bytes[digest] = name
+            self.dirty = True
+
+    def save(self):
+        """Değiştiyse yazar. İndeks yeniden kurulabilir bir önbellek olduğundan dosya yerinde
+        yazılır: geçici dosya + yeniden adlandırma klasörün mtime'ını değiştirir ve her açılışta
+        gereksiz bir tarama tetiklerdi. Yarım kalmış bir dosya okunamaz ve baştan kurulur."""
+        if not self.dirty: return
+        with self._lock:
+            try:
+                if not os.path.exists(self.path): open(self.path, "a").close()
+                # Kendi eklediğimiz dosyalar zaten indekste; klasörde yabancı dosya yoksa damga güncellenir.
+                known = all(name in self.files for name in os.listdir(self.folder)
+                            if name.lower().endswith(".jpg"))
+                if known: self.folder_mtime = os.stat(self.folder).st_mtime_ns
+                with open(self.path, "w", encoding="utf-8") as f:
+                    json.dump({"version": INDEX_VERSION, "folder_mtime": self.folder_mtime, "files": self.files}, f)
+                self.dirty = False
+            except OSError as e:
+                print(f"Hata: Tekrar indeksi '{self.path}' kaydedilemedi: {e}")
+
+
+_open_indexes = {}
+_open_lock = threading.Lock()
+
+
+def open_index(folder, refresh=True):
+    """Süreç başına önbelleğe alınmış indeks; diskteki indeks dosyası değiştiyse yeniden yüklenir.
+    Havuz işçileri refresh=False ile ebeveynin kaydettiği indeksi salt okunur kullanır."""
+    path = os.path.join(folder, INDEX_FILE)
+    try:
+        stamp = os.stat(path).st_mtime_ns
+    except OSError:
+        stamp = None
+    key = os.path.normcase(os.path.abspath(folder))
+    with _open_lock:
+        cached = _open_indexes.get(key)
+        if cached is None or cached[0] != stamp or cached[1].dirty:
+            cached = _open_indexes[key] = (stamp, DedupIndex(folder))
+    index = cached[1]
+    if refresh and index.refresh(): index.save()
+    return index
@@ -0,0 +1,187 @@
+""" Tahribatsız düzenleme modeli (döndürme, kırpma).
+
+İşlemler bir liste olarak tutulur; önizleme düşük çözünürlüklü bir proxy üzerinden çizilir ve
+yükleme sırasında tüm işlemler tek bir dönüşüme (kaynak koordinatlarında kırpma kutusu + 0/90/180/270
+derece döndürme) birleştirilip tam çözünürlüklü görüntüye bir kez uygulanır.
+PreviewPyramid proxy'nin art arda 2x küçültülmüş kopyalarını arka planda bir kez üretir; önizlemeler
+en yakın seviyeden çizilir, böylece önizleme süresi kaynak çözünürlüğünden bağımsız kalır.
+"""
+import threading
+
+# PIL rotate(90, expand=True) gibi saat yönünün tersine derece -> Image.Transpose adı
+_TRANSPOSE_NAMES = {90: "ROTATE_90", 180: "ROTATE_180", 270: "ROTATE_270"}
+
+
+def _view_to_box_fraction(u, v, rotation):
+    """Döndürülmüş görünümdeki (u, v) kesirli noktayı döndürülmemiş kırpma kutusundaki kesre çevirir."""
+    if rotation == 90: return 1.0 - v, u
+    if rotation == 180: return 1.0 - u, 1.0 - v
+    if rotation == 270: return v, 1.0 - u
+    return u, v
+
+
+def _apply_op(state, op):
+    (x1, y1, x2, y2), rotation = state
+    kind, value = op
+    if kind == "rotate":
+        return (x1, y1, x2, y2), (rotation + value) % 360
+    # crop: value görünümün kesirleri cinsinden (fx1, fy1, fx2, fy2)
+    fx1, fy1, fx2, fy2 = value
+    s1, t1 = _view_to_box_fraction(fx1, fy1, rotation)
+    s2, t2 = _view_to_box_fraction(fx2, fy2, rotation)
+    bw, bh = x2 - x1, y2 - y1
+    return (x1 + min(s1, s2) * bw, y1 + min(t1, t2) * bh,
+            x1 + max(s1, s2) * bw, y1 + max(t1, t2) * bh), rotation
+
+
+class EditStack:
+    """Düzenleme işlemleri listesi; sınırlı geri al/yinele geçmişiyle.
+
+    Geçmiş max_history'yi aşınca en eski işlemler temel dönüşüme katlanır, böylece bellek
+    sabit kalır ve birleşik dönüşüm değişmez.
+    """
+
+    def __init__(self, source_size, max_history=100):
+        self.source_size = tuple(source_size)
+        self.max_history = max_history
+        self._base = ((0.0, 0.0, float(source_size[0]), float(source_size[1])), 0)
+        self._ops = []
+        self._redo = []
+
+    def _push(self, op):
+        self._ops.append(op)
+        self._redo.clear()
+        while len(self._ops) > self.max_history:
+            self._base = _apply_op(self._base, self._ops.pop(0))
+
+    def rotate(self, degrees):
+        """degrees: 90 sola (saat yönünün tersi), -90 sağa."""
+        if degrees % 90: raise ValueError("Yalnızca 90 derecenin katları desteklenir.")
+        if degrees % 360: self._push(("rotate", degrees % 360))
+
+    def crop(self, fraction_box):
+        """Geçerli görünüme göre (0..1) kesirli (x1, y1, x2, y2) kutusuyla kırpar."""
+        fx1, fy1, fx2, fy2 = (min(1.0, max(0.0, float(v))) for v in fraction_box)
+        if abs(fx2 - fx1) <= 0 or abs(fy2 - fy1) <= 0: return
+        self._push(("crop", (fx1, fy1, fx2, fy2)))
+
+    def undo(self):
+        if not self._ops: return False
+        self._redo.append(self._ops.pop())
+        return True
+
+    def redo(self):
+        if not self._redo: return False
+        self._ops.append(self._redo.pop())
+        return True
+
+    def reset(self):
+        """Tüm düzenlemeleri sıfırlar (geri alınabilir değildir)."""
+        self.__init__(self.source_size, self.max_history)
+
+    @property
+    def can_undo(self):
+        return bool(self._ops)
+
+    @property
+    def can_redo(self):
+        return bool(self._redo)
+
+    @property
+    def operations(self):
+        return list(self._ops)
+
+    def compose(self):
+        """Birleşik dönüşüm: (kaynak piksel koordinatlarında kırpma kutusu, saat yönü tersine derece)."""
+        state = self._base
+        for op in self._ops: state = _apply_op(state, op)
+        return state
+
+    def is_identity(self):
+        box, rotation = self.compose()
+        return rotation == 0 and box == (0.0, 0.0, float(self.source_size[0]), float(self.source_size[1]))
+
+    def output_size(self):
+        (x1, y1, x2, y2), rotation = self.compose()
+        w, h = max(1, round(x2 - x1)), max(1, round(y2 - y1))
+        return (h, w) if rotation in (90, 270) else (w, h)
+
+    def render(self, image):
+        """Dönüşümü görüntüye tek seferde uygular. image kaynağın kendisi veya ölçeklenmiş bir
+        proxy'si olabilir; kırpma kutusu görüntünün boyutuna göre ölçeklenir."""
+        from PIL import Image
+
+        (x1, y1, x2, y2), rotation = self.compose()
+        sx = image.size[0] / float(self.source_size[0])
+        sy = image.size[1] / float(self.source_size[1])
+        box = (int(round(x1 * sx)), int(round(y1 * sy)), int(round(x2 * sx)), int(round(y2 * sy)))
+        box = (box[0], box[1], max(box[0] + 1, box[2]), max(box[1] + 1, box[3]))
+        if box != (0, 0) + tuple(image.size): image = image.crop(box)
+        if rotation: image = image.transpose(getattr(Image.Transpose, _TRANSPOSE_NAMES[rotation]))
+        return image
+
+
+def load_proxy(path, max_side=2048):
+    """Önizleme için düşük çözünürlüklü kopya ve kaynağın tam boyutunu döndürür.
+
+    JPEG'lerde draft() ile doğrudan küçültülmüş ölçekte çözülür; tam çözünürlüklü görüntü bellekte tutulmaz.
+    """
+    from PIL import Image
+
+    with Image.open(path) as img:
+        source_size = img.size
+        img.draft("RGB", (max_side, max_side))
+        proxy = img.convert("RGBA" if "A" in img.getbands() else "RGB")
+    proxy.thumbnail((max_side, max_side))
+    return proxy, source_size
+
+
+class PreviewPyramid:
+    """Bir resmin önizleme piramidi: levels[0] proxy, sonrakiler reduce(2) ile yarıya küçültülmüş.
+
+    Yapım arka plan iş parçacığında yapılır; ready True olana kadar levels boştur. Hata olursa error dolar.
+    """
+    MIN_SIDE = 256
+
+    def __init__(self, path, max_side=2048):
+        self.path = path
+        self.source_size = None
+        self.levels = []
+        self.error = None
+        self._ready = threading.Event()
+        threading.Thread(target=self._build, args=(max_side,), daemon=True).start()
+
+    def _build(self, max_side):
+        try:
+            proxy, source_size = load_proxy(self.path, max_side)
+            levels = [proxy]
+            while min(levels[-1].size) >= 2 * self.MIN_SIDE:
+                levels.append(levels[-1].reduce(2))
+            self.source_size, self.levels = source_size, levels
+        except Exception as e:
+            self.error = e
+        finally:
+            self._ready.set()
+
+    @property
+    def ready(self):
+        return self._ready.is_set()
+
+    def wait(self, timeout=None):
+        return self._ready.wait(timeout)
+
+    def level_for(self, scale):
+        """Kaynak genişliğine oranı en az scale olan en küçük seviye (yoksa en büyüğü)."""
+        for level in reversed(self.levels):
+            if level.size[0] >= scale * self.source_size[0]: return level
+        return self.levels[0]
+
+    def render(self, edits, box_size):
+        """Düzenlenmiş önizlemeyi box_size (w, h) içine sığacak şekilde en yakın seviyeden çizer."""
+        out_w, out_h = edits.output_size()
+        scale = min(1.0, box_size[0] / float(out_w), box_size[1] / float(out_h))
+        image = edits.render(self.level_for(scale))
+        # Düzenleme yoksa render() seviyenin kendisini döndürür; thumbnail() yerinde çalıştığından kopyalanır.
+        if any(image is level for level in self.levels): image = image.copy()
+        image.thumbnail(box_size)
+        return image
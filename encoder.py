@@ -0,0 +1,177 @@
+""" Screenshot JPEG kodlayıcı profilleri ve boyut hedefli kalite araması.
+
+Profiller (PROFILES):
+    fast      q90, Huffman optimizasyonu yok; en az CPU
+    balanced  q95 + optimize (önceki sabit q95 çıktısıyla aynı pikseller, daha küçük dosya); varsayılan
+    smallest  SSIM tabanına (min_ssim) uyan en düşük kalite aranır + optimize; en küçük dosya
+
+max_bytes verilirse bu sınıra sığan en yüksek kalite ikili aramayla bulunur; kalite hiçbir zaman
+SSIM tabanının altına düşürülmez (sığmıyorsa tabandaki kalite kullanılır, "budget_met": False).
+Steam baseline JPEG beklediğinden progressive kodlama kullanılmaz; 4:2:0 renk örneklemesi sabittir.
+smallest, uyumlu JPEG'leri de (passthrough yerine) yeniden kodlar.
+
+SSIM saf Python ile, resme yayılmış SSIM_TILES x SSIM_TILES tam çözünürlüklü gri ton (luma) karo üzerinde
+8x8 pencerelerle hesaplanır (küçültülmüş kopyada JPEG blok bozulmaları kaybolur). Pencereler JPEG blok
+ızgarasına 4 piksel kaydırılarak blok sınırlarını da kapsar. Referans karolar bir kez çıkarılır,
+denemeler yalnızca luma olarak çözülür ve her kalitenin kodlanmış baytları önbellekte tutulur; arama
+aynı kaliteyi iki kez kodlamaz, SSIM de yalnızca gerektiğinde hesaplanır. Denemeler Huffman
+optimizasyonu olmadan kodlanır (2-3 kat hızlı; optimize kayıpsızdır, yani SSIM değişmez ve boyut
+yalnızca küçülür, bütçe denetimi güvenli tarafta kalır); seçilen kalite profile göre bir kez daha
+kodlanır.
+"""
+import io
+import time
+
+PROFILES = {
+    "fast": {"quality": 90, "optimize": False, "thumbnail_quality": 85, "passthrough": True},
+    "balanced": {"quality": 95, "optimize": True, "thumbnail_quality": 90, "passthrough": True},
+    "smallest": {"quality": 95, "optimize": True, "thumbnail_quality": 85, "passthrough": False, "search": True},
+}
+DEFAULT_PROFILE = "balanced"
+MIN_QUALITY = 70
+DEFAULT_MIN_SSIM = 0.98
+SSIM_TILES = 3  # ızgara kenarı; 3x3 = 9 karo
+SSIM_TILE_SIDE = 64
+_BLOCK = 8
+_C1 = (0.01 * 255) ** 2
+_C2 = (0.03 * 255) ** 2
+
+
+def get_profile(name):
+    """Profil adını doğrular; bilinmeyen ad için ValueError."""
+    profile = PROFILES.get(name or DEFAULT_PROFILE)
+    if profile is None: raise ValueError(f"Bilinmeyen kodlayıcı profili: {name} ({', '.join(PROFILES)})")
+    return profile
+
+
+def encode(img, quality, optimize=False):
+    """RGB görüntüyü baseline JPEG olarak bellekte kodlar (4:2:0)."""
+    buffer = io.BytesIO()
+    img.save(buffer, "JPEG", quality=quality, optimize=optimize, subsampling=2)
+    return buffer.getbuffer()
+
+
+def _tile_boxes(size):
+    side = SSIM_TILE_SIDE
+    width, height = size
+    if width < side + 4 or height < side + 4: return [(0, 0, width - width % _BLOCK, height - height % _BLOCK)]
+    xs = [4 + (width - side - 4) * i // (SSIM_TILES - 1) // _BLOCK * _BLOCK for i in range(SSIM_TILES)]
+    ys = [4 + (height - side - 4) * i // (SSIM_TILES - 1) // _BLOCK * _BLOCK for i in range(SSIM_TILES)]
+    return sorted({(x, y, x + side, y + side) for x in xs for y in ys})
+
+
+def luma_tiles(img, boxes):
+    """Verilen karoların gri ton baytları, alt alta (genişlik: karo genişliği)."""
+    gray = img if img.mode == "L" else img.convert("L")
+    return b"".join(gray.crop(box).tobytes() for box in boxes)
+
+
+def ssim(a, b, width):
+    """İki eşit boyutlu gri ton bayt dizisi arasında ortalama SSIM (örtüşmeyen 8x8 bloklar)."""
+    height = len(a) // width
+    n = float(_BLOCK * _BLOCK)
+    total, blocks = 0.0, 0
+    for y in range(0, height - _BLOCK + 1, _BLOCK):
+        for x in range(0, width - _BLOCK + 1, _BLOCK):
+            xs, ys = [], []
+            for row in range(y * width + x, (y + _BLOCK) * width + x, width):
+                xs += a[row:row + _BLOCK]
+                ys += b[row:row + _BLOCK]
+            sx, sy = sum(xs), sum(ys)
+            mx, my = sx / n, sy / n
+            vx = sum(v * v for v in xs) / n - mx * mx
+            vy = sum(v * v for v in ys) / n - my * my
+            cov = sum(p * q for p, q in zip(xs, ys)) / n - mx * my
+            total += ((2 * mx * my + _C1) * (2 * cov + _C2)) / ((mx * mx + my * my + _C1) * (vx + vy + _C2))
+            blocks += 1
+    return total / blocks if blocks else 1.0
+
+
+class QualitySearch:
+    """Tek bir görüntü için kalite denemeleri: kodlamalar ve SSIM değerleri kaliteye göre önbelleklenir."""
+
+    def __init__(self, img):
+        self.img = img
+        self.encoded, self.scores = {}, {}
+        self._boxes = _tile_boxes(img.size)
+        self._reference = None
+
+    def data(self, quality):
+        if quality not in self.encoded: self.encoded[quality] = encode(self.img, quality)
+        return self.encoded[quality]
+
+    def score(self, quality):
+        if quality not in self.scores:
+            from PIL import Image
+            if self._reference is None: self._reference = luma_tiles(self.img, self._boxes)
+            with Image.open(io.BytesIO(self.data(quality))) as trial:
+                trial.draft("L", trial.size)  # yalnızca luma çözülür
+                sample = luma_tiles(trial, self._boxes)
+            width = self._boxes[0][2] - self._boxes[0][0]
+            self.scores[quality] = ssim(self._reference, sample, width)
+        return self.scores[quality]
+
+    def lowest(self, low, high, accept):
+        """[low, high] aralığında accept(q) doğru olan en düşük kalite (accept kaliteyle monoton artar);
+        hiçbiri değilse None."""
+        if not accept(high): return None
+        while low < high:
+            mid = (low + high) // 2
+            if accept(mid): high = mid
+            else: low = mid + 1
+        return high
+
+    def highest(self, low, high, accept):
+        """[low, high] aralığında accept(q) doğru olan en yüksek kalite (accept kaliteyle monoton azalır)."""
+        if not accept(low): return None
+        while low < high:
+            mid = (low + high + 1) // 2
+            if accept(mid): low = mid
+            else: high = mid - 1
+        return low
+
+
+def encode_screenshot(img, profile=None, max_bytes=None, min_ssim=None):
+    """Profil ve isteğe bağlı bayt bütçesine göre kodlar; (baytlar, bilgi) döndürür.
+
+    bilgi: {"profile", "quality", "bytes", "seconds", "trials"}; SSIM ölçüldüyse "ssim", max_bytes
+    verildiyse "budget_met".
+    """
+    name = profile or DEFAULT_PROFILE
+    settings = get_profile(name)
+    started = time.perf_counter()
+    info = {"profile": name}
+    if not settings.get("search") and not max_bytes:
+        quality = settings["quality"]
+        data = encode(img, quality, settings["optimize"])
+        trials = 1
+    else:
+        floor = DEFAULT_MIN_SSIM if min_ssim is None else min_ssim
+        search = QualitySearch(img)
+        high = settings["quality"]
+        meets_floor = lambda q: search.score(q) >= floor
+        if settings.get("search"):
+            # SSIM tabanını koruyan en düşük kalite; bütçe varsa o ile bütçeye sığan en yüksek kalitenin
+            # küçüğü (hiçbiri sığmıyorsa en düşük kalite).
+            quality = search.lowest(MIN_QUALITY, high, meets_floor) or high
+            if max_bytes and len(search.data(quality)) > max_bytes:
+                quality = search.highest(MIN_QUALITY, quality - 1,
+                                         lambda q: len(search.data(q)) <= max_bytes) or MIN_QUALITY
+        elif len(search.data(high)) <= max_bytes:
+            quality = high
+        else:
+            # Bütçeye sığan en yüksek kalite; SSIM tabanının altındaysa tabandaki kaliteye çıkılır.
+            fits = search.highest(MIN_QUALITY, high - 1, lambda q: len(search.data(q)) <= max_bytes)
+            if fits is not None and meets_floor(fits): quality = fits
+            else: quality = search.lowest(fits + 1 if fits else MIN_QUALITY, high, meets_floor) or high
+        data = encode(img, quality, True) if settings["optimize"] else search.data(quality)
+        if max_bytes: info["budget_met"] = len(data) <= max_bytes
+        if quality in search.scores: info["ssim"] = round(search.scores[quality], 4)
+        trials = len(search.encoded) + settings["optimize"]
+    info.update(quality=quality, bytes=len(data), seconds=round(time.perf_counter() - started, 4), trials=trials)
+    return data, info
+
+
+def encode_thumbnail(img, profile=None):
+    settings = get_profile(profile)
+    return encode(img, settings["thumbnail_quality"], settings["optimize"])
@@ -1,11 +1,20 @@
 import customtkinter as ctk
-from tkinter import filedialog, messagebox, Canvas
+from tkinter import filedialog, messagebox, Canvas, Listbox, Toplevel
 from PIL import Image, ImageTk
+import copy
 import os
+import queue
+import threading
 import ctypes  
-from logic import (process_image, scan_for_games, find_steam_profiles, 
-                   load_settings, save_settings, get_app_list_from_steam, resource_path)
-from languages import TRANSLATIONS
+import multiprocessing
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from logic import (process_images_batch, scan_for_games, find_steam_profiles, 
+                   load_settings, save_settings, get_app_list_from_steam, resource_path,
+                   load_preview_thumbnail, load_image, ImageTooLargeError)
+from languages import translate
+from editor import EditStack, PreviewPyramid
+from search import SearchIndex
 
 
 COLOR_BG = "#1b2838"       
@@ -16,11 +25,15 @@ COLOR_TEXT_MAIN = "#ffffff"
 COLOR_TEXT_SUB = "#c7d5e0"  
 COLOR_DANGER = "#c42d33"    
 COLOR_SUCCESS = "#2ea043"   
+PROXY_MAX_SIDE = 2048
+PYRAMID_POLL_MS = 30
+MAX_LISTED_FAILURES = 10
 
 class CropWindow(ctk.CTkToplevel):
-    def __init__(self, parent, pil_image):
+    def __init__(self, parent, render_preview):
         super().__init__(parent)
-        self.parent = parent; self.image = pil_image; self.crop_coords = None
+        # render_preview((w, h)) düzenlenmiş önizlemeyi piramidin en yakın seviyesinden çizer.
+        self.parent = parent; self.render_preview = render_preview; self.crop_fraction = None
         self.title(parent._("crop_window_title"))
         self.geometry("900x700")
         self.configure(fg_color=COLOR_BG)
@@ -59,9 +72,7 @@ class CropWindow(ctk.CTkToplevel):
         cw = self.canvas.winfo_width() if self.canvas.winfo_width() > 1 else 860
         ch = self.canvas.winfo_height() if self.canvas.winfo_height() > 1 else 550
         
-        img_copy = self.image.copy()
-        img_copy.thumbnail((cw, ch))
-        self.photo_image = ImageTk.PhotoImage(img_copy)
+        self.photo_image = ImageTk.PhotoImage(self.render_preview((cw, ch)))
        
         x_center = (cw - self.photo_image.width()) // 2
         y_center = (ch - self.photo_image.height()) // 2
@@ -94,22 +105,350 @@ class CropWindow(ctk.CTkToplevel):
         img_x2 = x2 - self.img_x
         img_y2 = y2 - self.img_y
 
-        original_w, original_h = self.image.size
+        # Görüntülenen resme göre kesirli kutu; EditStack bunu tam çözünürlükte uygular.
         displayed_w, displayed_h = self.photo_image.width(), self.photo_image.height()
-        ratio_w = original_w / displayed_w
-        ratio_h = original_h / displayed_h
-
-        final_x1 = int(img_x1 * ratio_w)
-        final_y1 = int(img_y1 * ratio_h)
-        final_x2 = int(img_x2 * ratio_w)
-        final_y2 = int(img_y2 * ratio_h)
-        
-        final_x1 = max(0, final_x1); final_y1 = max(0, final_y1)
-        final_x2 = min(original_w, final_x2); final_y2 = min(original_h, final_y2)
-
-        self.crop_coords = (final_x1, final_y1, final_x2, final_y2)
+        self.crop_fraction = (max(0.0, img_x1 / displayed_w), max(0.0, img_y1 / displayed_h),
+                              min(1.0, img_x2 / displayed_w), min(1.0, img_y2 / displayed_h))
         self.destroy()
 
+class ThumbnailGallery(ctk.CTkFrame):
+    """Çoklu seçim galerisi. Yalnızca görünen hücreler Canvas'a çizilir; küçük resimler iş parçacığı
+    havuzunda (JPEG draft ile) çözülür ve bayt bütçeli bir LRU önbellekte tutulur."""
+    CELL_W, CELL_H = 150, 130
+    THUMB_SIZE = (136, 100)
+    CACHE_BYTES = 48 * 1024 * 1024
+    POLL_MS = 30
+
+    def __init__(self, parent):
+        super().__init__(parent, fg_color="transparent")
+        self.canvas = Canvas(self, highlightthickness=0, bg="#101822", yscrollincrement=self.CELL_H // 2)
+        self.scrollbar = ctk.CTkScrollbar(self, command=self.on_scroll)
+        self.canvas.configure(yscrollcommand=self.scrollbar.set)
+        self.scrollbar.pack(side="right", fill="y")
+        self.canvas.pack(side="left", fill="both", expand=True)
+
+        self.paths, self.columns = [], 1
+        self.cells = {}                  # indeks -> [resim öğesi, yazı öğesi, PhotoImage]
+        self.cache, self.cache_bytes = OrderedDict(), 0
+        self.failed = set()
+        self.pending = {}                # yol -> Future
+        self.results = queue.Queue()
+        self.executor, self.polling, self.generation = None, False, 0
+
+        self.canvas.bind("<Configure>", self.on_resize)
+        for seq in ("<MouseWheel>", "<Button-4>", "<Button-5>"): self.canvas.bind(seq, self.on_wheel)
+
+    def set_paths(self, paths):
+        self.generation += 1
+        for future in self.pending.values(): future.cancel()
+        self.pending.clear()
+        self.canvas.delete("all"); self.cells.clear()
+        self.paths = list(paths)
+        self.update_scrollregion()
+        self.canvas.yview_moveto(0)
+        self.refresh()
+
+    def clear(self):
+        self.set_paths([])
+
+    def shutdown(self):
+        self.clear()
+        if self.executor: self.executor.shutdown(wait=False, cancel_futures=True)
+        self.executor = None
+
+    def update_scrollregion(self):
+        width = max(self.canvas.winfo_width(), self.CELL_W)
+        rows = -(-len(self.paths) // self.columns)
+        self.canvas.configure(scrollregion=(0, 0, width, rows * self.CELL_H))
+
+    def on_resize(self, event):
+        columns = max(1, event.width // self.CELL_W)
+        if columns != self.columns:
+            # Sütun sayısı değişince hücre konumları değişir; görünenler yeniden çizilir.
+            self.columns = columns
+            self.canvas.delete("all"); self.cells.clear()
+        self.update_scrollregion()
+        self.refresh()
+
+    def on_scroll(self, *args):
+        self.canvas.yview(*args)
+        self.refresh()
+
+    def on_wheel(self, event):
+        if event.num == 4: step = -1
+        elif event.num == 5: step = 1
+        else: step = -1 if event.delta > 0 else 1
+        self.canvas.yview_scroll(step, "units")
+        self.refresh()
+
+    def visible_range(self):
+        top = self.canvas.canvasy(0)
+        bottom = top + max(self.canvas.winfo_height(), self.CELL_H)
+        # Kaydırma sırasında boş hücre görünmemesi için bir satır fazlası hazırlanır.
+        first = max(0, int(top // self.CELL_H) - 1) * self.columns
+        last = (int(bottom // self.CELL_H) + 2) * self.columns
+        return first, min(len(self.paths), last)
+
+    def refresh(self):
+        first, last = self.visible_range()
+        for index in [i for i in self.cells if not first <= i < last]:
+            image_item, text_item, _ = self.cells.pop(index)
+            self.canvas.delete(image_item, text_item)
+        wanted = set(self.paths[first:last])
+        for path in [p for p, f in self.pending.items() if p not in wanted and f.cancel()]:
+            del self.pending[path]
+
+        for index in range(first, last):
+            if index in self.cells: continue
+            path = self.paths[index]
+            row, col = divmod(index, self.columns)
+            x, y = col * self.CELL_W + self.CELL_W // 2, row * self.CELL_H
+            image_item = self.canvas.create_image(x, y + 6 + self.THUMB_SIZE[1] // 2, anchor="center")
+            name = os.path.basename(path)
+            if len(name) > 22: name = name[:10] + "…" + name[-10:]
+            text_item = self.canvas.create_text(x, y + self.THUMB_SIZE[1] + 16, text=name,
+                                                fill=COLOR_TEXT_SUB, font=("Segoe UI", 9))
+            self.cells[index] = [image_item, text_item, None]
+            thumb = self.cache.get(path)
+            if thumb is not None:
+                self.cache.move_to_end(path)
+                self.show(index, thumb)
+            elif path not in self.failed:
+                self.request(path)
+
+    def request(self, path):
+        if path in self.pending: return
+        if self.executor is None:
+            self.executor = ThreadPoolExecutor(max_workers=min(4, os.cpu_count() or 1),
+                                               thread_name_prefix="thumbnail")
+        future = self.executor.submit(load_preview_thumbnail, path, self.THUMB_SIZE)
+        generation = self.generation
+        # Tk iş parçacığı güvenli olmadığından sonuçlar kuyruğa konur ve after() ile ana döngüde alınır.
+        future.add_done_callback(lambda f: self.results.put((generation, path, f)))
+        self.pending[path] = future
+        if not self.polling:
+            self.polling = True
+            self.after(self.POLL_MS, self.poll_results)
+
+    def poll_results(self):
+        while True:
+            try:
+                generation, path, future = self.results.get_nowait()
+            except queue.Empty:
+                break
+            if generation != self.generation or future.cancelled(): continue
+            if self.pending.get(path) is future: del self.pending[path]
+            thumb = future.result()
+            if thumb is None:
+                self.failed.add(path)
+                continue
+            self.cache_put(path, thumb)
+            for index, cell in self.cells.items():
+                if self.paths[index] == path: self.show(index, thumb)
+        if self.pending: self.after(self.POLL_MS, self.poll_results)
+        else: self.polling = False
+
+    def cache_put(self, path, thumb):
+        old = self.cache.pop(path, None)
+        if old is not None: self.cache_bytes -= old.width * old.height * 3
+        self.cache[path] = thumb
+        self.cache_bytes += thumb.width * thumb.height * 3
+        while self.cache_bytes > self.CACHE_BYTES and len(self.cache) > 1:
+            _, old = self.cache.popitem(last=False)
+            self.cache_bytes -= old.width * old.height * 3
+
+    def show(self, index, thumb):
+        cell = self.cells[index]
+        cell[2] = ImageTk.PhotoImage(thumb)
+        self.canvas.itemconfigure(cell[0], image=cell[2])
+
+class GameSelector(ctk.CTkFrame):
+    """game_combobox yerine yazarken süzülen oyun seçici; CTkComboBox'ın set/get/configure arayüzünü korur.
+
+    Öneriler SearchIndex ile (isim, kelime öneki, app ID öneki, bulanık) bulunur ve bir tk Listbox'ta
+    gösterilir. Listbox yalnızca görünen satırları çizer; oyun başına widget oluşturulmaz.
+    configure(values=...) isim listesi veya (isim, app_id) çiftleri kabul eder.
+    """
+    MAX_RESULTS = 200
+    VISIBLE_ROWS = 10
+    NAVIGATION_KEYS = {"Up", "Down", "Return", "KP_Enter", "Escape", "Tab", "Shift_L", "Shift_R",
+                       "Control_L", "Control_R", "Alt_L", "Alt_R"}
+
+    def __init__(self, parent, command=None, state="normal", height=35, fg_color=COLOR_BG, border_color=COLOR_BG):
+        super().__init__(parent, fg_color="transparent")
+        self.command = command
+        self.index, self.results = SearchIndex(), []
+        self.popup, self.listbox = None, None
+        self.var = ctk.StringVar()
+        self.entry = ctk.CTkEntry(self, textvariable=self.var, height=height, fg_color=fg_color,
+                                  border_color=border_color, state=state)
+        self.entry.pack(fill="x")
+        self.entry.bind("<KeyRelease>", self.on_key)
+        self.entry.bind("<Down>", lambda e: self.move(1))
+        self.entry.bind("<Up>", lambda e: self.move(-1))
+        self.entry.bind("<Return>", lambda e: self.choose())
+        self.entry.bind("<Escape>", lambda e: self.hide())
+        self.entry.bind("<FocusIn>", self.on_focus_in)
+        self.entry.bind("<FocusOut>", lambda e: self.after(150, self.hide_if_unfocused))
+
+    def set(self, value):
+        self.var.set(value)
+
+    def get(self):
+        return self.var.get()
+
+    def configure(self, require_redraw=False, **kwargs):
+        values, state = kwargs.pop("values", None), kwargs.pop("state", None)
+        if values is not None:
+            self.index = SearchIndex(v if isinstance(v, tuple) else (v, None) for v in values)
+        if state is not None:
+            self.entry.configure(state=state)
+            if state == "disabled": self.hide()
+        if kwargs or require_redraw: super().configure(require_redraw=require_redraw, **kwargs)
+
+    def on_focus_in(self, event=None):
+        if self.entry.cget("state") == "disabled" or not len(self.index): return
+        # Yer tutucu metin yazmaya başlayınca silinsin diye tümü seçilir.
+        self.entry.select_range(0, "end")
+        self.update_results("")
+
+    def on_key(self, event):
+        if event.keysym in self.NAVIGATION_KEYS: return
+        self.update_results(self.var.get())
+
+    def update_results(self, query):
+        self.results = self.index.search(query, self.MAX_RESULTS)
+        if not self.results:
+            self.hide()
+            return
+        self.show(min(self.VISIBLE_ROWS, len(self.results)))
+        self.listbox.delete(0, "end")
+        self.listbox.insert("end", *(f"{name}   ·   {app_id}" if app_id else name for name, app_id in self.results))
+        self.listbox.selection_set(0)
+        self.listbox.see(0)
+
+    def show(self, rows):
+        if self.popup is None:
+            self.popup = Toplevel(self)
+            self.popup.overrideredirect(True)
+            self.popup.configure(bg=COLOR_PANEL)
+            self.listbox = Listbox(self.popup, activestyle="none", exportselection=False, borderwidth=0,
+                                   highlightthickness=0, bg=COLOR_BG, fg=COLOR_TEXT_MAIN, font=("Segoe UI", 10),
+                                   selectbackground=COLOR_ACCENT, selectforeground=COLOR_BG)
+            scrollbar = ctk.CTkScrollbar(self.popup, command=self.listbox.yview)
+            self.listbox.configure(yscrollcommand=scrollbar.set)
+            scrollbar.pack(side="right", fill="y")
+            self.listbox.pack(side="left", fill="both", expand=True)
+            self.listbox.bind("<ButtonRelease-1>", lambda e: self.choose())
+        x, y = self.entry.winfo_rootx(), self.entry.winfo_rooty() + self.entry.winfo_height()
+        self.popup.geometry(f"{self.entry.winfo_width()}x{rows * 22}+{x}+{y}")
+        self.popup.deiconify()
+        self.popup.lift()
+
+    def hide(self):
+        if self.popup is not None: self.popup.withdraw()
+
+    def hide_if_unfocused(self):
+        try:
+            focused = self.focus_get()
+        except KeyError:
+            focused = None
+        if focused is not self.listbox: self.hide()
+
+    def move(self, delta):
+        if self.popup is None or not self.popup.winfo_viewable():
+            self.update_results(self.var.get())
+            return
+        selection = self.listbox.curselection()
+        i = min(max((selection[0] if selection else -1) + delta, 0), len(self.results) - 1)
+        self.listbox.selection_clear(0, "end")
+        self.listbox.selection_set(i)
+        self.listbox.see(i)
+
+    def choose(self):
+        if not self.results or self.listbox is None: return
+        selection = self.listbox.curselection()
+        name = self.results[selection[0] if selection else 0][0]
+        self.var.set(name)
+        self.hide()
+        self.entry.icursor("end")
+        if self.command: self.command(name)
+
+class TaskRunner:
+    """Uzun işleri (yükleme, tarama, liste indirme) arka plan iş parçacığında çalıştırır.
+
+    work(cancel_event, report) Tk'ye dokunmaz; report(value) ile bildirilen ilerleme kuyruğa konur.
+    Ana döngü kuyruğu sabit aralıkla (REPAINT_MS) boşaltır ve her görev için yalnızca son ilerlemeyi
+    çizer; on_done/on_error geri çağrıları da ana döngüde çalışır.
+    """
+    REPAINT_MS = 50
+
+    def __init__(self, root):
+        self.root = root
+        self.tasks = {}
+        self.events = queue.Queue()
+        self.polling = False
+
+    def start(self, name, work, on_progress=None, on_done=None, on_error=None, on_cancel=None):
+        """İptal edilen görev bittiğinde on_cancel (yoksa on_done) çağrılır. Aynı adla görev çalışıyorsa False."""
+        if name in self.tasks: return False
+        cancel_event = threading.Event()
+
+        def target():
+            try:
+                result = work(cancel_event, lambda value: self.events.put((name, "progress", value)))
+            except Exception as e:
+                self.events.put((name, "error", e))
+            else:
+                self.events.put((name, "done", result))
+
+        thread = threading.Thread(target=target, name=f"task-{name}", daemon=True)
+        self.tasks[name] = {"thread": thread, "cancel": cancel_event, "on_progress": on_progress,
+                            "on_done": on_done, "on_error": on_error, "on_cancel": on_cancel}
+        thread.start()
+        if not self.polling:
+            self.polling = True
+            self.root.after(self.REPAINT_MS, self.poll)
+        return True
+
+    def is_running(self, name):
+        return name in self.tasks
+
+    def cancel(self, name):
+        task = self.tasks.get(name)
+        if task: task["cancel"].set()
+
+    def poll(self):
+        latest, finished = {}, []
+        while True:
+            try:
+                name, kind, value = self.events.get_nowait()
+            except queue.Empty:
+                break
+            if kind == "progress": latest[name] = value
+            else: finished.append((name, kind, value))
+        for name, value in latest.items():
+            task = self.tasks.get(name)
+            if task and task["on_progress"]: task["on_progress"](value)
+        for name, kind, value in finished:
+            task = self.tasks.pop(name, None)
+            if not task: continue
+            if kind == "error": callback = task["on_error"]
+            elif task["cancel"].is_set() and task["on_cancel"]: callback = task["on_cancel"]
+            else: callback = task["on_done"]
+            if callback: callback(value)
+        if self.tasks: self.root.after(self.REPAINT_MS, self.poll)
+        else: self.polling = False
+
+    def shutdown(self, timeout=5.0):
+        """Tüm görevleri iptal eder ve toplamda en fazla timeout saniye bitmelerini bekler."""
+        import time
+        for task in self.tasks.values(): task["cancel"].set()
+        deadline = time.monotonic() + timeout
+        for task in self.tasks.values():
+            task["thread"].join(max(0.0, deadline - time.monotonic()))
+        self.tasks.clear()
+
 class App(ctk.CTk):
     def __init__(self):
         super().__init__()
@@ -134,8 +473,11 @@ class App(ctk.CTk):
         self.configure(fg_color=COLOR_BG)
         
      
-        self.original_pil_image, self.current_pil_image, self.image_paths_list = None, None, []
+        # Tek resim düzenleme: önizleme piramidi + işlem listesi (tam çözünürlük yalnızca yüklemede açılır).
+        self.pyramid, self.edits, self.image_paths_list = None, None, []
         self.profiles_data, self.games_data = {}, {}
+        self.tasks = TaskRunner(self)
+        self.protocol("WM_DELETE_WINDOW", self.on_close)
         
         
         self.grid_columnconfigure(0, weight=0, minsize=280)
@@ -183,10 +525,8 @@ class App(ctk.CTk):
                                          command=self.find_and_list_games)
         self.scan_button.pack(fill="x", pady=(5, 5))
         
-        self.game_combobox = ctk.CTkComboBox(self.step2_frame, height=35,
-                                             fg_color=COLOR_BG, border_color=COLOR_BG,
-                                             button_color=COLOR_ACCENT, button_hover_color=COLOR_ACCENT_HOVER,
-                                             state="disabled", command=self.on_game_select)
+        self.game_combobox = GameSelector(self.step2_frame, height=35, fg_color=COLOR_BG, border_color=COLOR_ACCENT,
+                                          state="disabled", command=self.on_game_select)
         self.game_combobox.pack(fill="x")
         
         self.update_list_button = ctk.CTkButton(self.step2_frame, text="Update Game List (DB)", height=20,
@@ -255,6 +595,7 @@ class App(ctk.CTk):
         self.preview_label = ctk.CTkLabel(self.preview_container, text="No Image Selected", 
                                           font=("Segoe UI", 16), text_color=COLOR_TEXT_SUB)
         self.preview_label.place(relx=0.5, rely=0.5, anchor="center")
+        self.gallery = ThumbnailGallery(self.preview_container)
         
 
         self.tools_frame = ctk.CTkFrame(self.preview_container, fg_color=COLOR_PANEL, corner_radius=20, height=50)
@@ -264,12 +605,18 @@ class App(ctk.CTk):
         self.rotate_left_button = ctk.CTkButton(self.tools_frame, text="↺", command=self.rotate_left, **btn_config)
         self.rotate_right_button = ctk.CTkButton(self.tools_frame, text="↻", command=self.rotate_right, **btn_config)
         self.crop_button = ctk.CTkButton(self.tools_frame, text="✂", command=self.open_crop_window, **btn_config)
+        self.undo_button = ctk.CTkButton(self.tools_frame, text="⟲", command=self.undo_edit, **btn_config)
+        self.redo_button = ctk.CTkButton(self.tools_frame, text="⟳", command=self.redo_edit, **btn_config)
         self.reset_button = ctk.CTkButton(self.tools_frame, text="✖", text_color=COLOR_DANGER, command=self.reset_image, **btn_config)
         
         self.rotate_left_button.pack(side="left", padx=5, pady=5)
         self.rotate_right_button.pack(side="left", padx=5, pady=5)
         self.crop_button.pack(side="left", padx=5, pady=5)
+        self.undo_button.pack(side="left", padx=5, pady=5)
+        self.redo_button.pack(side="left", padx=5, pady=5)
         self.reset_button.pack(side="left", padx=5, pady=5)
+        self.bind("<Control-z>", lambda e: self.undo_edit())
+        self.bind("<Control-y>", lambda e: self.redo_edit())
 
   
         self.action_area = ctk.CTkFrame(self.main_content, fg_color="transparent")
@@ -302,8 +649,7 @@ class App(ctk.CTk):
         self.load_profiles()
 
     def _(self, key, *args):
-        text = TRANSLATIONS[self.current_lang].get(key, key)
-        return text.format(*args) if args else text
+        return translate(self.current_lang, key, *args)
 
     def update_ui_language(self, lang_code):
         self.current_lang = lang_code
@@ -346,33 +692,53 @@ class App(ctk.CTk):
         self.scan_button.configure(state="normal")
 
     def find_and_list_games(self):
+        if self.tasks.is_running("scan"):
+            self.tasks.cancel("scan")
+            return
         selected_profile = self.profile_combobox.get()
         user_id = self.profiles_data.get(selected_profile)
         if not user_id: return
         
-        self.scan_button.configure(text=self._("scan_games_button_scanning"), state="disabled")
-        self.update_idletasks()
-        
-        result = scan_for_games(user_id)
+        self.scan_button.configure(text=self._("scan_games_button_scanning") + "  ✖")
+        # İptal edilen taramanın sonucu gösterilmez (tarama kendisi önbellek sayesinde kısadır).
+        self.tasks.start("scan", lambda cancel, report: scan_for_games(user_id),
+                         on_done=self.on_scan_done, on_cancel=self.reset_scan_button,
+                         on_error=lambda e: (self.reset_scan_button(), self.show_task_error(e)))
+
+    def reset_scan_button(self, *_):
         self.scan_button.configure(text=self._("scan_games_button"), state="normal")
-        
+
+    def on_scan_done(self, result):
+        self.reset_scan_button()
         if result["success"]:
             self.games_data = {game["name"]: game["path"] for game in result["data"]}
-            names = list(self.games_data.keys())
-            self.game_combobox.configure(values=names, state="normal")
+            self.game_combobox.configure(values=[(game["name"], game.get("app_id")) for game in result["data"]],
+                                         state="normal")
             self.game_combobox.set(self._("game_combobox_select"))
         else:
             self.show_message(result)
 
     def update_steam_app_list(self):
-        self.update_list_button.configure(text="Downloading...", state="disabled")
-        self.update_idletasks()
-        result = get_app_list_from_steam()
+        if self.tasks.is_running("app_list"):
+            self.tasks.cancel("app_list")
+            return
+        self.update_list_button.configure(text=self._("update_list_loading") + "  (" + self._("cancel_button") + ")")
+        self.tasks.start("app_list", lambda cancel, report: get_app_list_from_steam(cancel_event=cancel),
+                         on_done=self.on_app_list_done, on_cancel=self.reset_update_list_button,
+                         on_error=lambda e: (self.reset_update_list_button(), self.show_task_error(e)))
+
+    def reset_update_list_button(self, *_):
         self.update_list_button.configure(text="Update Game List (DB)", state="normal")
+
+    def on_app_list_done(self, result):
+        self.reset_update_list_button()
         if result: 
             messagebox.showinfo("Success", self._("update_list_success"))
             if self.games_data: self.find_and_list_games() 
 
+    def show_task_error(self, error):
+        messagebox.showerror("Error", str(error))
+
     def on_game_select(self, selected_game):
         path = self.games_data.get(selected_game)
         if path: 
@@ -392,58 +758,115 @@ class App(ctk.CTk):
         
         self.image_paths_list = list(paths)
         if len(paths) == 1:
+            self.show_gallery(False)
             self.image_path_var.set(os.path.basename(paths[0]))
-            try:
-                self.original_pil_image = Image.open(paths[0])
-                self.current_pil_image = self.original_pil_image.copy()
-                self.update_preview(self.current_pil_image)
-                self.show_edit_tools(True)
-            except Exception as e: messagebox.showerror("Error", str(e))
+            self.edits = None
+            self.pyramid = PreviewPyramid(paths[0], PROXY_MAX_SIDE)
+            self.preview_label.configure(image=None, text="Loading...")
+            self.show_edit_tools(False)
+            self.after(PYRAMID_POLL_MS, self.poll_pyramid, self.pyramid)
         else:
+            self.pyramid, self.edits = None, None
             self.image_path_var.set(f"{len(paths)} Files Selected")
             self.preview_label.configure(image=None, text=f"{len(paths)} Images Ready")
             self.show_edit_tools(False)
+            self.show_gallery(True, paths)
         
         self.check_ready_state()
 
-    def update_preview(self, pil_image):
+    def show_gallery(self, show=True, paths=()):
+        if show:
+            self.gallery.place(relx=0.5, rely=0.5, anchor="center", relwidth=0.97, relheight=0.95)
+            self.gallery.set_paths(paths)
+        else:
+            self.gallery.clear()
+            self.gallery.place_forget()
+
+    def poll_pyramid(self, pyramid):
+        if pyramid is not self.pyramid: return
+        if not pyramid.ready:
+            self.after(PYRAMID_POLL_MS, self.poll_pyramid, pyramid)
+            return
+        if pyramid.error:
+            self.pyramid = None
+            self.preview_label.configure(image=None, text="")
+            messagebox.showerror("Error", str(pyramid.error))
+            return
+        self.edits = EditStack(pyramid.source_size)
+        self.refresh_preview()
+        self.show_edit_tools(True)
+
+    def update_preview(self):
     
         w = self.preview_container.winfo_width()
         h = self.preview_container.winfo_height()
         if w < 100: w = 600 
         if h < 100: h = 400
         
-        img_copy = pil_image.copy()
-        img_copy.thumbnail((w-20, h-20)) 
+        img_copy = self.pyramid.render(self.edits, (w-20, h-20))
         ctk_img = ctk.CTkImage(light_image=img_copy, dark_image=img_copy, size=img_copy.size)
         self.preview_label.configure(image=ctk_img, text="")
 
+    def set_edit_tools_state(self, enabled):
+        # Yükleme sürerken düzenleme kapalıdır; bitince geri al/yinele durumu refresh_preview'dan gelir.
+        state = "normal" if enabled else "disabled"
+        for button in (self.rotate_left_button, self.rotate_right_button, self.crop_button,
+                       self.undo_button, self.redo_button, self.reset_button):
+            button.configure(state=state)
+        if enabled: self.refresh_preview()
+
+    def editable(self):
+        return bool(self.edits) and not self.tasks.is_running("upload")
+
     def show_edit_tools(self, show=True):
         if show: self.tools_frame.place(relx=0.5, rely=0.9, anchor="s")
         else: self.tools_frame.place_forget()
 
 
+    def refresh_preview(self):
+        if not self.edits: return
+        self.update_preview()
+        self.undo_button.configure(state="normal" if self.edits.can_undo else "disabled")
+        self.redo_button.configure(state="normal" if self.edits.can_redo else "disabled")
+
     def rotate_left(self):
-        if self.current_pil_image:
-            self.current_pil_image = self.current_pil_image.rotate(90, expand=True)
-            self.update_preview(self.current_pil_image)
+        if self.editable():
+            self.edits.rotate(90)
+            self.refresh_preview()
     def rotate_right(self):
-        if self.current_pil_image:
-            self.current_pil_image = self.current_pil_image.rotate(-90, expand=True)
-            self.update_preview(self.current_pil_image)
+        if self.editable():
+            self.edits.rotate(-90)
+            self.refresh_preview()
+    def undo_edit(self):
+        if self.editable() and self.edits.undo(): self.refresh_preview()
+    def redo_edit(self):
+        if self.editable() and self.edits.redo(): self.refresh_preview()
     def reset_image(self):
-        if self.original_pil_image:
-            self.current_pil_image = self.original_pil_image.copy()
-            self.update_preview(self.current_pil_image)
+        if self.editable():
+            self.edits.reset()
+            self.refresh_preview()
     def open_crop_window(self):
-        if not self.current_pil_image: return
-        cw = CropWindow(self, self.current_pil_image)
+        if not self.editable(): return
+        cw = CropWindow(self, lambda size: self.pyramid.render(self.edits, size))
         self.wait_window(cw)
-        if hasattr(cw, 'crop_coords') and cw.crop_coords:
-            self.current_pil_image = self.current_pil_image.crop(cw.crop_coords)
-            self.update_preview(self.current_pil_image)
+        if cw.crop_fraction:
+            self.edits.crop(cw.crop_fraction)
+            self.refresh_preview()
+
+    @staticmethod
+    def render_full_image(path, edits):
+        """Düzenlemeleri process_image'ın bellek sınırıyla çözülmüş görüntüye tek seferde uygular;
+        düzenleme yoksa yolu döndürür. Resim sınıra sığmıyorsa yol döndürülür ve hata (image_too_large)
+        yükleme sonucunda raporlanır."""
+        if not edits or edits.is_identity(): return path
+        try:
+            full = load_image(path)
+        except ImageTooLargeError:
+            return path
+        return edits.render(full)
 
     def check_ready_state(self):
+        if self.tasks.is_running("upload"): return
       
         has_images = bool(self.image_paths_list)
         has_folder = self.folder_path_var.get() and self._("no_folder_selected") not in self.folder_path_var.get()
@@ -454,32 +877,86 @@ class App(ctk.CTk):
             self.process_button.configure(state="disabled", fg_color=COLOR_PANEL)
 
     def run_process(self):
+        if self.tasks.is_running("upload"):
+            self.tasks.cancel("upload")
+            self.process_button.configure(state="disabled")
+            return
         folder = self.folder_path_var.get()
-        total = len(self.image_paths_list)
+        paths = list(self.image_paths_list)
+        total = len(paths)
+        # İşçi iş parçacığı canlı yığını değil, UI iş parçacığında alınmış bir kopyasını çizer.
+        edits = copy.deepcopy(self.edits)
         
-        self.process_button.configure(state="disabled", text="PROCESSING...")
+        self.process_button.configure(text=self._("cancel_button").upper(), fg_color=COLOR_DANGER)
+        self.set_edit_tools_state(False)
         self.progress_bar.set(0)
-        
-        for i, path in enumerate(self.image_paths_list):
-          
-            src = self.current_pil_image if total == 1 and self.current_pil_image else path
-            process_image(src, folder)
-            
-            prog = (i+1)/total
-            self.progress_bar.set(prog)
-            self.progress_label.configure(text=f"Processed {i+1}/{total}")
-            self.update_idletasks()
-            
-        messagebox.showinfo("Complete", self._("batch_upload_complete", total))
+        self.progress_label.configure(text=f"Processed 0/{total}")
+
+        def work(cancel_event, report):
+            # Düzenleme yoksa dosya yolu gönderilir (uyumlu JPEG'ler yeniden kodlanmadan kopyalanır).
+            sources = [self.render_full_image(paths[0], edits)] if total == 1 else paths
+            summary, failures = None, []
+            for event in process_images_batch(sources, folder, cancel_event=cancel_event,
+                                              encode_profile=self.settings.get("encode_profile")):
+                if event["event"] == "result":
+                    report(event["done"])
+                    if not event["result"]["success"]: failures.append((paths[event["index"]], event["result"]))
+                elif event["event"] == "finished":
+                    summary = {**event, "failures": failures}
+            return summary
+
+        self.tasks.start("upload", work, on_progress=lambda done: self.on_upload_progress(done, total),
+                         on_done=self.on_upload_done, on_error=self.on_upload_error)
+
+    def on_upload_progress(self, done, total):
+        self.progress_bar.set(done / total)
+        self.progress_label.configure(text=f"Processed {done}/{total}")
+
+    def on_upload_done(self, summary):
         self.process_button.configure(state="normal", text=self._("upload_button").upper())
+        self.set_edit_tools_state(True)
+        if summary is not None: self.on_upload_progress(summary["done"], summary["total"])
+        if summary is None or summary["cancelled"]:
+            messagebox.showinfo("Info", self._("task_cancelled"))
+            self.check_ready_state()
+            return
+        message = self._("batch_upload_complete", summary["succeeded"])
+        if summary.get("duplicates"): message += "\n" + self._("duplicates_skipped_count", summary["duplicates"])
+        failures = summary.get("failures") or []
+        if failures:
+            message += "\n\n" + self._("batch_failed_count", len(failures))
+            message += "".join("\n• " + self.describe_failure(path, result)
+                               for path, result in failures[:MAX_LISTED_FAILURES])
+            if len(failures) > MAX_LISTED_FAILURES: message += "\n…"
+            messagebox.showwarning("Complete", message)
+        else:
+            messagebox.showinfo("Complete", message)
         
        
         self.image_paths_list = []
-        self.current_pil_image = None
+        self.pyramid, self.edits = None, None
         self.preview_label.configure(image=None, text="Upload Complete!")
         self.show_edit_tools(False)
+        self.show_gallery(False)
         self.check_ready_state()
 
+    def describe_failure(self, path, result):
+        detail = result.get("data") or ""
+        text = self._(result.get("message_key", "unexpected_error"), detail)
+        if detail and detail not in text: text += f" ({detail})"
+        return f"{os.path.basename(path)}: {text}"
+
+    def on_upload_error(self, error):
+        self.process_button.configure(state="normal", text=self._("upload_button").upper())
+        self.set_edit_tools_state(True)
+        self.check_ready_state()
+        self.show_task_error(error)
+
+    def on_close(self):
+        self.tasks.shutdown()
+        self.gallery.shutdown()
+        self.destroy()
+
     def show_message(self, result):
         if result['success']: messagebox.showinfo("Info", self._(result['message_key']))
         else: messagebox.showerror("Error", self._(result.get('message_key', 'error')))
@@ -492,5 +969,6 @@ class App(ctk.CTk):
         entry.insert(0, "https://steamcommunity.com/tradeoffer/new/?partner=856438463&token=BmjqXOfQ")
         
 if __name__ == "__main__":
+    multiprocessing.freeze_support()
     app = App()
     app.mainloop()
\ No newline at end of file
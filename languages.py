@@ -1,5 +1,8 @@
-TRANSLATIONS = {
-    "tr": {
+from collections.abc import Mapping
+
+
+def _catalog_tr():
+    return {
         "window_title": "SteamF12TooL",
         "preview_placeholder": "Seçilen Resim Burada Görünecek",
         "select_image_button": "1. Resim/Resimler Seç",
@@ -54,9 +57,20 @@ TRANSLATIONS = {
         "update_list_button": "Oyun İsimlerini Güncelle (İnternet)",
         "update_list_success": "Oyun listesi başarıyla güncellendi!",
         "update_list_fail": "Liste güncellenemedi. İnternet bağlantınızı kontrol edin.",
-        "update_list_loading": "Liste indiriliyor..."
-    },
-    "en": {
+        "update_list_loading": "Liste indiriliyor...",
+        "manifest_not_found": "Klasör bir Steam profiline ait değil; screenshots.vdf güncellenmedi.",
+        "manifest_error": "screenshots.vdf güncellenemedi: {}",
+        "manifest_updated": "{} ekran görüntüsü Steam listesine kaydedildi.",
+        "task_cancelled": "İşlem iptal edildi.",
+        "duplicate_skipped": "Bu resim klasörde zaten var, atlandı.",
+        "duplicates_skipped_count": "{} yinelenen resim atlandı.",
+        "image_too_large": "Resim, bellek sınırı içinde işlenemeyecek kadar büyük.",
+        "batch_failed_count": "{} resim yüklenemedi:"
+    }
+
+
+def _catalog_en():
+    return {
         "window_title": "SteamF12TooL",
         "preview_placeholder": "Selected Image Will Appear Here",
         "select_image_button": "1. Select Image(s)",
@@ -111,9 +125,20 @@ TRANSLATIONS = {
         "update_list_button": "Update Game Names (Online)",
         "update_list_success": "Game list updated successfully!",
         "update_list_fail": "Could not update list. Check your connection.",
-        "update_list_loading": "Downloading list..."
-    },
-    "ar": {
+        "update_list_loading": "Downloading list...",
+        "manifest_not_found": "The folder is not inside a Steam profile; screenshots.vdf was not updated.",
+        "manifest_error": "Could not update screenshots.vdf: {}",
+        "manifest_updated": "{} screenshots registered in the Steam manifest.",
+        "task_cancelled": "Operation cancelled.",
+        "duplicate_skipped": "This image already exists in the folder and was skipped.",
+        "duplicates_skipped_count": "{} duplicate image(s) skipped.",
+        "image_too_large": "The image is too large to process within the memory limit.",
+        "batch_failed_count": "{} image(s) could not be uploaded:"
+    }
+
+
+def _catalog_ar():
+    return {
         "window_title": "SteamF12TooL",
         "preview_placeholder": "الصورة المحددة ستظهر هنا",
         "select_image_button": "1. اختر صورة (صور)",
@@ -168,9 +193,20 @@ TRANSLATIONS = {
         "update_list_button": "تحديث أسماء الألعاب (عبر الإنترنت)",
         "update_list_success": "تم تحديث قائمة الألعاب بنجاح!",
         "update_list_fail": "تعذر تحديث القائمة. تحقق من اتصالك.",
-        "update_list_loading": "جاري تنزيل القائمة..."
-    },
-    "it": {
+        "update_list_loading": "جاري تنزيل القائمة...",
+        "manifest_not_found": "المجلد ليس داخل ملف تعريف Steam؛ لم يتم تحديث screenshots.vdf.",
+        "manifest_error": "تعذر تحديث screenshots.vdf: {}",
+        "manifest_updated": "تم تسجيل {} لقطة شاشة في قائمة Steam.",
+        "task_cancelled": "تم إلغاء العملية.",
+        "duplicate_skipped": "هذه الصورة موجودة بالفعل في المجلد وتم تخطيها.",
+        "duplicates_skipped_count": "تم تخطي {} صورة مكررة.",
+        "image_too_large": "الصورة كبيرة جدًا بحيث لا يمكن معالجتها ضمن حد الذاكرة.",
+        "batch_failed_count": "تعذر تحميل {} صورة:"
+    }
+
+
+def _catalog_it():
+    return {
         "window_title": "SteamF12TooL",
         "preview_placeholder": "L'immagine Selezionata Apparirà Qui",
         "select_image_button": "1. Seleziona Immagine(i)",
@@ -225,9 +261,20 @@ TRANSLATIONS = {
         "update_list_button": "Aggiorna Nomi Giochi (Online)",
         "update_list_success": "Elenco giochi aggiornato con successo!",
         "update_list_fail": "Impossibile aggiornare l'elenco. Controlla la connessione.",
-        "update_list_loading": "Download elenco..."
-    },
-    "jp": {
+        "update_list_loading": "Download elenco...",
+        "manifest_not_found": "La cartella non si trova in un profilo Steam; screenshots.vdf non è stato aggiornato.",
+        "manifest_error": "Impossibile aggiornare screenshots.vdf: {}",
+        "manifest_updated": "{} screenshot registrati nel manifest di Steam.",
+        "task_cancelled": "Operazione annullata.",
+        "duplicate_skipped": "Questa immagine esiste già nella cartella ed è stata saltata.",
+        "duplicates_skipped_count": "{} immagini duplicate saltate.",
+        "image_too_large": "L'immagine è troppo grande per essere elaborata entro il limite di memoria.",
+        "batch_failed_count": "Impossibile caricare {} immagini:"
+    }
+
+
+def _catalog_jp():
+    return {
         "window_title": "SteamF12TooL",
         "preview_placeholder": "選択した画像がここに表示されます",
         "select_image_button": "1. 画像を選択",
@@ -282,9 +329,20 @@ TRANSLATIONS = {
         "update_list_button": "ゲーム名を更新 (オンライン)",
         "update_list_success": "ゲームリストが正常に更新されました！",
         "update_list_fail": "リストを更新できませんでした。接続を確認してください。",
-        "update_list_loading": "リストをダウンロード中..."
-    },
-    "fr": {
+        "update_list_loading": "リストをダウンロード中...",
+        "manifest_not_found": "フォルダーがSteamプロファイル内にないため、screenshots.vdfは更新されませんでした。",
+        "manifest_error": "screenshots.vdfを更新できませんでした: {}",
+        "manifest_updated": "{} 件のスクリーンショットをSteamの一覧に登録しました。",
+        "task_cancelled": "操作はキャンセルされました。",
+        "duplicate_skipped": "この画像は既にフォルダーに存在するため、スキップされました。",
+        "duplicates_skipped_count": "{} 件の重複画像をスキップしました。",
+        "image_too_large": "画像が大きすぎるため、メモリ制限内で処理できません。",
+        "batch_failed_count": "{} 枚の画像をアップロードできませんでした:"
+    }
+
+
+def _catalog_fr():
+    return {
         "window_title": "SteamF12TooL",
         "preview_placeholder": "L'image Sélectionnée Apparaîtra Ici",
         "select_image_button": "1. Sélectionner Image(s)",
@@ -339,9 +397,20 @@ TRANSLATIONS = {
         "update_list_button": "Mettre à jour les noms (En ligne)",
         "update_list_success": "Liste des jeux mise à jour avec succès !",
         "update_list_fail": "Impossible de mettre à jour la liste. Vérifiez votre connexion.",
-        "update_list_loading": "Téléchargement de la liste..."
-    },
-    "ru": {
+        "update_list_loading": "Téléchargement de la liste...",
+        "manifest_not_found": "Le dossier n'appartient pas à un profil Steam ; screenshots.vdf n'a pas été mis à jour.",
+        "manifest_error": "Impossible de mettre à jour screenshots.vdf : {}",
+        "manifest_updated": "{} captures enregistrées dans le manifeste Steam.",
+        "task_cancelled": "Opération annulée.",
+        "duplicate_skipped": "Cette image existe déjà dans le dossier et a été ignorée.",
+        "duplicates_skipped_count": "{} image(s) en double ignorée(s).",
+        "image_too_large": "L'image est trop grande pour être traitée dans la limite de mémoire.",
+        "batch_failed_count": "{} image(s) n'ont pas pu être importée(s) :"
+    }
+
+
+def _catalog_ru():
+    return {
         "window_title": "SteamF12TooL",
         "preview_placeholder": "Выбранное изображение появится здесь",
         "select_image_button": "1. Выбрать изображение(я)",
@@ -396,9 +465,20 @@ TRANSLATIONS = {
         "update_list_button": "Обновить названия игр (Онлайн)",
         "update_list_success": "Список игр успешно обновлен!",
         "update_list_fail": "Не удалось обновить список. Проверьте соединение.",
-        "update_list_loading": "Загрузка списка..."
-    },
-    "zh": {
+        "update_list_loading": "Загрузка списка...",
+        "manifest_not_found": "Папка не находится в профиле Steam; screenshots.vdf не обновлён.",
+        "manifest_error": "Не удалось обновить screenshots.vdf: {}",
+        "manifest_updated": "{} скриншотов зарегистрировано в списке Steam.",
+        "task_cancelled": "Операция отменена.",
+        "duplicate_skipped": "Это изображение уже есть в папке и было пропущено.",
+        "duplicates_skipped_count": "Пропущено повторяющихся изображений: {}.",
+        "image_too_large": "Изображение слишком велико для обработки в пределах лимита памяти.",
+        "batch_failed_count": "Не удалось загрузить изображений: {}"
+    }
+
+
+def _catalog_zh():
+    return {
         "window_title": "SteamF12TooL",
         "preview_placeholder": "选定的图片将显示在此处",
         "select_image_button": "1. 选择图片",
@@ -453,6 +533,59 @@ TRANSLATIONS = {
         "update_list_button": "更新游戏名称 (在线)",
         "update_list_success": "游戏列表更新成功！",
         "update_list_fail": "无法更新列表。请检查您的连接。",
-        "update_list_loading": "正在下载列表..."
+        "update_list_loading": "正在下载列表...",
+        "manifest_not_found": "该文件夹不在Steam个人资料中；未更新 screenshots.vdf。",
+        "manifest_error": "无法更新 screenshots.vdf：{}",
+        "manifest_updated": "已在Steam清单中登记 {} 张截图。",
+        "task_cancelled": "操作已取消。",
+        "duplicate_skipped": "该图片已存在于文件夹中，已跳过。",
+        "duplicates_skipped_count": "已跳过 {} 张重复图片。",
+        "image_too_large": "图片过大，无法在内存限制内处理。",
+        "batch_failed_count": "{} 张图片未能上传："
     }
-}
\ No newline at end of file
+
+
+_CATALOG_BUILDERS = {
+    "tr": _catalog_tr,
+    "en": _catalog_en,
+    "ar": _catalog_ar,
+    "it": _catalog_it,
+    "jp": _catalog_jp,
+    "fr": _catalog_fr,
+    "ru": _catalog_ru,
+    "zh": _catalog_zh,
+}
+DEFAULT_LANGUAGE = "en"
+_catalogs = {}
+
+
+def get_catalog(lang_code):
+    """Yalnızca istenen dilin sözlüğünü oluşturur ve önbelleğe alır; bilinmeyen kodlar İngilizceye düşer."""
+    catalog = _catalogs.get(lang_code)
+    if catalog is None:
+        builder = _CATALOG_BUILDERS.get(lang_code) or _CATALOG_BUILDERS[DEFAULT_LANGUAGE]
+        catalog = _catalogs[lang_code] = builder()
+    return catalog
+
+
+def translate(lang_code, key, *args):
+    text = get_catalog(lang_code).get(key)
+    if text is None: text = get_catalog(DEFAULT_LANGUAGE).get(key, key)
+    return text.format(*args) if args else text
+
+
+class _LazyTranslations(Mapping):
+    """Eski TRANSLATIONS[dil] kullanımı için; sözlükler ilk erişimde oluşturulur."""
+
+    def __getitem__(self, lang_code):
+        if lang_code not in _CATALOG_BUILDERS: raise KeyError(lang_code)
+        return get_catalog(lang_code)
+
+    def __iter__(self):
+        return iter(_CATALOG_BUILDERS)
+
+    def __len__(self):
+        return len(_CATALOG_BUILDERS)
+
+
+TRANSLATIONS = _LazyTranslations()
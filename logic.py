@@ -1,14 +1,28 @@
 import os
 import time
-import random
-from PIL import Image
-import winreg
-import requests
 import json
 import re
 import sys 
+import threading
+import weakref
+import vdf
+import metrics
+import dedup
+import encoder
+import publisher
+from app_index import AppIndex, AppIndexWriter, AppListStreamParser, record_from_item
 
 CONFIG_FILE = 'config.json'
+APP_LIST_FILE = 'steam_app_list.json'
+APP_INDEX_FILE = 'steam_app_index.bin'
+APP_LIST_META_FILE = 'steam_app_list.meta.json'
+
+APP_LIST_SOURCES = [
+    "http://api.steampowered.com/ISteamApps/GetAppList/v0002/?format=json",
+    "https://raw.githubusercontent.com/jsnli/steamappidlist/refs/heads/master/data/games_appid.json"
+]
+HTTP_HEADERS = {'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64)'}
+HTTP_TIMEOUT = (10, 60)
 
 MANUAL_MODS = {
     "17520": "Synergy",
@@ -49,71 +63,363 @@ def save_settings(settings):
     except IOError:
         print(f"Hata: Ayarlar dosyası '{CONFIG_FILE}' kaydedilemedi.")
 
+def _steam_root_from_env():
+    return os.environ.get("STEAMF12TOOL_STEAM_ROOT")
+
+def _steam_root_from_registry():
+    # winreg yalnızca Windows'ta vardır; diğer sistemlerde bu çözücü sessizce atlanır.
+    try:
+        import winreg
+    except ImportError:
+        return None
+    for hive, subkey, value in ((winreg.HKEY_LOCAL_MACHINE, r"SOFTWARE\WOW6432Node\Valve\Steam", "InstallPath"),
+                                (winreg.HKEY_LOCAL_MACHINE, r"SOFTWARE\Valve\Steam", "InstallPath"),
+                                (winreg.HKEY_CURRENT_USER, r"Software\Valve\Steam", "SteamPath")):
+        try:
+            with winreg.OpenKey(hive, subkey) as key:
+                path, _ = winreg.QueryValueEx(key, value)
+                return path
+        except OSError:
+            continue
+    return None
+
+def _steam_root_from_default_locations():
+    home = os.path.expanduser("~")
+    for path in (os.path.join(home, ".steam", "steam"),
+                 os.path.join(home, ".local", "share", "Steam"),
+                 os.path.join(home, "Library", "Application Support", "Steam")):
+        if os.path.isdir(os.path.join(path, "userdata")): return path
+    return None
+
+# Sırayla denenen Steam kök dizini çözücüleri; ilk geçerli dizini döndüren kazanır.
+STEAM_ROOT_RESOLVERS = [_steam_root_from_env, _steam_root_from_registry, _steam_root_from_default_locations]
+
+def register_steam_root_resolver(resolver, first=True):
+    """Steam kök dizinini döndüren (veya None) bir fonksiyon ekler; testler ve diğer platformlar içindir."""
+    if resolver in STEAM_ROOT_RESOLVERS: STEAM_ROOT_RESOLVERS.remove(resolver)
+    if first: STEAM_ROOT_RESOLVERS.insert(0, resolver)
+    else: STEAM_ROOT_RESOLVERS.append(resolver)
+
 def get_steam_install_path():
+    for resolver in STEAM_ROOT_RESOLVERS:
+        path = resolver()
+        if path and os.path.isdir(path): return path
+    return None
+
+PERSONA_NAME_PATH = "UserLocalConfigStore/friends/PersonaName"
+SCAN_CACHE_FILE = 'scan_cache.json'
+SCAN_CACHE_VERSION = 1
+SCAN_CACHE_STATS = {"hits": 0, "misses": 0}
+
+_scan_cache = None
+_scan_cache_dirty = False
+_scan_cache_lock = threading.Lock()
+
+def _get_scan_cache():
+    global _scan_cache
+    if _scan_cache is None:
+        try:
+            with open(SCAN_CACHE_FILE, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get("version") != SCAN_CACHE_VERSION: data = {}
+        except (OSError, ValueError, AttributeError):
+            data = {}
+        data["version"] = SCAN_CACHE_VERSION
+        data.setdefault("profiles", {})
+        data.setdefault("games", {})
+        _scan_cache = data
+    return _scan_cache
+
+def save_scan_cache():
+    """Tarama önbelleğini değiştiyse diske (atomik) yazar."""
+    global _scan_cache_dirty
+    with _scan_cache_lock:
+        if not _scan_cache_dirty: return
+        tmp_path = SCAN_CACHE_FILE + ".tmp"
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(_scan_cache, f)
+            os.replace(tmp_path, SCAN_CACHE_FILE)
+            _scan_cache_dirty = False
+        except OSError as e:
+            print(f"Hata: Tarama önbelleği '{SCAN_CACHE_FILE}' kaydedilemedi: {e}")
+
+def get_scan_cache_stats():
+    with _scan_cache_lock:
+        return dict(SCAN_CACHE_STATS)
+
+def reset_scan_cache_stats():
+    with _scan_cache_lock:
+        for key in SCAN_CACHE_STATS: SCAN_CACHE_STATS[key] = 0
+
+def _mtime_ns(path):
     try:
-        key = winreg.OpenKey(winreg.HKEY_LOCAL_MACHINE, r"SOFTWARE\WOW6432Node\Valve\Steam")
-        path, _ = winreg.QueryValueEx(key, "InstallPath")
-        return path
-    except FileNotFoundError:
+        return os.stat(path).st_mtime_ns
+    except OSError:
         return None
 
+def _cached_subdirs(section, path):
+    """path altındaki rakam adlı klasörleri {ad: mtime_ns} olarak döndürür ve önbellek girdisini verir.
+
+    path'in mtime'ı değişmediyse listeleme atlanır, yalnızca bilinen alt klasörler stat edilir;
+    değiştiyse os.scandir ile (dirent türleriyle) yeniden listelenir.
+    """
+    global _scan_cache_dirty
+    mtime = _mtime_ns(path)
+    if mtime is None: return None, {}
+    with _scan_cache_lock:
+        previous = _get_scan_cache()[section].get(path)
+        known = list(previous["children"]) if previous and previous.get("mtime") == mtime else None
+    children = {}
+    if known is not None:
+        cached = previous
+        for name in known:
+            child_mtime = _mtime_ns(os.path.join(path, name))
+            if child_mtime is not None: children[name] = child_mtime
+    else:
+        # Alt girdilerin önbelleği korunur; yalnızca mtime'ı değişenler yeniden okunur.
+        cached = {"mtime": mtime, "children": dict(previous["children"]) if previous else {}}
+        with os.scandir(path) as entries:
+            for entry in entries:
+                if not entry.name.isdigit(): continue
+                try:
+                    if entry.is_dir(): children[entry.name] = entry.stat().st_mtime_ns
+                except OSError:
+                    pass
+        with _scan_cache_lock:
+            _get_scan_cache()[section][path] = cached
+            _scan_cache_dirty = True
+    return cached, children
+
+def _cache_lookup(cached, name, mtime, compute):
+    """Alt girdinin mtime'ı önbellektekiyle aynıysa saklanan değeri, değilse compute() sonucunu döndürür."""
+    global _scan_cache_dirty
+    entry = cached["children"].get(name)
+    with _scan_cache_lock:
+        if entry and entry[0] == mtime:
+            SCAN_CACHE_STATS["hits"] += 1
+            return entry[1]
+        SCAN_CACHE_STATS["misses"] += 1
+    value = compute()
+    with _scan_cache_lock:
+        cached["children"][name] = [mtime, value]
+        _scan_cache_dirty = True
+    return value
+
+def _prune_cache_children(cached, names):
+    global _scan_cache_dirty
+    with _scan_cache_lock:
+        for name in set(cached["children"]) - set(names):
+            del cached["children"][name]
+            _scan_cache_dirty = True
+
 def find_steam_profiles():
+    with metrics.stage("find_steam_profiles"):
+        return _find_steam_profiles()
+
+def _find_steam_profiles():
     steam_path = get_steam_install_path()
     if not steam_path: return []
     userdata_path = os.path.join(steam_path, "userdata")
-    if not os.path.exists(userdata_path): return []
+    cached, users = _cached_subdirs("profiles", userdata_path)
+    if cached is None: return []
     profiles = []
-    for user_id in os.listdir(userdata_path):
-        if not user_id.isdigit(): continue
+    for user_id in sorted(users):
         config_path = os.path.join(userdata_path, user_id, 'config', 'localconfig.vdf')
-        persona_name = f"Profil ({user_id})"
-        if os.path.exists(config_path):
-            try:
-                with open(config_path, 'r', encoding='utf-8', errors='ignore') as f:
-                    content = f.read()
-                    match = re.search(r'"PersonaName"\s+"([^"]+)"', content)
-                    if match: persona_name = match.group(1)
-            except Exception: pass
-        profiles.append({'persona_name': persona_name, 'user_id': user_id})
+        # Değişmeyen profillerde config hiç okunmaz; okunursa da değer bulunduğu anda akış durur.
+        persona_name = _cache_lookup(cached, user_id, _mtime_ns(config_path),
+                                     lambda: vdf.find_value(config_path, PERSONA_NAME_PATH))
+        profiles.append({'persona_name': persona_name or f"Profil ({user_id})", 'user_id': user_id})
+    _prune_cache_children(cached, users)
+    save_scan_cache()
     return profiles
 
-def get_app_list_from_steam():
-  
-    sources = [
-        "http://api.steampowered.com/ISteamApps/GetAppList/v0002/?format=json",
-        "https://raw.githubusercontent.com/jsnli/steamappidlist/refs/heads/master/data/games_appid.json"
-    ]
-    headers = {'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64)'}
+_http_session = None
+_http_session_lock = threading.Lock()
 
-    print("Oyun listesi indiriliyor...")
+def get_http_session():
+    """Bağlantıları yeniden kullanan ortak requests.Session döndürür."""
+    global _http_session
+    with _http_session_lock:
+        if _http_session is None:
+            # requests yalnızca ağ işlemlerinde gerekir; CLI/GUI açılışını yavaşlatmasın diye burada yüklenir.
+            import requests
+            session = requests.Session()
+            adapter = requests.adapters.HTTPAdapter(pool_connections=len(APP_LIST_SOURCES), pool_maxsize=8)
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            session.headers.update(HTTP_HEADERS)
+            _http_session = session
+        return _http_session
 
-    for url in sources:
-        try:
-            print(f"Bağlanılıyor: {url}")
-            raw_content = bytearray()
-            with requests.get(url, headers=headers, stream=True, timeout=60) as response:
-                response.raise_for_status()
-                for chunk in response.iter_content(chunk_size=65536):
-                    if chunk: raw_content.extend(chunk)
-            
-            try:
-                json.loads(raw_content.decode('utf-8-sig', errors='ignore'))
-            except json.JSONDecodeError:
-                print("İndirilen veri geçerli bir JSON değil, atlanıyor.")
+def _load_app_list_meta():
+    try:
+        with open(APP_LIST_META_FILE, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return {}
+
+def _save_app_list_meta(meta):
+    tmp_path = APP_LIST_META_FILE + ".tmp"
+    try:
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(meta, f, indent=4)
+        os.replace(tmp_path, APP_LIST_META_FILE)
+    except OSError as e:
+        print(f"Hata: '{APP_LIST_META_FILE}' kaydedilemedi: {e}")
+
+def _download_app_list_source(result, meta, stop_event, trace=metrics.NULL_TRACE):
+    """Tek bir kaynaktan listeyi indirip akış halinde ayrıştırır; sonucu result dict'ine yazar.
+
+    Önceki yarım indirme için doğrulayıcı (ETag/Last-Modified) kayıtlıysa Range + If-Range ile
+    devam edilir; mevcut liste bu kaynaktan geldiyse If-None-Match/If-Modified-Since gönderilir.
+    """
+    url, part_path = result["url"], result["part_path"]
+    session = get_http_session()
+    partial = meta.get("partial", {}).get(url)
+    resume = bool(partial and os.path.exists(part_path))
+
+    for _ in range(2):
+        headers = {}
+        resume_from = os.path.getsize(part_path) if resume else 0
+        if resume_from:
+            headers["Range"] = f"bytes={resume_from}-"
+            headers["If-Range"] = partial.get("etag") or partial.get("last_modified")
+        elif meta.get("source") == url and os.path.exists(APP_LIST_FILE):
+            if meta.get("etag"): headers["If-None-Match"] = meta["etag"]
+            if meta.get("last_modified"): headers["If-Modified-Since"] = meta["last_modified"]
+
+        with trace.stage("connect"):
+            response = session.get(url, headers=headers, stream=True, timeout=HTTP_TIMEOUT)
+        with response:
+            if response.status_code == 304:
+                result["status"] = "not_modified"
+                return
+            if response.status_code == 416 and resume_from:
+                # Sunucu aralığı kabul etmedi; baştan indir.
+                resume = False
                 continue
+            response.raise_for_status()
+            result["etag"] = response.headers.get("ETag")
+            result["last_modified"] = response.headers.get("Last-Modified")
 
-           
-            with open("steam_app_list.json", "wb") as f:
-                f.write(raw_content)
-                
-            print(f"Dosya başarıyla indirildi ve kaydedildi. Boyut: {len(raw_content)} byte.")
-            return {"status": "success"} 
+            parser = AppListStreamParser()
+            writer = AppIndexWriter()
+            appending = response.status_code == 206 and resume_from > 0
+            with open(part_path, "ab" if appending else "wb") as f:
+                if appending:
+                    # Daha önce inen kısmı önce ayrıştırıcıdan geçir.
+                    with open(part_path, "rb") as existing:
+                        for chunk in iter(lambda: existing.read(65536), b""):
+                            for app_id, name in parser.feed(chunk): writer.add(app_id, name)
+                with trace.stage("stream"):
+                    for chunk in response.iter_content(chunk_size=65536):
+                        if stop_event.is_set():
+                            result["status"] = "cancelled"
+                            return
+                        if not chunk: continue
+                        f.write(chunk)
+                        if trace: trace.add(bytes_in=len(chunk))
+                        for app_id, name in parser.feed(chunk): writer.add(app_id, name)
+            for app_id, name in parser.close(): writer.add(app_id, name)
+            result.update(status="success", writer=writer, size=os.path.getsize(part_path))
+            return
 
+_part_locks = {}
+_part_locks_lock = threading.Lock()
+
+def _race_app_list_source(url, part_path, meta, stop_event):
+    # Önceki bir yenilemeden kalan (kaybeden) iş parçacığı aynı yarım dosyayı bırakana kadar bekle.
+    with _part_locks_lock:
+        part_lock = _part_locks.setdefault(part_path, threading.Lock())
+    with part_lock:
+        result = {"url": url, "part_path": part_path, "status": "failed"}
+        if stop_event.is_set():
+            result["status"] = "cancelled"
+            return result
+        trace = metrics.trace("app_list_download")
+        try:
+            _download_app_list_source(result, meta, stop_event, trace)
+        except ValueError as e:
+            print(f"İndirilen veri geçerli bir JSON değil, atlanıyor. ({url}: {e})")
+            result.pop("etag", None); result.pop("last_modified", None)
         except Exception as e:
             print(f"Hata ({url}): {e}")
-            continue
-            
-    return None
+        # Ağ hatasında doğrulayıcı varsa yarım dosya bir sonraki denemede devam etmek için saklanır.
+        result["resumable"] = (result["status"] == "failed" and os.path.exists(part_path)
+                               and bool(result.get("etag") or result.get("last_modified")))
+        if result["status"] in ("failed", "cancelled") and not result["resumable"]:
+            _remove_quietly(part_path)
+        trace.finish(result["status"])
+        return result
+
+def get_app_list_from_steam(sources=None, cancel_event=None):
+    """Kaynakları eşzamanlı dener; geçerli belgeyi ilk döndüren kazanır.
+
+    Dönüş: {"status": "success"}, liste değişmediyse {"status": "not_modified"}, başarısızsa None.
+    """
+    sources = list(sources or APP_LIST_SOURCES)
+    meta = _load_app_list_meta()
+    partials = meta.setdefault("partial", {})
+    stop_event = threading.Event()
+
+    print("Oyun listesi indiriliyor...")
+
+    from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+
+    executor = ThreadPoolExecutor(max_workers=len(sources))
+    pending = set()
+    for n, url in enumerate(sources):
+        print(f"Bağlanılıyor: {url}")
+        pending.add(executor.submit(_race_app_list_source, url, f"{APP_LIST_FILE}.{n}.part", meta, stop_event))
+
+    winner = None
+    try:
+        while pending and winner is None:
+            if cancel_event is not None and cancel_event.is_set(): break
+            finished, pending = wait(pending, timeout=0.25, return_when=FIRST_COMPLETED)
+            for future in finished:
+                result = future.result()
+                if result["status"] in ("success", "not_modified") and winner is None:
+                    winner = result
+                elif result.get("resumable"):
+                    partials[result["url"]] = {"etag": result.get("etag"), "last_modified": result.get("last_modified")}
+                else:
+                    partials.pop(result["url"], None)
+    finally:
+        # Kaybeden kaynaklar bir sonraki parçada durur ve kendi yarım dosyalarını siler.
+        stop_event.set()
+        executor.shutdown(wait=False)
+
+    if winner is None:
+        _save_app_list_meta(meta)
+        return None
+
+    url = winner["url"]
+    partials.pop(url, None)
+    if winner["status"] == "not_modified":
+        print(f"Oyun listesi güncel ({url}).")
+        _save_app_list_meta(meta)
+        return {"status": "not_modified"}
+
+    writer = winner["writer"]
+    writer.update(MANUAL_MODS)
+
+    def write():
+        os.replace(winner["part_path"], APP_LIST_FILE)
+        return writer.write(APP_INDEX_FILE)
+    with metrics.stage("app_index_write"):
+        count = _replace_app_index(APP_INDEX_FILE, write)
+    meta.update(source=url, etag=winner.get("etag"), last_modified=winner.get("last_modified"))
+    _save_app_list_meta(meta)
+    print(f"Dosya başarıyla indirildi ve kaydedildi. Boyut: {winner['size']} byte, {count} oyun ({url}).")
+    return {"status": "success"} 
+
+def _remove_quietly(path):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
 
 def parse_json_to_map(file_path, existing_map):
     """Helper: Verilen dosya yolundaki JSON'ı okuyup existing_map'e ekler."""
@@ -141,45 +447,142 @@ def parse_json_to_map(file_path, existing_map):
 
         
         for item in source_list:
-            if isinstance(item, dict):
-                aid = item.get('appid') or item.get('appId') or item.get('id')
-                name = item.get('name') or item.get('gamename')
-                if aid and name:
-                    existing_map[str(aid)] = name
+            record = record_from_item(item)
+            if record:
+                existing_map[str(record[0])] = record[1]
     except Exception as e:
         print(f"JSON okuma hatası ({file_path}): {e}")
 
-def scan_for_games(selected_user_id):
-    steam_path = get_steam_install_path()
-    if not steam_path: return {"success": False, "message_key": "steam_not_found"}
-
+def build_app_index(json_paths, index_path):
+    """JSON listelerini (sırayla, sonrakiler öncekileri ezer) + MANUAL_MODS'u kompakt indekse yazar."""
     app_map = {}
-    
-   
-    embedded_path = resource_path("steam_app_list.json")
-    parse_json_to_map(embedded_path, app_map)
+    for json_path in json_paths: parse_json_to_map(json_path, app_map)
+    app_map.update(MANUAL_MODS)
+    writer = AppIndexWriter()
+    writer.update(app_map)
+    return _replace_app_index(index_path, lambda: writer.write(index_path))
 
-   
-    local_path = "steam_app_list.json"
-    
+# Açık indeksler paylaşılır: get_app_name_lookup'ın döndürdüğü her fonksiyon kullandığı indeksleri
+# tutar ve fonksiyon bırakıldığında (GC) serbest bırakır. Önbellekten çıkarılan (yenisiyle değiştirilen)
+# bir indeks ancak son kullanıcısı da bıraktığında kapanır.
+APP_INDEX_SWAP_TIMEOUT = 30
+_app_indexes = {}       # yol -> (mtime, AppIndex)
+_app_index_users = {}   # AppIndex -> onu tutan arama fonksiyonu sayısı
+_app_index_lock = threading.Condition()
+_app_index_write_lock = threading.RLock()  # yeniden yazma sırasında eski dosya tekrar açılmaz
 
-    if os.path.abspath(local_path) != os.path.abspath(embedded_path):
-      
-        parse_json_to_map(local_path, app_map)
-    
-  
-    app_map.update(MANUAL_MODS)
+def _retire_app_index(index_path):
+    # _app_index_lock altında çağrılır.
+    cached = _app_indexes.pop(index_path, None)
+    index = cached[1] if cached else None
+    if index is not None and index not in _app_index_users: index.close()
+    return index
+
+def _release_app_indexes(indexes):
+    with _app_index_lock:
+        for index in indexes:
+            _app_index_users[index] -= 1
+            if _app_index_users[index]: continue
+            del _app_index_users[index]
+            if not any(cached[1] is index for cached in _app_indexes.values()): index.close()
+        _app_index_lock.notify_all()
+
+def _replace_app_index(index_path, write):
+    """Önbellekteki indeksi bırakıp write() ile dosyayı yeniden yazar ve write()'ın sonucunu döndürür.
+    Windows map edilmiş dosyanın üzerine yazdırmadığından orada eski indeksi tutan aramalar bitene kadar
+    (en fazla APP_INDEX_SWAP_TIMEOUT saniye) beklenir; diğer sistemlerde eski eşleme geçerli kalır."""
+    with _app_index_write_lock:
+        with _app_index_lock:
+            old = _retire_app_index(index_path)
+            if old is not None and os.name == "nt":
+                _app_index_lock.wait_for(lambda: old not in _app_index_users, APP_INDEX_SWAP_TIMEOUT)
+        return write()
+
+def close_app_indexes():
+    """Önbellekteki indeksleri bırakır; bir arama fonksiyonunun hâlâ tuttukları o bırakılınca kapanır."""
+    with _app_index_lock:
+        for index_path in list(_app_indexes): _retire_app_index(index_path)
+
+def _acquire_app_index(index_path, json_path):
+    """İndeksi açar ve kullanıcı sayısını artırır (_release_app_indexes ile bırakılır); yoksa veya
+    JSON'dan eskiyse bir kereye mahsus JSON'dan oluşturur."""
+    with _app_index_write_lock:
+        try:
+            json_mtime = os.stat(json_path).st_mtime_ns
+        except OSError:
+            json_mtime = None
+        try:
+            index_mtime = os.stat(index_path).st_mtime_ns
+        except OSError:
+            index_mtime = None
+
+        if json_mtime is not None and (index_mtime is None or index_mtime < json_mtime):
+            try:
+                build_app_index([json_path], index_path)
+                index_mtime = os.stat(index_path).st_mtime_ns
+            except OSError as e:
+                print(f"İndeks oluşturulamadı ({index_path}): {e}")
+        if index_mtime is None: return None
+
+        with _app_index_lock:
+            cached = _app_indexes.get(index_path)
+            if cached and cached[0] == index_mtime:
+                index = cached[1]
+            else:
+                _retire_app_index(index_path)
+                try:
+                    index = AppIndex(index_path)
+                except (OSError, ValueError) as e:
+                    print(f"İndeks okunamadı ({index_path}): {e}")
+                    index = None
+                _app_indexes[index_path] = (index_mtime, index)
+            if index is not None: _app_index_users[index] = _app_index_users.get(index, 0) + 1
+            return index
+
+def get_app_name_lookup():
+    """app_id -> isim fonksiyonu döndürür. Öncelik: MANUAL_MODS, indirilen liste, gömülü liste."""
+    indexes = []
+    local_index = _acquire_app_index(APP_INDEX_FILE, APP_LIST_FILE)
+    if local_index is not None: indexes.append(local_index)
+    embedded_path = resource_path(APP_INDEX_FILE)
+    if os.path.abspath(embedded_path) != os.path.abspath(APP_INDEX_FILE):
+        embedded_index = _acquire_app_index(embedded_path, resource_path(APP_LIST_FILE))
+        if embedded_index is not None: indexes.append(embedded_index)
+
+    def lookup(app_id, default=None):
+        app_id = str(app_id)
+        if app_id in MANUAL_MODS: return MANUAL_MODS[app_id]
+        for index in indexes:
+            name = index.get(app_id)
+            if name is not None: return name
+        return default
+    # İndeksler fonksiyon yaşadıkça açık kalır; arada yenilenseler bile eski eşleme kullanılabilir.
+    if indexes: weakref.finalize(lookup, _release_app_indexes, indexes)
+    return lookup
+
+def scan_for_games(selected_user_id, lookup_app_name=None):
+    with metrics.stage("scan_for_games"):
+        return _scan_for_games(selected_user_id, lookup_app_name)
+
+def _scan_for_games(selected_user_id, lookup_app_name):
+    steam_path = get_steam_install_path()
+    if not steam_path: return {"success": False, "message_key": "steam_not_found"}
+
+    lookup_app_name = lookup_app_name or get_app_name_lookup()
 
     found_games = []
     remote_path = os.path.join(steam_path, "userdata", selected_user_id, "760", "remote")
     
-    if os.path.exists(remote_path):
-        for app_id in os.listdir(remote_path):
-            if not app_id.isdigit(): continue
+    cached, apps = _cached_subdirs("games", remote_path)
+    if cached is not None:
+        for app_id, app_mtime in apps.items():
             screenshots_path = os.path.join(remote_path, app_id, "screenshots")
-            if os.path.exists(screenshots_path):
-                game_name = app_map.get(str(app_id), f"Oyun ID: {app_id}")
-                found_games.append({"name": game_name, "path": screenshots_path})
+            # screenshots klasörünün eklenmesi/silinmesi uygulama klasörünün mtime'ını değiştirir.
+            if _cache_lookup(cached, app_id, app_mtime, lambda: os.path.isdir(screenshots_path)):
+                game_name = lookup_app_name(app_id, f"Oyun ID: {app_id}")
+                found_games.append({"name": game_name, "path": screenshots_path, "app_id": app_id})
+        _prune_cache_children(cached, apps)
+        save_scan_cache()
                 
     if not found_games:
         return {"success": False, "message_key": "no_games_with_screenshots_found"}
@@ -187,33 +590,826 @@ def scan_for_games(selected_user_id):
     found_games.sort(key=lambda x: x['name'])
     return {"success": True, "data": found_games}
 
-def generate_steam_filename():
-    return f"{time.strftime('%Y%m%d%H%M%S')}_{random.randint(1, 5)}.jpg"
+def get_screenshots_folder_stats(screenshots_path):
+    """Klasördeki .jpg ekran görüntülerinin sayısını ve toplam boyutunu döndürür (thumbnails hariç)."""
+    count = total_bytes = 0
+    try:
+        with os.scandir(screenshots_path) as entries:
+            for entry in entries:
+                if not entry.name.lower().endswith(".jpg"): continue
+                try:
+                    if entry.is_file():
+                        count += 1
+                        total_bytes += entry.stat().st_size
+                except OSError:
+                    pass
+    except OSError:
+        pass
+    return count, total_bytes
+
+def _catalog_profile(profile, lookup_app_name):
+    result = scan_for_games(profile['user_id'], lookup_app_name)
+    games = []
+    for game in result.get("data", []) if result["success"] else []:
+        count, total_bytes = get_screenshots_folder_stats(game["path"])
+        games.append({**game, "screenshot_count": count, "total_bytes": total_bytes})
+    return {"user_id": profile['user_id'], "persona_name": profile['persona_name'], "games": games,
+            "screenshot_count": sum(g["screenshot_count"] for g in games),
+            "total_bytes": sum(g["total_bytes"] for g in games)}
+
+def iter_library_catalog(max_workers=None):
+    """Tüm profilleri bir thread havuzunda eşzamanlı tarar; her profil bittikçe onun kataloğunu üretir.
+
+    İsimler tüm profiller için tek bir ortak arama (app indeksi) üzerinden çözülür.
+    """
+    from concurrent.futures import ThreadPoolExecutor, as_completed
 
-def create_thumbnail(image_source, output_path, width=200):
+    profiles = find_steam_profiles()
+    if not profiles: return
+    lookup_app_name = get_app_name_lookup()
+    with ThreadPoolExecutor(max_workers=max_workers or min(8, len(profiles))) as executor:
+        futures = [executor.submit(_catalog_profile, profile, lookup_app_name) for profile in profiles]
+        for future in as_completed(futures):
+            yield future.result()
+
+def build_library_catalog(max_workers=None, on_profile=None):
+    """Profil x oyun ekran görüntüsü klasörlerinin birleşik görünümü.
+
+    on_profile verilirse her profil bittiğinde o profilin kataloğuyla çağrılır.
+    Dönüş: {"profiles": [...], "game_count", "screenshot_count", "total_bytes"}
+    """
+    profiles = []
+    for entry in iter_library_catalog(max_workers):
+        profiles.append(entry)
+        if on_profile: on_profile(entry)
+    profiles.sort(key=lambda p: p["persona_name"].lower())
+    return {"profiles": profiles,
+            "game_count": sum(len(p["games"]) for p in profiles),
+            "screenshot_count": sum(p["screenshot_count"] for p in profiles),
+            "total_bytes": sum(p["total_bytes"] for p in profiles)}
+
+def get_screenshots_folder(user_id, app_id, create=False):
+    """userdata/<user_id>/760/remote/<app_id>/screenshots yolunu döndürür (Steam bulunamazsa None)."""
+    steam_path = get_steam_install_path()
+    if not steam_path: return None
+    path = os.path.join(steam_path, "userdata", str(user_id), "760", "remote", str(app_id), "screenshots")
+    if create: os.makedirs(os.path.join(path, "thumbnails"), exist_ok=True)
+    return path
+
+STEAM_FILENAME_RE = re.compile(r"^(\d{14})_(\d+)\.jpg$", re.IGNORECASE)
+NAME_CLAIM_PREFIX = ".f12claim-"
+NAME_CLAIM_SUFFIX = ".claim"  # publisher.TEMP_SUFFIX gibi: claim dosyaları .jpg ile bitmez
+EXIF_IFD = 0x8769
+EXIF_DATETIME_ORIGINAL = 0x9003
+EXIF_DATETIME = 0x0132
+
+def read_capture_time(image_path):
+    """EXIF DateTimeOriginal (yoksa DateTime) değerini yalnızca başlıktan okur; yoksa None."""
+    from PIL import Image
+    try:
+        with Image.open(image_path) as img:
+            exif = img.getexif()
+            value = exif.get_ifd(EXIF_IFD).get(EXIF_DATETIME_ORIGINAL) or exif.get(EXIF_DATETIME)
+        return time.mktime(time.strptime(str(value).strip("\x00 "), "%Y:%m:%d %H:%M:%S")) if value else None
+    except (OSError, ValueError, OverflowError):
+        return None
+
+class ScreenshotNameAllocator:
+    """Bir screenshots klasörü için çakışmasız YYYYmmddHHMMSS_N.jpg adları dağıtır.
+
+    Klasör (ve thumbnails) yalnızca bir kez taranır; aynı saniye için sayaç bellekte ilerler.
+    İş parçacıkları arasında kilitle, süreçler arasında klasördeki O_EXCL "claim" dosyalarıyla
+    güvenlidir. Dosya yazıldıktan (veya iş başarısız olduktan) sonra release() çağrılmalıdır.
+    Çöken bir çalışmadan kalmış, publisher.STALE_TEMP_SECONDS'tan eski claim dosyaları tarama
+    sırasında silinir ve adları yeniden kullanılabilir.
+    """
+
+    def __init__(self, screenshots_folder_path, claim_files=True):
+        self.folder = screenshots_folder_path
+        self.claim_files = claim_files
+        self._lock = threading.Lock()
+        self._next = {}
+        self._claimed = set()
+        stale = time.time() - publisher.STALE_TEMP_SECONDS
+        for folder in (self.folder, os.path.join(self.folder, "thumbnails")):
+            try:
+                with os.scandir(folder) as entries:
+                    for entry in entries:
+                        name = entry.name
+                        if name.startswith(NAME_CLAIM_PREFIX):
+                            if self._remove_stale_claim(entry, stale): continue
+                            name = name[len(NAME_CLAIM_PREFIX):]
+                            if name.endswith(NAME_CLAIM_SUFFIX): name = name[:-len(NAME_CLAIM_SUFFIX)]
+                        match = STEAM_FILENAME_RE.match(name)
+                        if match: self._bump(match.group(1), int(match.group(2)) + 1)
+            except OSError:
+                pass
+
+    @staticmethod
+    def _remove_stale_claim(entry, limit):
+        try:
+            if entry.stat().st_mtime >= limit: return False
+            os.remove(entry.path)
+            return True
+        except FileNotFoundError:
+            return True
+        except OSError:
+            return False
+
+    def _bump(self, stamp, n):
+        if n > self._next.get(stamp, 1): self._next[stamp] = n
+
+    def _claim_path(self, name):
+        return os.path.join(self.folder, f"{NAME_CLAIM_PREFIX}{name}{NAME_CLAIM_SUFFIX}")
+
+    def _claim(self, name):
+        if not self.claim_files: return True
+        claim_path = self._claim_path(name)
+        try:
+            os.close(os.open(claim_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+        except FileExistsError:
+            return False
+        # Tarama sonrası başka bir süreç adı kullanıp claim'ini bırakmış olabilir.
+        if os.path.exists(os.path.join(self.folder, name)):
+            _remove_quietly(claim_path)
+            return False
+        return True
+
+    def allocate(self, timestamp=None):
+        stamp = time.strftime('%Y%m%d%H%M%S', time.localtime(timestamp))
+        with self._lock:
+            n = self._next.get(stamp, 1)
+            while True:
+                name = f"{stamp}_{n}.jpg"
+                n += 1
+                if self._claim(name): break
+            self._next[stamp] = n
+            self._claimed.add(name)
+        return name
+
+    def release(self, name):
+        with self._lock:
+            if name not in self._claimed: return
+            self._claimed.discard(name)
+        if self.claim_files: _remove_quietly(self._claim_path(name))
+
+    def close(self):
+        for name in list(self._claimed): self.release(name)
+
+THUMBNAIL_WIDTH = 200
+STEAM_MAX_SIDE = 16384
+EXIF_ORIENTATION = 0x0112
+
+def _is_pil_image(obj):
+    # PIL henüz yüklenmediyse obj bir PIL görüntüsü olamaz; bu kontrol PIL'i yüklemez.
+    pil_image = sys.modules.get("PIL.Image")
+    return pil_image is not None and isinstance(obj, pil_image.Image)
+
+def _thumbnail_size(size, width=THUMBNAIL_WIDTH):
+    ratio = width / float(size[0])
+    return width, int((float(size[1]) * float(ratio)))
+
+def _to_rgb(img):
+    """Zaten RGB olan görüntüyü kopyalamadan döndürür (convert her zaman yeni bir kopya üretir)."""
+    return img if img.mode == "RGB" else img.convert("RGB")
+
+def _make_thumbnail(rgb_img, width=THUMBNAIL_WIDTH):
+    """Normalize edilmiş RGB görüntüden önce tamsayı reduce, sonra LANCZOS ile thumbnail türetir."""
+    from PIL import Image
+    return rgb_img.resize(_thumbnail_size(rgb_img.size, width), Image.LANCZOS, reducing_gap=3.0)
+
+def create_thumbnail(image_source, output_path, width=THUMBNAIL_WIDTH, memory_budget_mb=None):
     try:
-        img = image_source if isinstance(image_source, Image.Image) else Image.open(image_source)
-        ratio = width / float(img.size[0])
-        height = int((float(img.size[1]) * float(ratio)))
-        resized_img = img.resize((width, height), Image.LANCZOS)
-        rgb_img = resized_img.convert('RGB')
-        rgb_img.save(output_path, "JPEG", quality=90)
+        if _is_pil_image(image_source):
+            img = image_source
+        else:
+            img = _open_image(image_source)
+            # Genişliği thumbnail'in 3 katı olacak ölçekte çözülür (JPEG'de draft, ham biçimlerde şeritler).
+            side = -(-3 * width * max(img.size) // img.size[0])
+            img = decode_image(img, plan_image_decode(img, side, memory_budget_mb))
+        _make_thumbnail(_to_rgb(img), width).save(output_path, "JPEG", quality=90)
         return True
     except Exception:
         return False
 
-def process_image(image_source, screenshots_folder_path):
+def load_preview_thumbnail(image_path, max_size):
+    """Galeri için max_size (w, h) içine sığan RGB küçük resim döndürür; açılamazsa None.
+    JPEG'ler draft ile küçültülmüş ölçekte çözülür (iş parçacıklarından güvenle çağrılabilir)."""
     try:
-        img_to_process = image_source if isinstance(image_source, Image.Image) else Image.open(image_source)
-        steam_filename = generate_steam_filename()
+        from PIL import Image
+        with Image.open(image_path) as img:
+            img.draft("RGB", tuple(d * 2 for d in max_size))
+            img.thumbnail(max_size, Image.Resampling.BILINEAR, reducing_gap=2.0)
+            # convert her zaman kopya üretir; dosya kapandıktan sonra da kullanılabilir.
+            return img.convert("RGB")
+    except Exception:
+        return None
+
+def is_steam_compatible_jpeg(img, max_side=STEAM_MAX_SIDE):
+    """Yalnızca başlığa bakarak dosyanın yeniden kodlanmadan Steam'e kopyalanabileceğini söyler.
+
+    Baseline (progressive olmayan) RGB JPEG, boyut sınırı (max_side) içinde ve EXIF yönü normal olmalı;
+    aksi halde yeniden kodlanan çıktıyla aynı görünmez.
+    """
+    if img.format != "JPEG" or img.mode != "RGB": return False
+    if img.info.get("progressive") or img.info.get("progression"): return False
+    width, height = img.size
+    if not (0 < width <= max_side and 0 < height <= max_side): return False
+    return img.getexif().get(EXIF_ORIENTATION, 1) == 1
+
+# Büyük resim modu: çıktı en fazla MAX_OUTPUT_SIDE kenarlı olur; bir resmin çözülmesi (resim başına,
+# yani havuzda işçi başına) yaklaşık IMAGE_MEMORY_BUDGET_MB ile sınırlanır.
+MAX_OUTPUT_SIDE = STEAM_MAX_SIDE
+IMAGE_MEMORY_BUDGET_MB = 1024
+# Şerit şerit okunabilen ham (sıkıştırılmamış) satır biçimleri ve piksel başına bayt sayıları.
+_BAND_RAWMODES = {"RGB": 3, "BGR": 3, "RGBX": 4, "BGRX": 4, "RGBA": 4, "BGRA": 4, "L": 1, "LA": 2}
+_MB = 1 << 20
+_pil_limit_lock = threading.Lock()
+
+class ImageTooLargeError(ValueError):
+    """Resim, bellek bütçesi içinde çözülemiyor (mesaj: boyut, biçim ve tahmini bellek)."""
+
+def _open_image(source):
+    """Resmi açar (yalnızca başlık okunur). PIL'in decompression bomb sınırı (MAX_IMAGE_PIXELS) yerine
+    plan_image_decode'un bellek bütçesi uygulanır; büyük JPEG'ler küçültülerek çözülebildiği için
+    piksel sayısı tek başına ret sebebi değildir."""
+    from PIL import Image
+    with _pil_limit_lock:
+        saved, Image.MAX_IMAGE_PIXELS = Image.MAX_IMAGE_PIXELS, None
+        try:
+            return Image.open(source)
+        finally:
+            Image.MAX_IMAGE_PIXELS = saved
+
+def _pixel_bytes(mode):
+    # PIL çok kanallı görüntüleri (RGB dahil) piksel başına 4 baytla tutar.
+    return 1 if mode in ("1", "L", "P") else 2 if mode in ("LA", "PA", "La", "I;16", "I;16B", "I;16L") else 4
+
+def _fit_size(size, max_side):
+    scale = min(1.0, max_side / float(max(size)))
+    return max(1, int(size[0] * scale)), max(1, int(size[1] * scale))
+
+def _band_tiles(img):
+    """Resim tam genişlikte ham şeritlerden oluşuyorsa [(y0, y1, ofset, rawmode, stride, yön)] döndürür."""
+    if img.mode not in ("RGB", "RGBA", "L", "LA") or not img.tile: return None
+    width = img.size[0]
+    tiles = []
+    for tile in img.tile:
+        codec, extents, offset, args = tile[0], tile[1], tile[2], tile[3]
+        if codec != "raw" or extents[0] != 0 or extents[2] != width: return None
+        rawmode, stride, orientation = (args, 0, 1) if isinstance(args, str) else (tuple(args) + (0, 1))[:3]
+        if rawmode not in _BAND_RAWMODES or orientation not in (1, -1): return None
+        tiles.append((extents[1], extents[3], offset, rawmode, stride or width * _BAND_RAWMODES[rawmode], orientation))
+    return sorted(tiles)
+
+def plan_image_decode(img, max_side=None, memory_budget_mb=None):
+    """Yalnızca başlıktaki boyut ve biçimden çıktı boyutunu ve çözme yolunu seçer.
+
+    Yollar: "draft" (JPEG; DCT ölçeklemesiyle 1/2..1/8 boyutta çözülür), "bands" (ham şeritli BMP/TIFF/
+    PPM/TGA; şerit şerit okunup küçültülür) ve "full" (PNG, WebP vb.; PIL bunları yalnızca bütün olarak
+    çözebilir). Tepe bellek bütçeyi aşacaksa önce çıktı küçültülür; yine sığmıyorsa ImageTooLargeError.
+    {"method", "target": (w, h), "decode": (w, h) (draft) / "band_rows" (bands), "peak_mb"} döndürür.
+    """
+    max_side = max_side or MAX_OUTPUT_SIDE
+    budget = (memory_budget_mb or IMAGE_MEMORY_BUDGET_MB) * _MB
+    width, height = img.size
+    if width <= 0 or height <= 0: raise ImageTooLargeError(f"Geçersiz boyut: {width}x{height}")
+    target = _fit_size(img.size, max_side)
+    # Çıktı + ara küçültme (en fazla 4x çıktı) + JPEG tamponu bütçenin yarısını geçmemeli.
+    out_cost = lambda size: size[0] * size[1] * (4 + 16 + 1) if size != img.size else size[0] * size[1] * 5
+    while out_cost(target) > budget // 2 and max(target) > 1:
+        target = _fit_size(target, int(max(target) * 0.9))
+
+    def describe(method, peak, **extra):
+        return {"method": method, "target": target, "peak_mb": round(peak / _MB, 1), **extra}
+
+    convert_bytes = 0 if img.mode in ("RGB", "L") else 4
+    if img.format == "JPEG":
+        for scale in (8, 4, 2, 1):
+            decoded = (-(-width // scale), -(-height // scale))
+            if decoded[0] >= target[0] and decoded[1] >= target[1]: break
+        while True:
+            decoded = (-(-width // scale), -(-height // scale))
+            target = tuple(min(t, d) for t, d in zip(target, decoded))
+            peak = decoded[0] * decoded[1] * (_pixel_bytes(img.mode) + convert_bytes) + out_cost(target)
+            if peak <= budget: return describe("draft", peak, decode=decoded)
+            if scale == 8: break
+            scale *= 2
+            target = _fit_size(target, max(-(-width // scale), -(-height // scale)))
+        raise ImageTooLargeError(f"{width}x{height} JPEG: ~{peak // _MB} MB > {budget // _MB} MB")
+
+    tiles = _band_tiles(img) if (width, height) != target else None
+    if tiles:
+        factor = max(1, min(width // target[0], height // target[1]))
+        row_bytes = width * (_BAND_RAWMODES[tiles[0][3]] + 8)  # ham satır + şerit görüntüsü + RGB dönüşümü
+        rows = max(factor, (budget // 4) // row_bytes // factor * factor)
+        peak = rows * row_bytes + out_cost(target)
+        if peak <= budget: return describe("bands", peak, band_rows=rows, factor=factor)
+
+    peak = width * height * (_pixel_bytes(img.mode) + convert_bytes) + out_cost(target)
+    if peak > budget:
+        raise ImageTooLargeError(f"{width}x{height} {img.format or ''}: ~{peak // _MB} MB > {budget // _MB} MB")
+    return describe("full", peak)
+
+def _downscale(img, target):
+    """Önce tamsayı kutu küçültme (reduce), sonra LANCZOS; ara görüntü en fazla 2x hedef kenarındadır."""
+    from PIL import Image
+    if img.size == tuple(target): return img
+    factor = min(img.size[0] // target[0], img.size[1] // target[1])
+    if factor >= 2: img = img.reduce(factor)
+    return img.resize(target, Image.LANCZOS)
+
+def _decode_bands(img, plan):
+    """Ham şeritleri dosyadan doğrudan okuyup her bandı factor kadar küçültür; tam çözünürlüklü
+    görüntü hiçbir zaman bellekte bulunmaz."""
+    from PIL import Image
+    width, height = img.size
+    factor, band_rows = plan["factor"], plan["band_rows"]
+    mode = "RGB" if img.mode == "RGB" else img.mode
+    reduced = Image.new(mode, (width // factor, height // factor))
+    tiles = _band_tiles(img)
+    fp = img.fp
+    for y0 in range(0, reduced.size[1] * factor, band_rows):
+        y1 = min(y0 + band_rows, reduced.size[1] * factor)
+        band = Image.new(mode, (width, y1 - y0))
+        for t0, t1, offset, rawmode, stride, orientation in tiles:
+            lo, hi = max(y0, t0), min(y1, t1)
+            if lo >= hi: continue
+            # Aşağıdan yukarı (yön -1) kayıtlarda dosyadaki satır sırası terstir.
+            first = (lo - t0) if orientation == 1 else (t1 - hi)
+            fp.seek(offset + first * stride)
+            data = fp.read((hi - lo) * stride)
+            rows = Image.frombytes(mode, (width, hi - lo), data, "raw", rawmode, stride, orientation)
+            band.paste(rows, (0, lo - y0))
+        reduced.paste(band.reduce(factor) if factor > 1 else band, (0, y0 // factor))
+    return reduced
+
+def _decode_planned(img, plan):
+    if plan["method"] == "draft":
+        img.draft("RGB", plan["decode"])
+    elif plan["method"] == "bands":
+        return _decode_bands(img, plan)
+    img.load()
+    return img
+
+def _to_target(img, target):
+    # Küçültme kanal sayısı azken yapılır; palet ve 1 bit görüntüler reduce desteklemez.
+    if img.mode not in ("RGB", "RGBA", "L", "LA", "CMYK", "YCbCr", "I", "F"): img = img.convert("RGB")
+    return _to_rgb(_downscale(img, target))
+
+def decode_image(img, plan):
+    """plan_image_decode planına göre resmi çözer ve plan["target"] boyutunda RGB görüntü döndürür."""
+    return _to_target(_decode_planned(img, plan), plan["target"])
+
+def load_image(path, max_side=None, memory_budget_mb=None):
+    """Dosyayı process_image ile aynı sınırlarla (max_side, bellek bütçesi) çözülmüş RGB görüntü olarak
+    döndürür; bütçeye sığmıyorsa ImageTooLargeError."""
+    img = _open_image(path)
+    decoded = None
+    try:
+        decoded = decode_image(img, plan_image_decode(img, max_side, memory_budget_mb))
+        return decoded
+    finally:
+        if decoded is not img: img.close()
+
+def _passthrough_jpeg(img, source_path, steam_full_path, steam_thumb_path, pairs, trace=metrics.NULL_TRACE,
+                      check=None, encode_profile=None):
+    """Baytları olduğu gibi geçici dosyaya kopyalar (destekleyen sistemlerde çekirdek içi kopya) ve
+    thumbnail'i JPEG draft ölçeğinde çözerek üretir; yazılan (geçici, son) çiftler pairs'e eklenir.
+    check(thumb, thumb_data) bir dosya adı döndürürse (tekrar) hiçbir şey yazılmaz ve o ad döndürülür."""
+    with trace.stage("thumbnail_decode"):
+        img.draft("RGB", tuple(d * 3 for d in _thumbnail_size(img.size)))
+        img.load()
+        rgb = _to_rgb(img)
+    with trace.stage("thumbnail_resize"):
+        thumb = _make_thumbnail(rgb)
+    with trace.stage("thumbnail_encode"):
+        data = encoder.encode_thumbnail(thumb, encode_profile)
+    if check:
+        existing = check(thumb, data)
+        if existing: return existing
+    with trace.stage("write"):
+        pairs.append((publisher.write_temp(steam_thumb_path, data), steam_thumb_path))
+    with trace.stage("copy"):
+        pairs.append((publisher.copy_temp(source_path, steam_full_path), steam_full_path))
+    if trace: trace.add(bytes_out=os.path.getsize(pairs[-1][0]) + len(data))
+    return None
+
+def _duplicate_result(existing, hashes=None):
+    # Piksel veya dHash ile bulunan tekrarda kaynak özeti de döner; indeks onu eşleşen kayda ekler.
+    result = {"success": True, "message_key": "duplicate_skipped", "data": existing, "duplicate": True}
+    if hashes and hashes.get("source"): result["hashes"] = {"source": hashes["source"]}
+    return result
+
+class ImageOptions:
+    """process_image seçenekleri; replace() değiştirilmiş bir kopya döndürür."""
+    __slots__ = ("passthrough", "max_side", "memory_budget_mb", "encode_profile", "max_bytes", "min_ssim",
+                 "dedup_index", "source_digest", "publish")
+
+    def __init__(self, passthrough=True, max_side=None, memory_budget_mb=None, encode_profile=None,
+                 max_bytes=None, min_ssim=None, dedup_index=None, source_digest=None, publish=True):
+        # Çözme/kodlama: uyumlu JPEG'ler kopyalanabilir; çıktı en fazla max_side (MAX_OUTPUT_SIDE) kenarlı,
+        # çözme memory_budget_mb içinde (plan_image_decode); encode_profile, max_bytes ve min_ssim encoder'a.
+        self.passthrough, self.max_side, self.memory_budget_mb = passthrough, max_side, memory_budget_mb
+        self.encode_profile, self.max_bytes, self.min_ssim = encode_profile, max_bytes, min_ssim
+        # Tekrar denetimi: dedup.DedupIndex ve kaynağın önceden hesaplanmış dedup.file_digest değeri.
+        # Tekrarsa hiçbir şey yazılmaz ("duplicate": True); değilse sonuçtaki "hashes" indekse eklenir.
+        self.dedup_index, self.source_digest = dedup_index, source_digest
+        # publish=False ise sonuçtaki "pending" çiftlerini çağıran bir publisher.GroupCommit ile yayımlar.
+        self.publish = publish
+
+    def replace(self, **changes):
+        values = {name: getattr(self, name) for name in self.__slots__}
+        values.update(changes)
+        return ImageOptions(**values)
+
+def process_image(image_source, screenshots_folder_path, steam_filename=None, options=None):
+    """Resmi Steam'in beklediği JPEG + thumbnail çiftine dönüştürür (seçenekler: ImageOptions)."""
+    trace = metrics.trace("image")
+    result = _process_image(image_source, screenshots_folder_path, steam_filename, options or ImageOptions(), trace)
+    status = "duplicate" if result.get("duplicate") else "ok" if result["success"] else "error"
+    record = trace.finish(status)
+    if record: result["metrics"] = record
+    return result
+
+def _process_image(image_source, screenshots_folder_path, steam_filename, options, trace):
+    dedup_index, source_digest = options.dedup_index, options.source_digest
+    max_side, max_bytes, encode_profile = options.max_side or MAX_OUTPUT_SIDE, options.max_bytes, options.encode_profile
+    pairs = []
+    try:
+        passthrough = options.passthrough and encoder.get_profile(encode_profile)["passthrough"]
+        owns_image = not _is_pil_image(image_source)
+        is_path = owns_image and isinstance(image_source, (str, os.PathLike))
+        hashes = None
+        if dedup_index is not None:
+            with trace.stage("dedup"):
+                if is_path and source_digest is None: source_digest = dedup.file_digest(image_source)
+                existing = dedup_index.find_bytes(source_digest)
+            if existing: return _duplicate_result(existing)
+            hashes = {"source": source_digest}
+        with trace.stage("open"):
+            img_to_process = _open_image(image_source) if owns_image else image_source
+        size = out_size = img_to_process.size
+        copy_source = passthrough and owns_image and is_steam_compatible_jpeg(img_to_process, max_side)
+        if copy_source and max_bytes and is_path: copy_source = os.path.getsize(image_source) <= max_bytes
+        plan = None
+        if not copy_source:
+            try:
+                if owns_image: plan = plan_image_decode(img_to_process, max_side, options.memory_budget_mb)
+                else: plan = {"method": "memory", "target": _fit_size(size, max_side)}
+            except ImageTooLargeError as e:
+                img_to_process.close()
+                return {"success": False, "message_key": "image_too_large", "data": str(e)}
+            out_size = plan["target"]
+
+        def find_duplicate(thumb, thumb_data, rgb=None):
+            # Tam piksel özeti O(1) sözlük araması; dHash klasördeki dosyalarla aynı ölçekte, yazılacak
+            # thumbnail baytlarından hesaplanır ve adaylar küçük ölçekte doğrulanır.
+            with trace.stage("dedup"):
+                if rgb is not None:
+                    hashes["pixels"] = dedup.pixel_digest(rgb)
+                    existing = dedup_index.find_pixels(hashes["pixels"])
+                    if existing: return existing
+                hashes["dhash"] = dedup.thumbnail_dhash(thumb_data)
+                return dedup_index.find_similar(hashes["dhash"], thumb, dims=out_size)
+
+        allocator = None
+        if not steam_filename:
+            allocator = ScreenshotNameAllocator(screenshots_folder_path)
+            steam_filename = allocator.allocate()
         steam_full_path = os.path.join(screenshots_folder_path, steam_filename)
         steam_thumbs_folder = os.path.join(screenshots_folder_path, "thumbnails")
         steam_thumb_path = os.path.join(steam_thumbs_folder, steam_filename)
         if not os.path.exists(steam_thumbs_folder): os.makedirs(steam_thumbs_folder)
-        rgb_img = img_to_process.convert("RGB")
-        rgb_img.save(steam_full_path, "JPEG", quality=95)
-        if not create_thumbnail(img_to_process, steam_thumb_path):
-            return {"success": False, "message_key": "thumbnail_error"}
-        return {"success": True, "message_key": "upload_success_message", "data": steam_filename}
+        copied = False
+        encoded = None
+        if trace:
+            trace.add(pixels=size[0] * size[1])
+            if is_path: trace.add(bytes_in=os.path.getsize(image_source))
+        try:
+            if copy_source:
+                copied = True
+                # Baytlar birebir kopyalandığından tam eşleşme kaynak özetiyle zaten denetlendi.
+                check = find_duplicate if hashes is not None else None
+                try:
+                    existing = _passthrough_jpeg(img_to_process, image_source, steam_full_path, steam_thumb_path,
+                                                 pairs, trace, check, encode_profile)
+                except Exception:
+                    return {"success": False, "message_key": "thumbnail_error"}
+                if existing: return _duplicate_result(existing, hashes)
+                if hashes is not None: hashes["output"] = source_digest
+            else:
+                # Tek seferde çöz (plana göre küçültülmüş ölçekte) + hedef boyuta indir + RGB'ye normalize
+                # et; hem tam resim hem thumbnail bu tampondan üretilir.
+                with trace.stage("decode"):
+                    decoded = _decode_planned(img_to_process, plan) if owns_image else img_to_process
+                with trace.stage("convert"):
+                    rgb_img = _to_target(decoded, out_size)
+                if owns_image and rgb_img is not img_to_process: img_to_process.close()
+                decoded = None
+                try:
+                    with trace.stage("thumbnail_resize"):
+                        thumb = _make_thumbnail(rgb_img)
+                    with trace.stage("thumbnail_encode"):
+                        thumb_data = encoder.encode_thumbnail(thumb, encode_profile)
+                except Exception:
+                    return {"success": False, "message_key": "thumbnail_error"}
+                if hashes is not None:
+                    existing = find_duplicate(thumb, thumb_data, rgb_img)
+                    if existing: return _duplicate_result(existing, hashes)
+                with trace.stage("encode"):
+                    data, encoded = encoder.encode_screenshot(rgb_img, encode_profile, max_bytes, options.min_ssim)
+                if hashes is not None: hashes["output"] = dedup.buffer_digest(data)
+                with trace.stage("write"):
+                    pairs.append((publisher.write_temp(steam_thumb_path, thumb_data), steam_thumb_path))
+                    pairs.append((publisher.write_temp(steam_full_path, data), steam_full_path))
+                if trace: trace.add(bytes_out=len(data) + len(thumb_data))
+            if options.publish:
+                with trace.stage("publish"):
+                    writer = publisher.GroupCommit()
+                    writer.add(pairs)
+                    published, pairs = pairs, []
+                    try:
+                        writer.commit()
+                    except OSError as e:
+                        # Thumbnail'i yayımlanıp tam resmi yayımlanamayan çiftin yetim thumbnail'i kaldırılır.
+                        for _, final in published[:e.published]: _remove_quietly(final)
+                        raise
+        finally:
+            if owns_image: img_to_process.close()
+            if allocator: allocator.close()
+        result = {"success": True, "message_key": "upload_success_message", "data": steam_filename,
+                  "passthrough": copied, "width": out_size[0], "height": out_size[1]}
+        if tuple(out_size) != tuple(size): result["source_size"] = list(size)
+        if encoded: result["encode"] = encoded
+        if hashes is not None: result["hashes"] = hashes
+        if pairs: result["pending"], pairs = pairs, []
+        return result
     except Exception as e:
-        return {"success": False, "message_key": "unexpected_error", "data": str(e)}
\ No newline at end of file
+        return {"success": False, "message_key": "unexpected_error", "data": str(e)}
+    finally:
+        publisher.discard(pairs)  # başarısız veya tekrar çıkan işin geçici dosyaları
+
+SCREENSHOTS_MANIFEST = "screenshots.vdf"
+UNUPLOADED_SCREENSHOT_HANDLE = "18446744073709551615"
+
+def get_screenshots_manifest(screenshots_folder_path):
+    """.../userdata/<id>/760/remote/<appid>/screenshots için (screenshots.vdf yolu, appid) döndürür.
+    Klasör bu yapıda değilse (manuel klasör) (None, None)."""
+    folder = os.path.normpath(os.path.abspath(screenshots_folder_path))
+    app_dir, screenshots = os.path.split(folder)
+    remote_dir, app_id = os.path.split(app_dir)
+    root_760, remote = os.path.split(remote_dir)
+    if screenshots.lower() != "screenshots" or remote.lower() != "remote" or not app_id.isdigit():
+        return None, None
+    if os.path.basename(root_760) != "760": return None, None
+    return os.path.join(root_760, SCREENSHOTS_MANIFEST), app_id
+
+def register_screenshots(screenshots_folder_path, results):
+    """Başarılı process_image sonuçlarını profilin 760/screenshots.vdf dosyasına toplu kaydeder.
+
+    Manifest bir kez okunur, tüm grup bellekte eklenir ve tek bir atomik yazma yapılır.
+    Not: Steam açıkken manifesti kapanışta kendi belleğinden yeniden yazar.
+    """
+    manifest_path, app_id = get_screenshots_manifest(screenshots_folder_path)
+    if not manifest_path: return {"success": False, "message_key": "manifest_not_found"}
+    entries = [r for r in results if r.get("success") and r.get("data") and not r.get("duplicate")]
+    if not entries: return {"success": True, "message_key": "manifest_updated", "data": 0}
+
+    try:
+        manifest = vdf.load(manifest_path) if os.path.exists(manifest_path) else {}
+    except (OSError, ValueError) as e:
+        return {"success": False, "message_key": "manifest_error", "data": str(e)}
+    # Anahtarlar Steam'de büyük/küçük harf duyarsızdır; dosyadaki yazım korunur (ör. "screenshots").
+    game = vdf.block(vdf.block(manifest, "Screenshots"), app_id)
+
+    known = {str(vdf.lookup(item, "filename", "")).lower() for item in game.values() if isinstance(item, dict)}
+    next_index = max((int(k) for k in game if k.isdigit()), default=-1) + 1
+    added = 0
+    for result in entries:
+        filename = f"{app_id}/screenshots/{result['data']}"
+        if filename.lower() in known: continue
+        match = STEAM_FILENAME_RE.match(result["data"])
+        creation = int(time.mktime(time.strptime(match.group(1), "%Y%m%d%H%M%S"))) if match else int(time.time())
+        game[str(next_index)] = {
+            "type": "1",
+            "filename": filename,
+            "thumbnail": f"{app_id}/screenshots/thumbnails/{result['data']}",
+            "vrfilename": "",
+            "imported": "0",
+            "width": str(result.get("width", 0)),
+            "height": str(result.get("height", 0)),
+            "gameid": app_id,
+            "creation": str(creation),
+            "caption": "",
+            "Permissions": "2",
+            "hscreenshot": UNUPLOADED_SCREENSHOT_HANDLE,
+        }
+        known.add(filename.lower())
+        next_index += 1
+        added += 1
+
+    if added:
+        try:
+            vdf.dump_file(manifest, manifest_path, backup=True)
+        except OSError as e:
+            return {"success": False, "message_key": "manifest_error", "data": str(e)}
+    return {"success": True, "message_key": "manifest_updated", "data": added}
+
+def _batch_worker(image_source, screenshots_folder_path, steam_filename, metrics_enabled=False,
+                  skip_duplicates=False, source_digest=None, options=None):
+    # Süreç havuzu işçisi (Windows'ta spawn) ölçüm ayarını ebeveynden alır; kayıt sonuçla geri döner.
+    # Tekrar indeksi ebeveynin kaydettiği dosyadan işçi başına bir kez okunur (salt okunur).
+    # Dosyalar geçici adlarla yazılır; ebeveyn grup halinde yayımlar.
+    metrics.enable(metrics_enabled)
+    index = dedup.open_index(screenshots_folder_path, refresh=False) if skip_duplicates else None
+    options = (options or ImageOptions(publish=False)).replace(dedup_index=index, source_digest=source_digest)
+    return process_image(image_source, screenshots_folder_path, steam_filename, options)
+
+def process_images_batch(image_sources, screenshots_folder_path, max_workers=None, cancel_event=None,
+                         use_capture_time=False, register_manifest=True, skip_duplicates=True, executor=None,
+                         max_side=None, memory_budget_mb=None, encode_profile=None, max_bytes=None, min_ssim=None):
+    """Resimleri süreç havuzunda paralel işler ve her dosya bittikçe bir olay (dict) üretir.
+
+    Olaylar: {"event": "result", "index", "source", "done", "total", "result"} ve en sonda
+    {"event": "finished", "done", "total", "succeeded", "duplicates", "failed", "cancelled"}.
+    cancel_event (threading.Event vb.) set edilirse yeni dosya gönderilmez, çalışanlar bitirilir.
+    use_capture_time True ise dosya adları EXIF çekim zamanından türetilir. register_manifest True ise
+    bitişten önce başarılı dosyalar screenshots.vdf'e tek seferde kaydedilir ({"event": "manifest", ...}).
+    skip_duplicates True ise klasörün tekrar indeksi (dedup.py) kullanılır: klasörde veya aynı grupta
+    zaten bulunan içerik yazılmaz (sonuçta "duplicate": True); indeks sonda kaydedilir.
+    executor verilirse (uzun ömürlü bir ProcessPoolExecutor) havuz her çağrıda yeniden kurulmaz ve
+    kapatılmaz; max_workers yine eşzamanlı iş penceresini belirler. max_side, memory_budget_mb (resim,
+    dolayısıyla işçi başına bütçe), encode_profile, max_bytes ve min_ssim ImageOptions ile iletilir.
+
+    İşler dosyalarını geçici adlarla yazar; ebeveyn bunları publisher.GroupCommit ile GROUP_MAX_FILES
+    dosyada veya GROUP_MAX_SECONDS'ta bir toplu olarak yayımlar (tek disk senkronu). Bir dosyanın
+    "result" olayı, dosyası yayımlandıktan sonra üretilir.
+    """
+    sources = list(image_sources)
+    total = len(sources)
+    if max_workers is None: max_workers = os.cpu_count() or 1
+    max_workers = max(1, min(max_workers, total or 1))
+    cancel_event = cancel_event or threading.Event()
+    allocator = ScreenshotNameAllocator(screenshots_folder_path)
+    hash_index = dedup.open_index(screenshots_folder_path) if skip_duplicates else None
+    options = ImageOptions(max_side=max_side, memory_budget_mb=memory_budget_mb, encode_profile=encode_profile,
+                           max_bytes=max_bytes, min_ssim=min_ssim, publish=False)
+    in_flight = {}  # kaynak bayt özeti -> bu grupta ona ayrılmış dosya adı
+    writer = publisher.GroupCommit()
+    staged = []      # yayımlanmayı bekleyen (sıra, sonuç, ad, özet)
+    staged_pixels = {}  # bekleyen işlerin piksel özeti -> ad
+    done = succeeded = duplicates = 0
+    completed = []
+    for folder in (screenshots_folder_path, os.path.join(screenshots_folder_path, "thumbnails")):
+        publisher.remove_stale_temps(folder)
+
+    def allocate(index):
+        source = sources[index]
+        timestamp = read_capture_time(source) if use_capture_time and not _is_pil_image(source) else None
+        return allocator.allocate(timestamp)
+
+    def source_digest(i):
+        if hash_index is None or _is_pil_image(sources[i]): return None
+        try:
+            return dedup.file_digest(sources[i])
+        except OSError:
+            return None  # okunamayan dosyanın hatası process_image'dan döner
+
+    def known_duplicate(digest):
+        # Havuza göndermeden O(1) bayt kontrolü: klasörde ya da bu grupta zaten işlenen kaynak.
+        if digest is None: return None
+        existing = hash_index.find_bytes(digest) or in_flight.get(digest)
+        return _duplicate_result(existing) if existing else None
+
+    def stage(index, result, name=None, digest=None):
+        # Aynı gruptaki farklı baytlı ama pikselleri aynı kaynaklar işçiler birbirini görmediğinden
+        # ikisi de yazılabilir; ikincisinin geçici dosyaları burada silinip tekrar olarak raporlanır.
+        pending = result.pop("pending", None)
+        hashes = result.get("hashes")
+        pixels = hashes.get("pixels") if hashes and hash_index is not None and result.get("success") else None
+        existing = pixels and (hash_index.find_pixels(pixels) or staged_pixels.get(pixels))
+        if existing and existing != result["data"]:
+            publisher.discard(pending)
+            pending, result = None, _duplicate_result(existing, hashes)
+        elif pixels:
+            staged_pixels[pixels] = result["data"]
+        start = len(writer)
+        writer.add(pending)
+        staged.append((index, result, name, digest, pending or [], start))
+
+    def due():
+        # Yayımlanacak dosya yoksa (tekrarlar, hatalar) olaylar beklemeden üretilir.
+        return bool(staged) and (not len(writer) or writer.due())
+
+    def flush():
+        # Bekleyen dosyaları tek seferde yayımlar, sonra indeksi günceller ve olayları üretir.
+        # Yayımlama yarıda kalırsa yalnızca çiftleri tamamen yayımlanamayan işler hatalı sayılır.
+        error, published = None, len(writer)
+        try:
+            with metrics.stage("publish"):
+                writer.commit()
+        except OSError as e:
+            error, published = {"success": False, "message_key": "unexpected_error", "data": str(e)}, e.published
+        batch = staged[:]
+        del staged[:]
+        staged_pixels.clear()
+        for index, result, name, digest, pairs, start in batch:
+            if error and pairs and start + len(pairs) > published:
+                # Thumbnail'i yayımlanıp tam resmi yayımlanamayan çiftin yetim thumbnail'i kaldırılır.
+                for _, final in pairs[:max(0, published - start)]: _remove_quietly(final)
+                result = dict(error)
+            hashes = result.get("hashes")
+            if hash_index is not None and hashes and result.get("success"):
+                # Tekrarın kaynağı da kaydedilir: sonraki çalışmalar onu çözmeden bayt özetiyle yakalar.
+                if result.get("duplicate"): hash_index.add_source(result["data"], hashes.get("source"))
+                else: hash_index.add(result["data"], hashes, (result["width"], result["height"]))
+            if digest: in_flight.pop(digest, None)
+            if name: allocator.release(name)
+            yield event(index, result)
+
+    def event(index, result):
+        nonlocal done, succeeded, duplicates
+        done += 1
+        if result.get("duplicate"):
+            duplicates += 1
+        elif result.get("success"):
+            succeeded += 1
+            completed.append(result)
+        return {"event": "result", "index": index, "source": sources[index],
+                "done": done, "total": total, "result": result}
+
+    # PIL Image nesneleri (GUI'de düzenlenmiş tek resim) ve tek işçili işler havuza gönderilmez.
+    inline = [i for i, src in enumerate(sources) if max_workers == 1 or _is_pil_image(src)]
+    inline_set = set(inline)
+    pooled = [i for i in range(total) if i not in inline_set]
+
+    try:
+        for i in inline:
+            if cancel_event.is_set(): break
+            digest = source_digest(i)
+            result = known_duplicate(digest)
+            if result is None:
+                name = allocate(i)
+                if digest: in_flight[digest] = name
+                stage(i, process_image(sources[i], screenshots_folder_path, name,
+                                       options.replace(dedup_index=hash_index, source_digest=digest)), name, digest)
+            else:
+                stage(i, result)
+            if due(): yield from flush()
+        yield from flush()
+
+        if pooled and not cancel_event.is_set():
+            from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+
+            own_executor = executor is None
+            if own_executor: executor = ProcessPoolExecutor(max_workers=max_workers)
+            pending = {}
+            queue = iter(pooled)
+            try:
+                while True:
+                    # Bellek ve iptal gecikmesini sınırlamak için havuzda en fazla 2x işçi kadar iş tutulur.
+                    while not cancel_event.is_set() and len(pending) < max_workers * 2:
+                        i = next(queue, None)
+                        if i is None: break
+                        digest = source_digest(i)
+                        duplicate = known_duplicate(digest)
+                        if duplicate:
+                            stage(i, duplicate)
+                            continue
+                        name = allocate(i)
+                        if digest: in_flight[digest] = name
+                        future = executor.submit(_batch_worker, sources[i], screenshots_folder_path, name,
+                                                 metrics.is_enabled(), hash_index is not None, digest, options)
+                        pending[future] = (i, name, digest)
+                    if not pending: break
+                    finished, _ = wait(pending, timeout=0.25, return_when=FIRST_COMPLETED)
+                    for future in finished:
+                        i, name, digest = pending.pop(future)
+                        try:
+                            result = future.result()
+                        except Exception as e:
+                            result = {"success": False, "message_key": "unexpected_error", "data": str(e)}
+                        metrics.merge(result.get("metrics"))
+                        stage(i, result, name, digest)
+                    if due(): yield from flush()
+                    if cancel_event.is_set():
+                        for future in list(pending):
+                            if future.cancel():
+                                _, name, digest = pending.pop(future)
+                                in_flight.pop(digest, None)
+                                allocator.release(name)
+            finally:
+                if own_executor: executor.shutdown(wait=True, cancel_futures=True)
+        yield from flush()
+    finally:
+        writer.abort()  # yalnızca yarıda kesilen (ör. kapatılan üreteç) çalışmada dolu kalır
+        allocator.close()
+        if hash_index is not None: hash_index.save()
+
+    if register_manifest and completed and get_screenshots_manifest(screenshots_folder_path)[0]:
+        yield {"event": "manifest", **register_screenshots(screenshots_folder_path, completed)}
+
+    yield {"event": "finished", "done": done, "total": total, "succeeded": succeeded,
+           "duplicates": duplicates, "failed": done - succeeded - duplicates,
+           "cancelled": cancel_event.is_set() and done < total}
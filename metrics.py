@@ -0,0 +1,257 @@
+""" İsteğe bağlı ölçüm katmanı (aşama süreleri, bayt ve piksel sayıları).
+
+Kapalıyken (varsayılan) trace() paylaşılan bir NULL_TRACE, stage() boş bir bağlam döndürür; ek maliyet
+bir fonksiyon çağrısı kadardır. Açmak için enable() veya STEAMF12TOOL_METRICS=1.
+
+    tr = metrics.trace("image")
+    with tr.stage("decode"): img.load()
+    if tr: tr.add(bytes_in=os.path.getsize(path))
+    record = tr.finish()          # histogramlara işlenir; süreç havuzundan dönen kayıtlar merge() ile eklenir
+
+Toplanan değerler snapshot() / to_json() / to_openmetrics() ile dışa aktarılır.
+"""
+import os
+import threading
+import time
+from bisect import bisect_left
+
+PREFIX = "steamf12tool"
+DURATION_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+BYTES_BUCKETS = tuple(4 ** n * 1024 for n in range(1, 10))       # 4 KB .. 256 MB
+PIXELS_BUCKETS = (0.5e6, 1e6, 2.1e6, 3.7e6, 8.3e6, 16.6e6, 33.2e6, 67e6, 134e6)
+
+_enabled = os.environ.get("STEAMF12TOOL_METRICS") == "1"
+_lock = threading.Lock()
+_histograms = {}   # (ad, etiketler) -> Histogram
+_counters = {}     # (ad, etiketler) -> değer
+_gauges = {}       # (ad, etiketler) -> anlık değer
+
+
+def enable(on=True):
+    global _enabled
+    _enabled = bool(on)
+
+
+def is_enabled():
+    return _enabled
+
+
+def reset():
+    with _lock:
+        _histograms.clear()
+        _counters.clear()
+        _gauges.clear()
+
+
+class Histogram:
+    __slots__ = ("buckets", "counts", "sum", "count", "min", "max")
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum, self.count, self.min, self.max = 0.0, 0, None, None
+
+    def observe(self, value):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+
+
+def _key(name, labels):
+    return name, tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+def observe(name, value, buckets=DURATION_BUCKETS, **labels):
+    if not _enabled: return
+    key = _key(name, labels)
+    with _lock:
+        hist = _histograms.get(key)
+        if hist is None: hist = _histograms[key] = Histogram(buckets)
+        hist.observe(value)
+
+
+def inc(name, value=1, **labels):
+    if not _enabled: return
+    key = _key(name, labels)
+    with _lock:
+        _counters[key] = _counters.get(key, 0) + value
+
+
+def set_gauge(name, value, **labels):
+    """Anlık değer (ör. kuyruk uzunluğu); son yazılan değer dışa aktarılır."""
+    if not _enabled: return
+    key = _key(name, labels)
+    with _lock:
+        _gauges[key] = value
+
+
+class _NullContext:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_CONTEXT = _NullContext()
+
+
+class _StageTimer:
+    __slots__ = ("trace", "name", "started")
+
+    def __init__(self, trace, name):
+        self.trace, self.name = trace, name
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        stages = self.trace.stages
+        stages[self.name] = stages.get(self.name, 0.0) + time.perf_counter() - self.started
+        return False
+
+
+class Trace:
+    """Tek bir işin (ör. bir resim) aşama süreleri (saniye, aynı ad tekrar edilirse toplanır) ve sayaçları."""
+    __slots__ = ("kind", "stages", "values", "started")
+
+    def __init__(self, kind):
+        self.kind, self.stages, self.values = kind, {}, {}
+        self.started = time.perf_counter()
+
+    def __bool__(self):
+        return True
+
+    def stage(self, name):
+        return _StageTimer(self, name)
+
+    def add(self, **values):
+        for name, value in values.items(): self.values[name] = self.values.get(name, 0) + value
+
+    def finish(self, status="ok"):
+        record = {"kind": self.kind, "status": status, "seconds": time.perf_counter() - self.started,
+                  "stages": self.stages, "values": self.values}
+        merge(record)
+        return record
+
+
+class _NullTrace:
+    __slots__ = ()
+
+    def __bool__(self):
+        return False
+
+    def stage(self, name):
+        return _NULL_CONTEXT
+
+    def add(self, **values):
+        pass
+
+    def finish(self, status="ok"):
+        return None
+
+
+NULL_TRACE = _NullTrace()
+
+
+def trace(kind):
+    return Trace(kind) if _enabled else NULL_TRACE
+
+
+def stage(name, **labels):
+    """Tek başına bir işlemi zamanlar: <ad>_seconds histogramı (ör. scan_for_games_seconds)."""
+    return _TimedBlock(name, labels) if _enabled else _NULL_CONTEXT
+
+
+class _TimedBlock:
+    __slots__ = ("name", "labels", "started")
+
+    def __init__(self, name, labels):
+        self.name, self.labels = name, labels
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, *exc):
+        observe(f"{self.name}_seconds", time.perf_counter() - self.started,
+                status="error" if exc_type else "ok", **self.labels)
+        return False
+
+
+def merge(record):
+    """Trace.finish() kaydını (aynı süreçten veya havuz işçisinden dönen) histogramlara işler."""
+    if not record or not _enabled: return
+    kind = record["kind"]
+    inc(f"{kind}_processed", status=record["status"])
+    observe(f"{kind}_seconds", record["seconds"])
+    for name, seconds in record["stages"].items(): observe(f"{kind}_stage_seconds", seconds, stage=name)
+    for name, value in record["values"].items():
+        buckets = PIXELS_BUCKETS if name == "pixels" else BYTES_BUCKETS
+        observe(f"{kind}_{name}", value, buckets=buckets)
+
+
+def snapshot():
+    with _lock:
+        histograms = [{"name": name, "labels": dict(labels), "buckets": list(h.buckets), "counts": list(h.counts),
+                       "sum": h.sum, "count": h.count, "min": h.min, "max": h.max}
+                      for (name, labels), h in sorted(_histograms.items())]
+        counters = [{"name": name, "labels": dict(labels), "value": value}
+                    for (name, labels), value in sorted(_counters.items())]
+        gauges = [{"name": name, "labels": dict(labels), "value": value}
+                  for (name, labels), value in sorted(_gauges.items())]
+    return {"histograms": histograms, "counters": counters, "gauges": gauges}
+
+
+def to_json(indent=None):
+    import json
+    return json.dumps(snapshot(), indent=indent)
+
+
+def _labels_text(labels, extra=None):
+    items = list(labels.items()) + ([extra] if extra else [])
+    if not items: return ""
+    escaped = (k + '="' + str(v).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") + '"'
+               for k, v in items)
+    return "{" + ",".join(escaped) + "}"
+
+
+def _number(value):
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def to_openmetrics():
+    """OpenMetrics metin biçimi (Prometheus uyumlu); '# EOF' ile biter."""
+    snap = snapshot()
+    lines, typed = [], set()
+    for h in snap["histograms"]:
+        name = f"{PREFIX}_{h['name']}"
+        if name not in typed:
+            lines.append(f"# TYPE {name} histogram")
+            typed.add(name)
+        cumulative = 0
+        for bound, count in zip(list(h["buckets"]) + ["+Inf"], h["counts"]):
+            cumulative += count
+            le = bound if bound == "+Inf" else _number(float(bound))
+            lines.append(f"{name}_bucket{_labels_text(h['labels'], ('le', le))} {cumulative}")
+        lines.append(f"{name}_sum{_labels_text(h['labels'])} {_number(float(h['sum']))}")
+        lines.append(f"{name}_count{_labels_text(h['labels'])} {h['count']}")
+    for c in snap["counters"]:
+        name = f"{PREFIX}_{c['name']}"
+        if name + "#counter" not in typed:
+            lines.append(f"# TYPE {name} counter")
+            typed.add(name + "#counter")
+        lines.append(f"{name}_total{_labels_text(c['labels'])} {_number(c['value'])}")
+    for g in snap["gauges"]:
+        name = f"{PREFIX}_{g['name']}"
+        if name + "#gauge" not in typed:
+            lines.append(f"# TYPE {name} gauge")
+            typed.add(name + "#gauge")
+        lines.append(f"{name}{_labels_text(g['labels'])} {_number(g['value'])}")
+    lines.append("# EOF")
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,194 @@
+""" Ekran görüntüsü + thumbnail çiftlerini çökmeye dayanıklı yayımlama (group commit).
+
+Dosyalar önce hedef klasörde gizli geçici adlarla (.f12tmp-...part; .jpg ile bitmez, Steam ve tekrar
+indeksi görmez) yazılır, sonra os.replace ile son adlarına taşınır: önce thumbnail, sonra tam resim.
+Böylece Steam hiçbir zaman yarım bir JPEG ya da thumbnail'i olmayan bir ekran görüntüsü görmez.
+
+Kalıcılık toplu yapılır (group commit): write_temp/copy_temp senkron yapmaz; GroupCommit.commit bir
+gruptaki tüm geçici dosyaların verisini tek seferde diske indirir, adları değiştirir ve her klasörü bir
+kez fsync eder.
+    Linux   : dosya sistemi başına tek bir syncfs(2); dosya başına fsync yapılmaz
+    diğer   : syncfs yok (Windows'ta birim boyu flush yönetici yetkisi ister); grubun geçici dosyaları
+              commit sırasında birlikte, SYNC_THREADS iş parçacığıyla paralel fsync edilir, böylece
+              disk kuyruğu onları tek seferde boşaltır. Klasör fsync'i desteklenmiyorsa (Windows) atlanır
+
+    writer = GroupCommit()
+    writer.add([(thumb_tmp, thumb_path), (full_tmp, full_path)])
+    writer.commit()
+"""
+import os
+import shutil
+import sys
+import time
+
+TEMP_PREFIX = ".f12tmp-"
+TEMP_SUFFIX = ".part"
+GROUP_MAX_FILES = 32
+GROUP_MAX_SECONDS = 0.5
+STALE_TEMP_SECONDS = 3600
+SYNC_THREADS = 8
+
+_syncfs = None
+
+
+def _load_syncfs():
+    """libc syncfs (Linux); yoksa False. ctypes açılışta yüklenmesin diye ilk kullanımda çözülür."""
+    global _syncfs
+    if _syncfs is None:
+        _syncfs = False
+        if sys.platform.startswith("linux"):
+            try:
+                import ctypes
+                import ctypes.util
+                _syncfs = getattr(ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True),
+                                  "syncfs", False)
+            except OSError:
+                pass
+    return _syncfs
+
+
+def temp_path(final_path):
+    folder, name = os.path.split(final_path)
+    return os.path.join(folder, f"{TEMP_PREFIX}{name}.{os.getpid()}{TEMP_SUFFIX}")
+
+
+def write_temp(final_path, data):
+    """data'yı final_path'in klasöründe geçici bir dosyaya yazar ve geçici yolu döndürür."""
+    path = temp_path(final_path)
+    with open(path, "wb") as f:
+        f.write(data)
+    return path
+
+
+def copy_temp(source_path, final_path):
+    """Kaynağı (destekleyen sistemlerde çekirdek içi kopyayla) geçici dosyaya kopyalar."""
+    path = temp_path(final_path)
+    shutil.copyfile(source_path, path)
+    return path
+
+
+def discard(pairs):
+    for tmp, _ in pairs or ():
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+
+
+def _fsync_dir(folder):
+    try:
+        fd = os.open(folder, os.O_RDONLY)
+    except OSError:
+        return  # Windows klasör açmaya izin vermez; NTFS adı değiştirmeyi günlükler
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def _fsync_path(path):
+    # Windows'ta fsync (FlushFileBuffers) yazma erişimli tanıtıcı ister.
+    fd = os.open(path, os.O_RDWR | getattr(os, "O_BINARY", 0))
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def _sync_files(paths):
+    if len(paths) == 1: return _fsync_path(paths[0])
+    from concurrent.futures import ThreadPoolExecutor
+    with ThreadPoolExecutor(max_workers=min(SYNC_THREADS, len(paths))) as pool:
+        list(pool.map(_fsync_path, paths))
+
+
+def _sync_filesystems(folders):
+    syncfs = _load_syncfs()
+    done = set()
+    for folder in folders:
+        try:
+            device = os.stat(folder).st_dev
+        except OSError:
+            continue
+        if device in done: continue
+        done.add(device)
+        fd = os.open(folder, os.O_RDONLY)
+        try:
+            if syncfs(fd) != 0:
+                import ctypes
+                errno = ctypes.get_errno()
+                raise OSError(errno, os.strerror(errno), folder)
+        finally:
+            os.close(fd)
+
+
+class GroupCommit:
+    """Bekleyen (geçici, son) yol çiftlerini toplar ve commit() ile hepsini birlikte yayımlar.
+
+    add() sırası korunur; her iş kendi çiftlerini thumbnail önce olacak şekilde verir. durable=False
+    iken yalnızca atomik ad değiştirme yapılır (fsync/syncfs yok).
+    """
+
+    def __init__(self, durable=True, max_files=GROUP_MAX_FILES, max_seconds=GROUP_MAX_SECONDS):
+        self.durable = durable
+        self.max_files, self.max_seconds = max_files, max_seconds
+        self._pairs = []
+        self._started = None
+
+    def __len__(self):
+        return len(self._pairs)
+
+    def add(self, pairs):
+        if not pairs: return
+        if self._started is None: self._started = time.monotonic()
+        self._pairs.extend(tuple(pair) for pair in pairs)
+
+    def due(self):
+        """Grup dosya sayısı veya bekleme süresi sınırına ulaştı mı?"""
+        if not self._pairs: return False
+        return len(self._pairs) >= self.max_files or time.monotonic() - self._started >= self.max_seconds
+
+    def commit(self):
+        """Verileri diske indirir, adları değiştirir, klasörleri fsync eder; yayımlanan dosya sayısını
+        döndürür. Hata olursa yayımlanmamış geçici dosyalar silinir ve OSError yükseltilir; hatanın
+        published niteliği, add() sırasıyla baştan kaç (geçici, son) çiftinin yayımlandığını verir."""
+        pairs, self._pairs, self._started = self._pairs, [], None
+        if not pairs: return 0
+        folders = list(dict.fromkeys(os.path.dirname(final) for _, final in pairs))
+        published = 0
+        try:
+            if self.durable:
+                if _load_syncfs(): _sync_filesystems(folders)
+                else: _sync_files([tmp for tmp, _ in pairs])
+            for tmp, final in pairs:
+                os.replace(tmp, final)
+                published += 1
+        except OSError as e:
+            discard(pairs[published:])
+            e.published = published
+            raise
+        finally:
+            if self.durable and published:
+                for folder in folders: _fsync_dir(folder)
+        return published
+
+    def abort(self):
+        pairs, self._pairs, self._started = self._pairs, [], None
+        discard(pairs)
+
+
+def remove_stale_temps(folder, max_age=STALE_TEMP_SECONDS):
+    """Çöken bir çalışmadan kalmış eski geçici dosyaları siler."""
+    limit = time.time() - max_age
+    try:
+        with os.scandir(folder) as entries:
+            for entry in entries:
+                if not (entry.name.startswith(TEMP_PREFIX) and entry.name.endswith(TEMP_SUFFIX)): continue
+                try:
+                    if entry.stat().st_mtime < limit: os.remove(entry.path)
+                except OSError:
+                    pass
+    except OSError:
+        pass
@@ -0,0 +1,61 @@
+""" Paylaşılan app indeksinin yenileme sırasındaki ömrü için testler. """
+import gc
+import json
+import os
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import logic
+
+
+class AppIndexLifetimeTest(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.json_path = os.path.join(self._tmp.name, "steam_app_list.json")
+        self.index_path = os.path.join(self._tmp.name, "steam_app_index.bin")
+        self.write_list({"123": "Old Name"})
+        patches = [mock.patch.object(logic, "APP_LIST_FILE", self.json_path),
+                   mock.patch.object(logic, "APP_INDEX_FILE", self.index_path)]
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+        logic.close_app_indexes()
+
+    def tearDown(self):
+        logic.close_app_indexes()
+        gc.collect()
+        self._tmp.cleanup()
+
+    def write_list(self, apps):
+        with open(self.json_path, "w", encoding="utf-8") as f:
+            json.dump({"applist": {"apps": [{"appid": int(k), "name": v} for k, v in apps.items()]}}, f)
+
+    def test_lookup_survives_rebuild(self):
+        lookup = logic.get_app_name_lookup()
+        self.assertEqual(lookup("123"), "Old Name")
+        self.write_list({"123": "New Name"})
+        logic.build_app_index([self.json_path], self.index_path)
+        self.assertEqual(lookup("123"), "Old Name")
+        self.assertEqual(logic.get_app_name_lookup()("123"), "New Name")
+
+    def test_retired_index_closes_with_last_lookup(self):
+        lookup = logic.get_app_name_lookup()
+        old = logic._app_indexes[self.index_path][1]
+        logic.build_app_index([self.json_path], self.index_path)
+        self.assertIsNotNone(old._mm)
+        del lookup
+        gc.collect()
+        self.assertIsNone(old._mm)
+
+    def test_close_keeps_indexes_in_use(self):
+        lookup = logic.get_app_name_lookup()
+        logic.close_app_indexes()
+        self.assertEqual(lookup("123"), "Old Name")
+
+
+if __name__ == "__main__":
+    unittest.main()
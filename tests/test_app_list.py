@@ -0,0 +1,166 @@
+""" Oyun listesi yenilemesi (get_app_list_from_steam) için yerel yedek sunucu testleri. """
+import gc
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import logic
+
+CHUNK = 4096
+
+
+def applist_document(names):
+    # api.steampowered.com biçimi
+    return json.dumps({"applist": {"apps": [{"appid": k, "name": v} for k, v in names.items()]}}).encode()
+
+
+def root_list_document(names):
+    # Yansı (GitHub) biçimi: kök liste
+    return json.dumps([{"appid": k, "name": v} for k, v in names.items()]).encode()
+
+
+def names(prefix, count=3000):
+    return {n: f"{prefix} {n}" for n in range(10, 10 + count)}
+
+
+class StandInServer:
+    """Her yol için (gövde, ETag, parça başı gecikme) sunar; If-None-Match ve Range + If-Range destekler."""
+
+    def __init__(self):
+        self.documents = {}
+        self.requests = []
+        owner = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                owner.requests.append((self.path, dict(self.headers)))
+                if self.path not in owner.documents:
+                    self.send_error(404)
+                    return
+                body, etag, delay = owner.documents[self.path]
+                if self.headers.get("If-None-Match") == etag:
+                    self.send_response(304)
+                    self.send_header("ETag", etag)
+                    self.end_headers()
+                    return
+                start, status = 0, 200
+                requested = self.headers.get("Range")
+                if requested and self.headers.get("If-Range", etag) == etag:
+                    start, status = int(requested[len("bytes="):].rstrip("-")), 206
+                self.send_response(status)
+                self.send_header("ETag", etag)
+                self.send_header("Content-Length", str(len(body) - start))
+                if status == 206: self.send_header("Content-Range", f"bytes {start}-{len(body) - 1}/{len(body)}")
+                self.end_headers()
+                try:
+                    for offset in range(start, len(body), CHUNK):
+                        if delay: time.sleep(delay)
+                        self.wfile.write(body[offset:offset + CHUNK])
+                except OSError:
+                    pass  # kaybeden kaynak bağlantıyı kapattı
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+
+    def url(self, path):
+        return f"http://127.0.0.1:{self.server.server_address[1]}{path}"
+
+    def headers_for(self, path):
+        return [headers for requested, headers in self.requests if requested == path]
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+class AppListRefreshTest(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        folder = self._tmp.name
+        self.list_path = os.path.join(folder, "steam_app_list.json")
+        self.meta_path = os.path.join(folder, "steam_app_list.meta.json")
+        patches = [mock.patch.object(logic, "APP_LIST_FILE", self.list_path),
+                   mock.patch.object(logic, "APP_INDEX_FILE", os.path.join(folder, "steam_app_index.bin")),
+                   mock.patch.object(logic, "APP_LIST_META_FILE", self.meta_path),
+                   mock.patch("builtins.print")]
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+        self.server = StandInServer()
+        logic.close_app_indexes()
+
+    def tearDown(self):
+        # Kaybeden kaynakların iş parçacıkları yarım dosyalarını bırakana kadar beklenir.
+        for lock in list(logic._part_locks.values()):
+            with lock: pass
+        self.server.close()
+        logic.close_app_indexes()
+        gc.collect()
+        self._tmp.cleanup()
+
+    def meta(self):
+        with open(self.meta_path, encoding="utf-8") as f:
+            return json.load(f)
+
+    def test_race_picks_first_valid_source_of_either_shape(self):
+        shapes = [("/api", applist_document, "Api"), ("/mirror", root_list_document, "Mirror")]
+        for fast in range(2):
+            with self.subTest(fast=shapes[fast][0]):
+                for n, (path, build, label) in enumerate(shapes):
+                    self.server.documents[path] = (build(names(label)), f'"{label}-{fast}"',
+                                                   0 if n == fast else 0.05)
+                sources = [self.server.url(path) for path, _, _ in shapes]
+                self.assertEqual(logic.get_app_list_from_steam(sources=sources), {"status": "success"})
+                label = shapes[fast][2]
+                self.assertEqual(logic.get_app_name_lookup()("2500"), f"{label} 2500")
+                self.assertEqual(self.meta()["source"], sources[fast])
+                for lock in list(logic._part_locks.values()):
+                    with lock: pass
+                self.assertFalse([name for name in os.listdir(self._tmp.name) if name.endswith(".part")])
+
+    def test_not_modified_keeps_current_list(self):
+        self.server.documents["/api"] = (applist_document(names("Api")), '"v1"', 0)
+        url = self.server.url("/api")
+        self.assertEqual(logic.get_app_list_from_steam(sources=[url]), {"status": "success"})
+        with open(self.list_path, "rb") as f: before = f.read()
+        self.assertEqual(logic.get_app_list_from_steam(sources=[url]), {"status": "not_modified"})
+        self.assertEqual(self.server.headers_for("/api")[-1].get("If-None-Match"), '"v1"')
+        with open(self.list_path, "rb") as f: self.assertEqual(f.read(), before)
+
+    def resume(self, stored_etag):
+        body = root_list_document(names("Mirror"))
+        self.server.documents["/mirror"] = (body, '"v2"', 0)
+        url = self.server.url("/mirror")
+        with open(f"{self.list_path}.0.part", "wb") as f: f.write(body[:len(body) // 2])
+        with open(self.meta_path, "w", encoding="utf-8") as f:
+            json.dump({"partial": {url: {"etag": stored_etag, "last_modified": None}}}, f)
+        self.assertEqual(logic.get_app_list_from_steam(sources=[url]), {"status": "success"})
+        with open(self.list_path, "rb") as f: self.assertEqual(f.read(), body)
+        self.assertEqual(logic.get_app_name_lookup()("3009"), "Mirror 3009")
+        self.assertNotIn(url, self.meta().get("partial", {}))
+        return self.server.headers_for("/mirror")[-1], len(body) // 2
+
+    def test_resume_with_if_range(self):
+        headers, offset = self.resume('"v2"')
+        self.assertEqual(headers.get("Range"), f"bytes={offset}-")
+        self.assertEqual(headers.get("If-Range"), '"v2"')
+
+    def test_resume_restarts_when_validator_changed(self):
+        headers, _ = self.resume('"v1"')
+        self.assertEqual(headers.get("If-Range"), '"v1"')
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,95 @@
+""" Tekrar indeksi (dedup.py) için içe aktarma testleri. """
+import os
+import random
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import dedup
+import logic
+
+COUNT = 6
+SIZE = (1280, 720)
+
+
+def make_sources(folder):
+    from PIL import Image, ImageDraw
+    paths = []
+    for n in range(COUNT):
+        rng = random.Random(n)
+        img = Image.new("RGB", SIZE)
+        draw = ImageDraw.Draw(img)
+        # Yumuşak dikey geçiş: komşu hücreleri neredeyse eşit, dHash'i kodlamaya en duyarlı içerik.
+        top, bottom = [rng.randrange(256) for _ in range(3)], [rng.randrange(256) for _ in range(3)]
+        for y in range(SIZE[1]):
+            draw.line([(0, y), (SIZE[0], y)], fill=tuple(a + (b - a) * y // SIZE[1] for a, b in zip(top, bottom)))
+        for _ in range(25):
+            x, y, r = rng.randrange(SIZE[0]), rng.randrange(SIZE[1]), rng.randrange(10, 150)
+            draw.ellipse([x - r, y - r, x + r, y + r], fill=tuple(rng.randrange(256) for _ in range(3)))
+        for _ in range(10):
+            draw.text((rng.randrange(SIZE[0] - 100), rng.randrange(SIZE[1] - 20)), "HP 100", fill=(255, 255, 255))
+        path = os.path.join(folder, f"source{n}.png")
+        img.save(path)
+        paths.append(path)
+    return paths
+
+
+def import_batch(sources, folder, **options):
+    events = list(logic.process_images_batch(sources, folder, max_workers=1, register_manifest=False, **options))
+    return events[-1]
+
+
+def jpg_files(folder):
+    return sorted(name for name in os.listdir(folder) if name.lower().endswith(".jpg"))
+
+
+class ReimportTest(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.sources = make_sources(self._tmp.name)
+        self.folder = os.path.join(self._tmp.name, "screenshots")
+        os.makedirs(self.folder)
+        dedup._open_indexes.clear()
+
+    def tearDown(self):
+        dedup._open_indexes.clear()
+        self._tmp.cleanup()
+
+    def test_reimport_into_folder_with_outputs(self):
+        # Çıktılar indekssiz yazılır; ikinci içe aktarmada indeks klasördeki dosyalardan kurulur.
+        first = import_batch(self.sources, self.folder, skip_duplicates=False)
+        self.assertEqual(first["succeeded"], COUNT)
+        written = jpg_files(self.folder)
+        for profile in (None, "fast"):
+            finished = import_batch(self.sources, self.folder, encode_profile=profile)
+            self.assertEqual((finished["duplicates"], finished["succeeded"]), (COUNT, 0), profile)
+        self.assertEqual(jpg_files(self.folder), written)
+
+    def test_reimport_after_index_is_lost(self):
+        import_batch(self.sources, self.folder)
+        os.remove(os.path.join(self.folder, dedup.INDEX_FILE))
+        dedup._open_indexes.clear()
+        finished = import_batch(self.sources, self.folder)
+        self.assertEqual(finished["duplicates"], COUNT)
+        self.assertEqual(len(jpg_files(self.folder)), COUNT)
+
+    def test_matched_source_is_indexed(self):
+        # Piksel/dHash ile yakalanan kaynağın özeti kaydedilir; sonraki çalışma resimleri hiç açmaz.
+        import_batch(self.sources, self.folder, skip_duplicates=False)
+        import_batch(self.sources, self.folder)
+        dedup._open_indexes.clear()
+        with mock.patch("logic._open_image", side_effect=AssertionError("decoded")):
+            finished = import_batch(self.sources, self.folder)
+        self.assertEqual(finished["duplicates"], COUNT)
+
+    def test_different_images_are_kept(self):
+        import_batch(self.sources[:3], self.folder)
+        finished = import_batch(self.sources[3:], self.folder)
+        self.assertEqual((finished["duplicates"], finished["succeeded"]), (0, COUNT - 3))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,36 @@
+""" encoder.encode_screenshot bayt bütçesi için testler. """
+import os
+import random
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import encoder
+
+
+def noisy_image(size=(640, 360)):
+    from PIL import Image
+    rng = random.Random(7)
+    return Image.frombytes("RGB", size, bytes(rng.randrange(256) for _ in range(size[0] * size[1] * 3)))
+
+
+class MaxBytesTest(unittest.TestCase):
+    def test_smallest_profile_enforces_budget(self):
+        img = noisy_image()
+        unbounded, info = encoder.encode_screenshot(img, "smallest")
+        budget = len(encoder.encode(img, info["quality"] - 5, True))
+        data, info = encoder.encode_screenshot(img, "smallest", max_bytes=budget)
+        self.assertTrue(info["budget_met"])
+        self.assertLessEqual(len(data), budget)
+        self.assertLess(len(data), len(unbounded))
+
+    def test_smallest_profile_keeps_floor_quality_when_it_fits(self):
+        img = noisy_image()
+        data, info = encoder.encode_screenshot(img, "smallest")
+        _, bounded = encoder.encode_screenshot(img, "smallest", max_bytes=len(data) * 2)
+        self.assertEqual(bounded["quality"], info["quality"])
+
+
+if __name__ == "__main__":
+    unittest.main()
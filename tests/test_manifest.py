@@ -0,0 +1,107 @@
+""" register_screenshots için sentetik userdata ağacı üzerinde testler. """
+import os
+import sys
+import tempfile
+import time
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import logic
+import vdf
+
+APP_ID = "730"
+
+
+def result(name, width=1920, height=1080):
+    return {"success": True, "message_key": "upload_success_message", "data": name, "width": width, "height": height}
+
+
+class RegisterScreenshotsTest(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        root_760 = os.path.join(self._tmp.name, "userdata", "12345678", "760")
+        self.folder = os.path.join(root_760, "remote", APP_ID, "screenshots")
+        os.makedirs(os.path.join(self.folder, "thumbnails"))
+        self.manifest_path = os.path.join(root_760, "screenshots.vdf")
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def write_manifest(self, text):
+        with open(self.manifest_path, "w", encoding="utf-8") as f:
+            f.write(text)
+
+    def entries(self, manifest):
+        game = vdf.lookup(vdf.lookup(manifest, "Screenshots"), APP_ID)
+        return {item["filename"]: (key, item) for key, item in game.items()}
+
+    def test_creates_manifest(self):
+        outcome = logic.register_screenshots(self.folder, [result("20240101120000_1.jpg")])
+        self.assertEqual(outcome["data"], 1)
+        entry = self.entries(vdf.load(self.manifest_path))[f"{APP_ID}/screenshots/20240101120000_1.jpg"][1]
+        self.assertEqual(entry["thumbnail"], f"{APP_ID}/screenshots/thumbnails/20240101120000_1.jpg")
+        self.assertEqual((entry["width"], entry["height"]), ("1920", "1080"))
+
+    def test_merges_into_lowercase_root_key(self):
+        self.write_manifest('"screenshots"\n{\n\t"730"\n\t{\n\t\t"0"\n\t\t{\n'
+                            '\t\t\t"FileName"\t\t"730/screenshots/20230101000000_1.jpg"\n\t\t}\n\t}\n'
+                            '\t"440"\n\t{\n\t}\n}\n')
+        outcome = logic.register_screenshots(self.folder, [result("20240101120000_1.jpg")])
+        self.assertEqual(outcome["data"], 1)
+        manifest = vdf.load(self.manifest_path)
+        self.assertEqual(list(manifest), ["screenshots"])
+        self.assertEqual(sorted(manifest["screenshots"]), ["440", "730"])
+        game = manifest["screenshots"]["730"]
+        self.assertEqual(game["1"]["filename"], f"{APP_ID}/screenshots/20240101120000_1.jpg")
+
+    def test_skips_already_listed(self):
+        logic.register_screenshots(self.folder, [result("20240101120000_1.jpg")])
+        outcome = logic.register_screenshots(self.folder, [result("20240101120000_1.jpg"),
+                                                           result("20240101120000_2.jpg"),
+                                                           {"success": True, "data": "x.jpg", "duplicate": True},
+                                                           {"success": False, "message_key": "unexpected_error"}])
+        self.assertEqual(outcome["data"], 1)
+        entries = self.entries(vdf.load(self.manifest_path))
+        self.assertEqual(sorted(key for key, _ in entries.values()), ["0", "1"])
+
+    def test_single_atomic_rewrite(self):
+        logic.register_screenshots(self.folder, [result("20240101120000_1.jpg")])
+        real_replace = os.replace
+        with mock.patch("os.replace", side_effect=real_replace) as replace:
+            logic.register_screenshots(self.folder, [result(f"20240101120001_{n}.jpg") for n in range(1, 51)])
+        self.assertEqual([c.args[1] for c in replace.call_args_list], [self.manifest_path])
+        self.assertEqual(len(self.entries(vdf.load(self.manifest_path))), 51)
+
+    def test_failed_write_leaves_no_partial_file(self):
+        logic.register_screenshots(self.folder, [result("20240101120000_1.jpg")])
+        with open(self.manifest_path, "rb") as f: before = f.read()
+        with mock.patch("os.fsync", side_effect=OSError("disk full")):
+            outcome = logic.register_screenshots(self.folder, [result("20240101120000_2.jpg")])
+        self.assertFalse(outcome["success"])
+        self.assertEqual(outcome["message_key"], "manifest_error")
+        with open(self.manifest_path, "rb") as f: self.assertEqual(f.read(), before)
+        self.assertEqual(sorted(os.listdir(os.path.dirname(self.manifest_path))), ["remote", "screenshots.vdf"])
+
+    def test_large_manifest(self):
+        existing = 20000
+        lines = ['"Screenshots"\n{\n\t"730"\n\t{\n']
+        for n in range(existing):
+            lines.append(f'\t\t"{n}"\n\t\t{{\n\t\t\t"type"\t\t"1"\n'
+                         f'\t\t\t"filename"\t\t"730/screenshots/20200101000000_{n + 1}.jpg"\n\t\t}}\n')
+        lines.append("\t}\n}\n")
+        self.write_manifest("".join(lines))
+        batch = [result(f"20200101000000_{n}.jpg") for n in range(existing - 99, existing + 401)]
+        started = time.perf_counter()
+        outcome = logic.register_screenshots(self.folder, batch)
+        elapsed = time.perf_counter() - started
+        self.assertEqual(outcome["data"], 400)
+        entries = self.entries(vdf.load(self.manifest_path))
+        self.assertEqual(len(entries), existing + 400)
+        self.assertEqual(entries[f"{APP_ID}/screenshots/20200101000000_{existing + 400}.jpg"][0], str(existing + 399))
+        self.assertLess(elapsed, 10.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,86 @@
+""" publisher.GroupCommit için testler (syncfs olmayan platform yolu dahil). """
+import os
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import publisher
+
+
+class GroupCommitTest(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.folder = self._tmp.name
+        patch = mock.patch.object(publisher, "_syncfs", False)  # Windows/macOS yolu
+        patch.start()
+        self.addCleanup(patch.stop)
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def stage(self, writer, count):
+        finals = [os.path.join(self.folder, f"{n}.jpg") for n in range(count)]
+        for final in finals: writer.add([(publisher.write_temp(final, b"x" * 100), final)])
+        return finals
+
+    def test_sync_is_deferred_to_commit(self):
+        writer = publisher.GroupCommit()
+        synced = []
+        real_fsync = os.fsync
+
+        def fsync(fd):
+            synced.append(fd)
+            real_fsync(fd)
+
+        def replace(src, dst):
+            self.assertGreaterEqual(len(synced), 5)  # tüm veriler adlar değişmeden önce diskte
+            os.rename(src, dst)
+        with mock.patch("os.fsync", side_effect=fsync):
+            finals = self.stage(writer, 5)
+            self.assertEqual(synced, [])
+            with mock.patch("os.replace", side_effect=replace):
+                self.assertEqual(writer.commit(), 5)
+        self.assertTrue(all(os.path.exists(final) for final in finals))
+        self.assertFalse([name for name in os.listdir(self.folder) if name.startswith(publisher.TEMP_PREFIX)])
+
+    def test_failed_commit_reports_published_prefix(self):
+        writer = publisher.GroupCommit()
+        self.stage(writer, 4)
+        calls = []
+
+        def replace(src, dst):
+            calls.append(dst)
+            if len(calls) == 3: raise OSError("disk full")
+            os.rename(src, dst)
+        with mock.patch("os.replace", side_effect=replace):
+            with self.assertRaises(OSError) as caught:
+                writer.commit()
+        self.assertEqual(caught.exception.published, 2)
+        self.assertEqual(sorted(os.listdir(self.folder)), ["0.jpg", "1.jpg"])
+
+    def test_process_image_removes_orphan_thumbnail(self):
+        import logic
+        from PIL import Image
+        source = os.path.join(self.folder, "source.png")
+        Image.new("RGB", (640, 360), (40, 90, 160)).save(source)
+        screenshots = os.path.join(self.folder, "screenshots")
+        os.makedirs(screenshots)
+        real_replace = os.replace
+        calls = []
+
+        def replace(src, dst):
+            calls.append(dst)
+            if len(calls) == 2: raise OSError("disk full")  # thumbnail yayımlandı, tam resim değil
+            real_replace(src, dst)
+        with mock.patch("os.replace", side_effect=replace):
+            result = logic.process_image(source, screenshots, "20240101120000_1.jpg")
+        self.assertEqual(result["message_key"], "unexpected_error")
+        self.assertEqual(os.listdir(os.path.join(screenshots, "thumbnails")), [])
+        self.assertEqual(os.listdir(screenshots), ["thumbnails"])
+
+
+if __name__ == "__main__":
+    unittest.main()
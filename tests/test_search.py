@@ -0,0 +1,42 @@
+""" search.SearchIndex bulanık eşleşmesi için testler (yaygın trigram'lar atlandığında). """
+import os
+import sys
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import search
+
+WORDS = ["farm", "war", "city", "hero", "quest", "space"]
+
+
+class FuzzySkippedTrigramsTest(unittest.TestCase):
+    def setUp(self):
+        # Her isimde "dragon" geçer; küçük FUZZY_MAX_POSTING ile trigram'ları yaygın sayılır.
+        entries = [(f"Dragon {a} {b}", n) for n, (a, b) in enumerate((a, b) for a in WORDS for b in WORDS)]
+        entries.append(("Kingdom Rush", 999))
+        self.index = search.SearchIndex(entries)
+        patch = mock.patch.object(search, "FUZZY_MAX_POSTING", 10)
+        patch.start()
+        self.addCleanup(patch.stop)
+
+    def names(self, query):
+        return [label for label, _ in self.index.search(query, 100)]
+
+    def test_typo_in_common_word(self):
+        # " dr", "dra", "rag" atlanır; eşiği tek başlarına karşılarlar.
+        names = self.names("dragn")
+        self.assertEqual(len(names), len(WORDS) ** 2)
+        self.assertTrue(all(name.startswith("Dragon") for name in names))
+
+    def test_rare_and_skipped_trigrams_combine(self):
+        # "Kingdom Rush" 4 seyrek trigram paylaşır; atlanan 3 "dragn" trigram'ıyla eşiğe (6) ulaşır.
+        self.assertIn("Kingdom Rush", self.names("dragn kingdm"))
+
+    def test_unrelated_query_matches_nothing(self):
+        self.assertEqual(self.names("zzzz qqqq"), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
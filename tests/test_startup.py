@@ -0,0 +1,57 @@
+""" Açılış süresi bütçe testi (-X importtime).
+
+Her modül temiz bir yorumlayıcıda içe aktarılır; toplam içe aktarma süresi bütçeyi aşarsa veya
+ağır modüller (PIL, requests, winreg, GUI yığını) açılışta yüklenirse test başarısız olur.
+
+    python -m pytest tests/test_startup.py
+"""
+import json
+import os
+import subprocess
+import sys
+import unittest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Modül -> toplam içe aktarma bütçesi (ms). Yorumlayıcının kendi açılışı (site vb.) dahil değildir.
+IMPORT_BUDGETS_MS = {
+    "logic": 30,
+    "languages": 5,
+    "cli": 40,
+}
+# Açılışta yüklenmemesi gereken modüller (ilk kullanımda yüklenirler).
+DEFERRED_MODULES = ["PIL", "requests", "winreg", "customtkinter", "tkinter", "ctypes",
+                    "concurrent.futures.process"]
+REPEATS = 3
+
+
+def measure_import(module):
+    """Modülün -X importtime ile ölçülen kümülatif süresini (ms) ve yüklenen ağır modülleri döndürür."""
+    code = (f"import {module}; import sys, json; "
+            f"print(json.dumps([m for m in {DEFERRED_MODULES!r} if m in sys.modules]))")
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", code], capture_output=True,
+                          text=True, cwd=ROOT)
+    if proc.returncode != 0: raise RuntimeError(proc.stderr.strip().splitlines()[-1])
+    cumulative_us = None
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:"): continue
+        parts = [p.strip() for p in line[len("import time:"):].split("|")]
+        if parts[2] == module: cumulative_us = int(parts[1])
+    return (cumulative_us or 0) / 1000.0, json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+class StartupTest(unittest.TestCase):
+    def test_import_budgets(self):
+        for module, budget in IMPORT_BUDGETS_MS.items():
+            with self.subTest(module=module):
+                # İlk çalıştırma .pyc önbelleğini ısıtır; en iyi sonuç alınır.
+                samples, loaded = [], []
+                for _ in range(REPEATS + 1):
+                    ms, loaded = measure_import(module)
+                    samples.append(ms)
+                self.assertEqual(loaded, [], f"{module} açılışta ağır modül yüklüyor")
+                self.assertLessEqual(min(samples[1:]), budget, f"{module} içe aktarma bütçesini aşıyor")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,184 @@
+""" Valve KeyValues (.vdf) okuyucu/yazıcı.
+
+iter_tokens() metni veya dosyayı parça parça (akış halinde) token'lara ayırır. find_value()
+"UserLocalConfigStore/friends/PersonaName" gibi bir yolu dosyayı tamamen okumadan arar ve
+değer bulunduğu anda durur. loads()/load() iç içe dict'ler üretir (değerler her zaman str),
+dumps() Steam'in kullandığı sekmeli biçimde geri yazar. dump_file() atomik yazar. lookup()/block()
+yüklenmiş dict'lerde anahtarları Steam gibi büyük/küçük harf duyarsız bulur.
+"""
+import os
+import re
+import shutil
+
+_TOKEN_RE = re.compile(r'''
+    \s+                                 # boşluk
+  | //[^\n]*                            # yorum
+  | \[[^\]\n]*\]                        # [$WIN32] gibi koşullar (yok sayılır)
+  | (?P<open>\{)
+  | (?P<close>\})
+  | "(?P<quoted>[^"\\]*(?:\\.[^"\\]*)*)"
+  | (?P<bare>[^\s{}"]+)
+''', re.VERBOSE | re.DOTALL)
+
+_UNESCAPE = {"n": "\n", "t": "\t", "\\": "\\", '"': '"'}
+_ESCAPE_RE = re.compile(r'\\(.)', re.DOTALL)
+
+
+def _unescape(text):
+    if "\\" not in text: return text
+    return _ESCAPE_RE.sub(lambda m: _UNESCAPE.get(m.group(1), "\\" + m.group(1)), text)
+
+
+def _escape(text):
+    return str(text).replace("\\", "\\\\").replace('"', '\\"')
+
+
+def iter_tokens(source, chunk_size=65536):
+    """("open"|"close"|"string", değer) demetleri üretir. source bir str veya metin dosyasıdır;
+    dosyadan okunurken yalnızca chunk_size kadar veri (ve bölünmüş son token) bellekte tutulur."""
+    chunks = iter((source,)) if isinstance(source, str) else iter(lambda: source.read(chunk_size), "")
+    buf, pos, eof = "", 0, False
+    while True:
+        match = _TOKEN_RE.match(buf, pos) if pos < len(buf) else None
+        # Eşleşme tamponun sonuna dayanıyorsa token parça sınırında bölünmüş olabilir.
+        if match is None or (match.end() == len(buf) and not eof):
+            if eof:
+                if pos < len(buf): raise ValueError(f"Geçersiz VDF (konum {pos}).")
+                return
+            chunk = next(chunks, None)
+            if chunk is None: eof = True
+            else: buf, pos = buf[pos:] + chunk, 0
+            continue
+        pos = match.end()
+        kind = match.lastgroup
+        if kind is None: continue
+        if kind == "open": yield "open", None
+        elif kind == "close": yield "close", None
+        elif kind == "quoted": yield "string", _unescape(match.group("quoted"))
+        else: yield "string", match.group("bare")
+
+
+def query(tokens, key_path):
+    """Token akışında "a/b/c" yolundaki ilk değeri bulur (anahtarlar büyük/küçük harf duyarsız).
+    Bulunca hemen döner; eşleşen kök blok kapanırsa aramayı bırakır. Yoksa None."""
+    want = [part.lower() for part in key_path.strip("/").split("/")]
+    last = len(want) - 1
+    depth = matched = 0
+    key = None
+    for kind, value in tokens:
+        if kind == "string":
+            if key is None:
+                key = value
+                continue
+            if matched == depth == last and key.lower() == want[last]: return value
+            key = None
+        elif kind == "open":
+            if key is None: raise ValueError("VDF: anahtarsız blok.")
+            if matched == depth < last and key.lower() == want[depth]: matched += 1
+            depth += 1
+            key = None
+        else:
+            if depth == 0: raise ValueError("VDF: beklenmeyen '}'.")
+            depth -= 1
+            if matched > depth:
+                matched = depth
+                if depth == 0: return None
+    return None
+
+
+def find_value(path, key_path, default=None):
+    """Dosyada key_path değerini akış halinde arar; dosya okunamazsa veya yol yoksa default."""
+    try:
+        with open(path, "r", encoding="utf-8", errors="ignore") as f:
+            value = query(iter_tokens(f), key_path)
+    except (OSError, ValueError):
+        return default
+    return default if value is None else value
+
+
+def loads(source):
+    root = {}
+    stack = [root]
+    key = None
+    for kind, value in iter_tokens(source):
+        current = stack[-1]
+        if kind == "string":
+            if key is None:
+                key = value
+            else:
+                current[key] = value
+                key = None
+        elif kind == "open":
+            if key is None: raise ValueError("VDF: anahtarsız blok.")
+            child = current.get(key)
+            if not isinstance(child, dict):
+                child = current[key] = {}
+            stack.append(child)
+            key = None
+        else:
+            if len(stack) == 1 or key is not None: raise ValueError("VDF: beklenmeyen '}'.")
+            stack.pop()
+    if len(stack) != 1 or key is not None: raise ValueError("VDF: belge eksik.")
+    return root
+
+
+def lookup(obj, key, default=None):
+    """obj içinde key'i büyük/küçük harf duyarsız arar (Steam anahtarları duyarsızdır)."""
+    if key in obj: return obj[key]
+    want = key.lower()
+    return next((value for name, value in obj.items() if name.lower() == want), default)
+
+
+def block(obj, key):
+    """obj içindeki key bloğunu (büyük/küçük harf duyarsız) döndürür; yoksa oluşturur. Var olan blok
+    dosyadaki yazımıyla kullanılır, böylece yeniden yazılan dosyada ikinci bir kök blok oluşmaz."""
+    want = key.lower()
+    names = [name for name in obj if name.lower() == want]
+    for name in names:
+        if isinstance(obj[name], dict): return obj[name]
+    child = obj[names[0] if names else key] = {}
+    return child
+
+
+def load(path):
+    with open(path, "r", encoding="utf-8", errors="replace") as f:
+        return loads(f)
+
+
+def _dump_lines(obj, depth, out):
+    indent = "\t" * depth
+    for key, value in obj.items():
+        if isinstance(value, dict):
+            out.append(f'{indent}"{_escape(key)}"\n{indent}{{\n')
+            _dump_lines(value, depth + 1, out)
+            out.append(f"{indent}}}\n")
+        else:
+            out.append(f'{indent}"{_escape(key)}"\t\t"{_escape(value)}"\n')
+
+
+def dumps(obj):
+    out = []
+    _dump_lines(obj, 0, out)
+    return "".join(out)
+
+
+def dump_file(obj, path, backup=False):
+    """Atomik yazma: önce aynı klasörde geçici dosya, sonra os.replace. backup=True ise eskisi .bak'a kopyalanır."""
+    tmp_path = path + ".tmp"
+    try:
+        with open(tmp_path, "w", encoding="utf-8", newline="\n") as f:
+            f.write(dumps(obj))
+            f.flush()
+            os.fsync(f.fileno())
+    except BaseException:
+        try:
+            os.remove(tmp_path)  # yarım geçici dosya bırakılmaz; asıl dosyaya dokunulmadı
+        except OSError:
+            pass
+        raise
+    if backup and os.path.exists(path):
+        try:
+            shutil.copyfile(path, path + ".bak")
+        except OSError:
+            pass
+    os.replace(tmp_path, path)
@@ -0,0 +1,427 @@
+""" Bırakma (drop) klasörünü izleyip yeni yakalamaları otomatik içe aktaran servis.
+
+    daemon = IngestDaemon("D:/captures", user_id="12345678", rules=RuleSet([("cs2/*", "730")]))
+    daemon.run(stop_event)        # stop_event set edilene (veya Ctrl+C) kadar çalışır
+
+Akış:
+    izleyici     : Linux'ta inotify (ctypes), diğer sistemlerde / hata durumunda periyodik tarama
+    debounce     : boyutu ve mtime'ı settle saniye boyunca değişmeyen dosya "hazır" sayılır
+    kurallar     : glob desenleri -> app ID; sonra sayısal alt klasör adı, oyun adı (scan_for_games),
+                   en sonda varsayılan app ID
+    içe aktarma  : hazır dosyalar sınırlı bir kuyruğa girer; ayrı bir iş parçacığı onları mikro
+                   gruplar halinde tek bir uzun ömürlü süreç havuzundan process_images_batch ile geçirir
+
+Kuyruk doluysa dosyalar debounce tablosunda bekler (diskte durdukları için bellek büyümez).
+metrics açıksa watch_latency_seconds, watch_queue_seconds, watch_files{status} ve watch_backlog /
+watch_pending göstergeleri tutulur; stats() aynı bilgileri ölçüm kapalıyken de verir.
+"""
+import fnmatch
+import os
+import queue
+import select
+import shutil
+import struct
+import sys
+import threading
+import time
+from collections import deque
+
+import metrics
+from logic import get_screenshots_folder, process_images_batch, scan_for_games
+from search import normalize
+
+IMAGE_EXTENSIONS = (".jpg", ".jpeg", ".png", ".bmp")
+# Yazımı süren dosyaların yaygın geçici uzantıları; tamamlanınca yeniden adlandırılırlar.
+TEMP_SUFFIXES = (".tmp", ".part", ".partial", ".crdownload", ".download", "~")
+SETTLE_SECONDS = 1.0
+POLL_SECONDS = 1.0
+TICK_SECONDS = 0.1
+BATCH_SIZE = 16
+BATCH_WINDOW = 0.25
+MAX_BACKLOG = 256
+GAME_RESCAN_SECONDS = 60.0
+LATENCY_BUCKETS = (0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 300.0)
+
+
+def is_candidate(name):
+    lower = name.lower()
+    return (not name.startswith(".") and lower.endswith(IMAGE_EXTENSIONS)
+            and not lower.endswith(TEMP_SUFFIXES))
+
+
+def iter_tree(root, exclude=()):
+    """root altındaki dosya ve klasörleri (gizli ve exclude klasörleri hariç) yürür."""
+    excluded = {os.path.normcase(os.path.abspath(p)) for p in exclude}
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = [d for d in dirnames if not d.startswith(".")
+                       and os.path.normcase(os.path.abspath(os.path.join(dirpath, d))) not in excluded]
+        yield dirpath, filenames
+
+
+def iter_files(root, exclude=()):
+    for dirpath, filenames in iter_tree(root, exclude):
+        for name in filenames: yield os.path.join(dirpath, name)
+
+
+class PollingWatcher:
+    """Ağacı her interval saniyede bir tarar; yeni, değişen ve silinen yolları bildirir."""
+    backend = "polling"
+
+    def __init__(self, root, exclude=(), interval=POLL_SECONDS):
+        self.root, self.exclude, self.interval = root, exclude, interval
+        self._snapshot = self._scan()
+        self._next = time.monotonic() + interval
+
+    def _scan(self):
+        snapshot = {}
+        for path in iter_files(self.root, self.exclude):
+            try:
+                st = os.stat(path)
+                snapshot[path] = (st.st_size, st.st_mtime_ns)
+            except OSError:
+                pass
+        return snapshot
+
+    def changes(self, timeout):
+        wait = self._next - time.monotonic()
+        if wait > timeout:
+            time.sleep(timeout)
+            return []
+        if wait > 0: time.sleep(wait)
+        self._next = time.monotonic() + self.interval
+        snapshot = self._scan()
+        changed = [p for p, sig in snapshot.items() if self._snapshot.get(p) != sig]
+        changed.extend(p for p in self._snapshot if p not in snapshot)
+        self._snapshot = snapshot
+        return changed
+
+    def close(self):
+        pass
+
+
+# <sys/inotify.h>
+IN_MODIFY, IN_CLOSE_WRITE, IN_MOVED_FROM, IN_MOVED_TO = 0x2, 0x8, 0x40, 0x80
+IN_CREATE, IN_DELETE, IN_DELETE_SELF = 0x100, 0x200, 0x400
+IN_Q_OVERFLOW, IN_IGNORED, IN_ISDIR = 0x4000, 0x8000, 0x40000000
+IN_NONBLOCK, IN_CLOEXEC = 0o4000, 0o2000000
+_EVENT_HEADER = struct.Struct("iIII")
+
+
+class InotifyWatcher:
+    """ctypes üzerinden inotify; alt klasörler eklendikçe izlemeye alınır. Olay kuyruğu taşarsa
+    changes() None döndürür (çağıran tam tarama yapmalıdır)."""
+    backend = "inotify"
+    MASK = IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE | IN_DELETE_SELF
+
+    def __init__(self, root, exclude=()):
+        import ctypes
+        import ctypes.util
+        self._libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        self._get_errno = ctypes.get_errno
+        self.root, self.exclude = root, exclude
+        self._excluded = {os.path.normcase(os.path.abspath(p)) for p in exclude}
+        self.fd = self._libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0: raise OSError(self._get_errno(), "inotify_init1")
+        self.watches = {}
+        try:
+            self._add_tree(root)
+        except Exception:
+            self.close()
+            raise
+
+    def _add(self, path):
+        wd = self._libc.inotify_add_watch(self.fd, os.fsencode(path), self.MASK)
+        if wd < 0:
+            errno = self._get_errno()
+            raise OSError(errno, os.strerror(errno), path)
+        self.watches[wd] = path
+
+    def _add_tree(self, root):
+        """Klasörü ve alt klasörlerini izlemeye alır; içlerinde zaten bulunan dosyaları döndürür
+        (izleme eklenmeden önce oluşturulmuş olabilirler)."""
+        files = []
+        for dirpath, filenames in iter_tree(root, self.exclude):
+            self._add(dirpath)
+            files.extend(os.path.join(dirpath, name) for name in filenames)
+        return files
+
+    def changes(self, timeout):
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if not ready: return []
+        try:
+            data = os.read(self.fd, 256 * 1024)
+        except BlockingIOError:
+            return []
+        changed, offset = [], 0
+        while offset + _EVENT_HEADER.size <= len(data):
+            wd, mask, _, length = _EVENT_HEADER.unpack_from(data, offset)
+            offset += _EVENT_HEADER.size
+            name = data[offset:offset + length].split(b"\0", 1)[0]
+            offset += length
+            if mask & IN_Q_OVERFLOW: return None
+            if mask & IN_IGNORED:
+                self.watches.pop(wd, None)
+                continue
+            folder = self.watches.get(wd)
+            if folder is None or not name: continue
+            path = os.path.join(folder, os.fsdecode(name))
+            if mask & IN_ISDIR:
+                if (mask & (IN_CREATE | IN_MOVED_TO) and not name.startswith(b".")
+                        and os.path.normcase(os.path.abspath(path)) not in self._excluded):
+                    try:
+                        changed.extend(self._add_tree(path))
+                    except OSError:
+                        pass  # klasör bu arada silinmiş olabilir
+                continue
+            changed.append(path)
+        return changed
+
+    def close(self):
+        if self.fd >= 0:
+            os.close(self.fd)
+            self.fd = -1
+
+
+def create_watcher(root, exclude=(), poll=False, poll_interval=POLL_SECONDS):
+    if not poll and sys.platform.startswith("linux"):
+        try:
+            return InotifyWatcher(root, exclude)
+        except (OSError, AttributeError) as e:
+            print(f"Uyarı: inotify kullanılamıyor, taramaya geçiliyor: {e}", file=sys.stderr)
+    return PollingWatcher(root, exclude, poll_interval)
+
+
+def parse_rule(text):
+    """"DESEN=APPID" biçimindeki kuralı (desen, app_id) olarak döndürür."""
+    pattern, sep, app_id = text.rpartition("=")
+    if not sep or not pattern or not app_id.strip().isdigit(): raise ValueError(f"Geçersiz kural: {text!r}")
+    return pattern.replace("\\", "/"), app_id.strip()
+
+
+class RuleSet:
+    """Bırakma klasörüne göre göreli yolu (ör. "cs2/shot.png") app ID'ye eşler.
+
+    Sıra: glob desenleri (göreli yola veya dosya adına), sayısal ilk alt klasör adı, profildeki
+    oyunların adları (user_id verilmişse; büyük/küçük harf ve aksan duyarsız), default_app.
+    """
+
+    def __init__(self, patterns=(), default_app=None, user_id=None):
+        self.patterns = [(p.replace("\\", "/"), str(a)) for p, a in patterns]
+        self.default_app = str(default_app) if default_app else None
+        self.user_id = user_id
+        self._games = None
+        self._games_loaded = 0.0
+
+    def _game_app_id(self, folder):
+        now = time.monotonic()
+        key = normalize(folder)
+        if self._games is None or (key not in self._games and now - self._games_loaded > GAME_RESCAN_SECONDS):
+            result = scan_for_games(self.user_id)
+            self._games = {normalize(g["name"]): g["app_id"] for g in result.get("data", [])} if result["success"] else {}
+            self._games_loaded = now
+        return self._games.get(key)
+
+    def resolve(self, rel_path):
+        rel = rel_path.replace(os.sep, "/")
+        name = rel.rsplit("/", 1)[-1]
+        for pattern, app_id in self.patterns:
+            if fnmatch.fnmatch(rel, pattern) or fnmatch.fnmatch(name, pattern): return app_id
+        if "/" in rel:
+            folder = rel.split("/", 1)[0]
+            if folder.isdigit(): return folder
+            if self.user_id:
+                app_id = self._game_app_id(folder)
+                if app_id: return app_id
+        return self.default_app
+
+
+class IngestDaemon:
+    """Bırakma klasörünü izler ve hazır dosyaları kullanıcının oyun klasörlerine aktarır.
+
+    on_event(dict) her olay için çağrılır: watching, result (source, app_id, latency, process_image
+    sonucu), unmatched, manifest, stats (stats_interval saniyede bir), stopped. archive_dir verilirse
+    başarıyla aktarılan (veya zaten var olan) kaynaklar oraya taşınır; hatalı dosyalar yerinde kalır ve
+    değişene kadar yeniden denenmez. İzleyici ve içe aktarma iş parçacıkları sayaçları ve on_event'i tek
+    bir kilit altında kullanır (_emit); on_event aynı anda iki iş parçacığından çağrılmaz.
+    """
+
+    def __init__(self, drop_dir, user_id, rules=None, workers=None, batch_size=BATCH_SIZE,
+                 settle=SETTLE_SECONDS, max_backlog=MAX_BACKLOG, archive_dir=None, poll=False,
+                 poll_interval=POLL_SECONDS, include_existing=True, on_event=None, stats_interval=None,
+                 image_options=None):
+        self.drop_dir = os.path.abspath(drop_dir)
+        self.user_id = str(user_id)
+        self.rules = rules or RuleSet(user_id=user_id)
+        self.workers = workers or os.cpu_count() or 1
+        self.batch_size = max(1, batch_size)
+        self.settle = settle
+        self.archive_dir = os.path.abspath(archive_dir) if archive_dir else None
+        self.poll, self.poll_interval = poll, poll_interval
+        self.include_existing = include_existing
+        self.on_event = on_event or (lambda event: None)
+        self.stats_interval = stats_interval
+        # process_images_batch'a iletilir: max_side, memory_budget_mb, encode_profile, max_bytes, min_ssim
+        self.image_options = image_options or {}
+        self._work = queue.Queue(maxsize=max(1, max_backlog))
+        self._pending = {}  # yol -> [(boyut, mtime), ilk görülme, son değişiklik]
+        self._seen = {}     # kuyruğa verilmiş yol -> (boyut, mtime); değişmedikçe yeniden ele alınmaz
+        self._stop = threading.Event()
+        self._latencies = deque(maxlen=1024)
+        self._lock = threading.Lock()
+        self.counts = {"imported": 0, "duplicates": 0, "failed": 0, "unmatched": 0}
+        self.backend = None
+
+    def stats(self):
+        with self._lock:
+            latencies = sorted(self._latencies)
+            counts = dict(self.counts)
+        pick = lambda q: round(latencies[min(len(latencies) - 1, int(q * len(latencies)))], 3) if latencies else None
+        return {"event": "stats", "backend": self.backend, "pending": len(self._pending),
+                "backlog": self._work.qsize(), **counts,
+                "latency_p50": pick(0.5), "latency_p95": pick(0.95)}
+
+    def _emit(self, event, counter=None, n=1, latency=None):
+        """Sayaçları günceller ve olayı yayınlar; ikisi birlikte kilit altında yapılır."""
+        with self._lock:
+            if counter: self.counts[counter] += n
+            if latency is not None: self._latencies.append(latency)
+            self.on_event(event)
+
+    def stop(self):
+        self._stop.set()
+
+    def run(self, stop_event=None):
+        """stop_event (veya stop()) gelene kadar izler; içe aktarma ayrı bir iş parçacığında sürer."""
+        from concurrent.futures import ProcessPoolExecutor
+        stop_event = stop_event or self._stop
+        exclude = [self.archive_dir] if self.archive_dir else []
+        watcher = create_watcher(self.drop_dir, exclude, self.poll, self.poll_interval)
+        self.backend = watcher.backend
+        executor = ProcessPoolExecutor(max_workers=self.workers) if self.workers > 1 else None
+        ingest = threading.Thread(target=self._ingest_loop, args=(executor,), name="watch-ingest", daemon=True)
+        ingest.start()
+        self._emit({"event": "watching", "path": self.drop_dir, "backend": watcher.backend})
+        try:
+            now = time.monotonic()
+            next_stats = now + self.stats_interval if self.stats_interval else None
+            if self.include_existing:
+                for path in iter_files(self.drop_dir, exclude): self._touch(path, now)
+            while not stop_event.is_set() and not self._stop.is_set():
+                changed = watcher.changes(TICK_SECONDS)
+                now = time.monotonic()
+                if changed is None: changed = iter_files(self.drop_dir, exclude)  # inotify kuyruğu taştı
+                for path in changed: self._touch(path, now)
+                self._promote(now)
+                metrics.set_gauge("watch_pending", len(self._pending))
+                metrics.set_gauge("watch_backlog", self._work.qsize())
+                if next_stats and now >= next_stats:
+                    next_stats = now + self.stats_interval
+                    self._emit(self.stats())
+        finally:
+            self._stop.set()
+            ingest.join()
+            watcher.close()
+            if executor: executor.shutdown(wait=True, cancel_futures=True)
+            self._emit({**self.stats(), "event": "stopped"})
+
+    def _touch(self, path, now):
+        if not is_candidate(os.path.basename(path)): return
+        try:
+            st = os.stat(path)
+        except OSError:
+            self._pending.pop(path, None)
+            self._seen.pop(path, None)
+            return
+        sig = (st.st_size, st.st_mtime_ns)
+        if self._seen.get(path) == sig: return
+        entry = self._pending.get(path)
+        if entry is None: self._pending[path] = [sig, now, now]
+        elif entry[0] != sig: entry[0], entry[2] = sig, now
+
+    def _promote(self, now):
+        for path, entry in list(self._pending.items()):
+            if now - entry[2] < self.settle: continue
+            try:
+                st = os.stat(path)
+            except OSError:
+                del self._pending[path]
+                continue
+            sig = (st.st_size, st.st_mtime_ns)
+            if sig != entry[0] or not sig[0]:
+                entry[0], entry[2] = sig, now  # hâlâ yazılıyor (veya boş)
+                continue
+            app_id = self.rules.resolve(os.path.relpath(path, self.drop_dir))
+            if app_id is None:
+                metrics.inc("watch_files", status="unmatched")
+                self._emit({"event": "unmatched", "source": path}, "unmatched")
+            else:
+                try:
+                    self._work.put_nowait((path, app_id, entry[1], now))
+                except queue.Full:
+                    return  # geri basınç: kalanlar bir sonraki turda denenir
+            self._seen[path] = sig
+            del self._pending[path]
+
+    def _next_batch(self):
+        try:
+            batch = [self._work.get(timeout=0.5)]
+        except queue.Empty:
+            return []
+        deadline = time.monotonic() + BATCH_WINDOW
+        while len(batch) < self.batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0: break
+            try:
+                batch.append(self._work.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _ingest_loop(self, executor):
+        while not self._stop.is_set():
+            batch = self._next_batch()
+            groups = {}
+            for item in batch: groups.setdefault(item[1], []).append(item)
+            for app_id, items in groups.items():
+                try:
+                    self._ingest(app_id, items, executor)
+                except Exception as e:
+                    for path, *_ in items:
+                        self._emit({"event": "result", "source": path, "app_id": app_id, "success": False,
+                                    "message_key": "unexpected_error", "data": str(e)}, "failed")
+
+    def _ingest(self, app_id, items, executor):
+        folder = get_screenshots_folder(self.user_id, app_id, create=True)
+        if not folder: raise OSError("Steam bulunamadı")
+        started = time.monotonic()
+        for _, _, _, ready_at in items: metrics.observe("watch_queue_seconds", started - ready_at, LATENCY_BUCKETS)
+        paths = [item[0] for item in items]
+        for event in process_images_batch(paths, folder, max_workers=self.workers if executor else 1,
+                                          cancel_event=self._stop, executor=executor, **self.image_options):
+            if event["event"] == "manifest":
+                self._emit({**event, "app_id": app_id})
+                continue
+            if event["event"] != "result": continue
+            path, _, detected_at, _ = items[event["index"]]
+            result = event["result"]
+            latency = time.monotonic() - detected_at
+            status = "duplicate" if result.get("duplicate") else "ok" if result.get("success") else "error"
+            metrics.inc("watch_files", status=status)
+            metrics.observe("watch_latency_seconds", latency, LATENCY_BUCKETS)
+            if status != "error" and self.archive_dir: self._archive(path)
+            self._emit({"event": "result", "source": path, "app_id": app_id, "latency": round(latency, 3), **result},
+                       {"ok": "imported", "duplicate": "duplicates", "error": "failed"}[status], latency=latency)
+
+    def _archive(self, path):
+        target = os.path.join(self.archive_dir, os.path.relpath(path, self.drop_dir))
+        try:
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            if os.path.exists(target):
+                stem, ext = os.path.splitext(target)
+                target = f"{stem}_{int(time.time() * 1000)}{ext}"
+            try:
+                os.replace(path, target)
+            except OSError:
+                shutil.move(path, target)  # farklı sürücü
+        except OSError as e:
+            print(f"Hata: '{path}' arşive taşınamadı: {e}", file=sys.stderr)